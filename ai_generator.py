@@ -1,32 +1,362 @@
 import os
+import re
+import asyncio
+import time
 import random
 import logging
-from typing import List, Dict, Optional
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Dict, Optional, Tuple
 import requests
-from transformers import GPT2LMHeadModel, GPT2Tokenizer
-import torch
+from requests.adapters import HTTPAdapter
+
+from metrics import timed
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# OpenAI HTTP client settings (OPENAI_BASE_URL can point at a local stub server)
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+OPENAI_CONNECT_TIMEOUT = float(os.getenv('OPENAI_CONNECT_TIMEOUT', 3.05))
+OPENAI_READ_TIMEOUT = float(os.getenv('OPENAI_READ_TIMEOUT', 30))
+OPENAI_MAX_RETRIES = int(os.getenv('OPENAI_MAX_RETRIES', 2))
+OPENAI_BACKOFF_BASE = float(os.getenv('OPENAI_BACKOFF_BASE', 0.5))
+OPENAI_BACKOFF_MAX = float(os.getenv('OPENAI_BACKOFF_MAX', 8))
+OPENAI_POOL_SIZE = int(os.getenv('OPENAI_POOL_SIZE', 10))
+# Connection limit of the async client used by the ASGI server (asgi.py)
+OPENAI_ASYNC_POOL_SIZE = int(os.getenv('OPENAI_ASYNC_POOL_SIZE', 100))
+OPENAI_BREAKER_THRESHOLD = int(os.getenv('OPENAI_BREAKER_THRESHOLD', 5))
+OPENAI_BREAKER_COOLDOWN = float(os.getenv('OPENAI_BREAKER_COOLDOWN', 30))
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# GPT-2 sampling: sequences drawn per generate() call, and whether to use the
+# batched path at all (the one-prompt-per-call loop is kept for comparison)
+HF_BATCH_SIZE = int(os.getenv('HF_BATCH_SIZE', 16))
+HF_BATCHED = os.getenv('HF_BATCHED', 'true').lower() in ('1', 'true', 'yes')
+
+# Send GPT-2 work to the shared inference processes (inference_pool.py) instead
+# of loading a model copy into every web worker
+HF_INFERENCE_POOL = os.getenv('HF_INFERENCE_POOL', 'false').lower() in ('1', 'true', 'yes')
+
+
+def huggingface_installed() -> bool:
+    """Whether torch and transformers can be imported, without importing them"""
+    return all(importlib.util.find_spec(name) is not None for name in ('torch', 'transformers'))
+
+# Tagline generation: 'concurrent' sends one request per name through a bounded
+# thread pool, 'batched' asks for every tagline in a single completion
+TAGLINE_MODE = os.getenv('AI_TAGLINE_MODE', 'concurrent')
+TAGLINE_CONCURRENCY = int(os.getenv('AI_TAGLINE_CONCURRENCY', 5))
+TAGLINE_DEADLINE = float(os.getenv('AI_TAGLINE_DEADLINE', 10))
+
+class CircuitBreaker:
+    """Skips a remote dependency for a cooldown window after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens; once
+    ``cooldown`` seconds have passed a single trial call is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown: float = 30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                return 'half-open'
+            return 'open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """End a call without an outcome (e.g. cancelled by its caller): frees a half-open trial slot"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial_in_flight:
+                    logger.warning(f"Circuit breaker opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class _OpenAIClientBase:
+    """Settings and retry policy shared by the sync and async clients"""
+
+    def __init__(self, api_key: str, base_url: str, timeout: Tuple[float, float], max_retries: int,
+                 backoff_base: float, backoff_max: float, breaker: Optional[CircuitBreaker]):
+        self.api_key = api_key
+        self.chat_url = f"{base_url.rstrip('/')}/chat/completions"
+        self.connect_timeout, self.read_timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker(OPENAI_BREAKER_THRESHOLD, OPENAI_BREAKER_COOLDOWN)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {'Authorization': f'Bearer {self.api_key}', 'Content-Type': 'application/json'}
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Full-jitter exponential backoff, or the server's Retry-After if given"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def message_content(payload) -> str:
+        """The reply text of a chat completion body; ValueError if it has none"""
+        try:
+            content = payload['choices'][0]['message']['content']
+        except (KeyError, IndexError, TypeError):
+            content = None
+        if not isinstance(content, str):
+            raise ValueError('Malformed chat completion response')
+        return content
+
+
+class OpenAIClient(_OpenAIClientBase):
+    """Keep-alive, pooled client for the OpenAI chat completions API.
+
+    Retries 429/5xx responses and connection errors with jittered exponential
+    backoff (honouring Retry-After), and stops calling the API while its
+    circuit breaker is open so requests fall back to local generation at once.
+    """
+
+    def __init__(self, api_key: str, base_url: str = OPENAI_BASE_URL,
+                 timeout: Tuple[float, float] = (OPENAI_CONNECT_TIMEOUT, OPENAI_READ_TIMEOUT),
+                 max_retries: int = OPENAI_MAX_RETRIES, backoff_base: float = OPENAI_BACKOFF_BASE,
+                 backoff_max: float = OPENAI_BACKOFF_MAX, pool_size: int = OPENAI_POOL_SIZE,
+                 breaker: Optional[CircuitBreaker] = None):
+        super().__init__(api_key, base_url, timeout, max_retries, backoff_base, backoff_max, breaker)
+
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        # Retries are handled here, not by urllib3, so they share the backoff policy
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def chat_completion(self, data: Dict, timeout: Optional[float] = None) -> Optional[str]:
+        """POST a chat completion and return the message content, or None on failure.
+
+        ``timeout`` bounds the whole call including retries; individual attempts
+        use the configured connect/read timeouts.
+        """
+        if not self.breaker.allow():
+            logger.warning("OpenAI circuit breaker is open, skipping remote call")
+            return None
+
+        deadline = time.monotonic() + (timeout if timeout is not None else self.read_timeout)
+        # Every exit that isn't a success -- including exceptions nobody expected --
+        # counts as a failure, so a half-open trial can never be left in flight
+        succeeded = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                remaining = deadline - time.monotonic()
+                retry_after = None
+                try:
+                    response = self.session.post(
+                        self.chat_url,
+                        json=data,
+                        timeout=(self.connect_timeout, max(min(self.read_timeout, remaining), 0.1))
+                    )
+                except requests.RequestException as e:
+                    logger.warning(f"OpenAI request failed (attempt {attempt + 1}): {e}")
+                else:
+                    if response.status_code == 200:
+                        try:
+                            content = self.message_content(response.json())
+                        except ValueError as e:
+                            logger.error(f"OpenAI returned an unusable response (attempt {attempt + 1}): {e}")
+                        else:
+                            succeeded = True
+                            return content
+                    else:
+                        logger.error(f"OpenAI API error: {response.status_code}")
+                        if response.status_code not in RETRYABLE_STATUS_CODES:
+                            # The service answered; a bad request shouldn't trip the breaker
+                            succeeded = True
+                            return None
+                        retry_after = response.headers.get('Retry-After')
+
+                if attempt == self.max_retries:
+                    break
+                delay = self.backoff_delay(attempt, retry_after)
+                if time.monotonic() + delay >= deadline:
+                    break
+                time.sleep(delay)
+            return None
+        finally:
+            if succeeded:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+
+class AsyncOpenAIClient(_OpenAIClientBase):
+    """Non-blocking counterpart of OpenAIClient for the ASGI server.
+
+    Same retry, backoff and circuit-breaker behaviour, but calls are coroutines
+    on an aiohttp connection pool, so a waiting request costs no thread. Pass
+    the sync client's breaker to share failure state between the two.
+    """
+
+    def __init__(self, api_key: str, base_url: str = OPENAI_BASE_URL,
+                 timeout: Tuple[float, float] = (OPENAI_CONNECT_TIMEOUT, OPENAI_READ_TIMEOUT),
+                 max_retries: int = OPENAI_MAX_RETRIES, backoff_base: float = OPENAI_BACKOFF_BASE,
+                 backoff_max: float = OPENAI_BACKOFF_MAX, pool_size: int = OPENAI_ASYNC_POOL_SIZE,
+                 breaker: Optional[CircuitBreaker] = None):
+        super().__init__(api_key, base_url, timeout, max_retries, backoff_base, backoff_max, breaker)
+        self.pool_size = pool_size
+        self.session = None  # created in the event loop on first use
+
+    def _session(self):
+        import aiohttp
+
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.pool_size)
+            )
+        return self.session
+
+    async def chat_completion(self, data: Dict, timeout: Optional[float] = None) -> Optional[str]:
+        """POST a chat completion and return the message content, or None on failure"""
+        import aiohttp
+
+        if not self.breaker.allow():
+            logger.warning("OpenAI circuit breaker is open, skipping remote call")
+            return None
+
+        deadline = time.monotonic() + (timeout if timeout is not None else self.read_timeout)
+        succeeded = cancelled = False
+        try:
+            session = self._session()
+            for attempt in range(self.max_retries + 1):
+                remaining = deadline - time.monotonic()
+                retry_after = None
+                attempt_timeout = aiohttp.ClientTimeout(connect=self.connect_timeout,
+                                                        sock_read=max(min(self.read_timeout, remaining), 0.1))
+                try:
+                    async with session.post(self.chat_url, json=data, timeout=attempt_timeout) as response:
+                        if response.status == 200:
+                            # ContentTypeError is a ClientError; a bad JSON body is a ValueError
+                            content = self.message_content(await response.json())
+                            succeeded = True
+                            return content
+
+                        logger.error(f"OpenAI API error: {response.status}")
+                        if response.status not in RETRYABLE_STATUS_CODES:
+                            succeeded = True
+                            return None
+                        retry_after = response.headers.get('Retry-After')
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    logger.warning(f"OpenAI request failed (attempt {attempt + 1}): {e!r}")
+
+                if attempt == self.max_retries:
+                    break
+                delay = self.backoff_delay(attempt, retry_after)
+                if time.monotonic() + delay >= deadline:
+                    break
+                await asyncio.sleep(delay)
+            return None
+        except asyncio.CancelledError:
+            # The caller gave up (tagline deadline, client gone); that says nothing about OpenAI
+            cancelled = True
+            raise
+        finally:
+            if succeeded:
+                self.breaker.record_success()
+            elif cancelled:
+                self.breaker.release()
+            else:
+                self.breaker.record_failure()
+
+    async def aclose(self):
+        if self.session is not None:
+            await self.session.close()
+
+
 class AINameGenerator:
-    def __init__(self):
+    def __init__(self, use_inference_pool: Optional[bool] = None):
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
+        self.openai_client = OpenAIClient(self.openai_api_key) if self.openai_api_key else None
+        self._async_openai_client = None
+        self.tagline_executor = ThreadPoolExecutor(
+            max_workers=TAGLINE_CONCURRENCY, thread_name_prefix='ai-tagline'
+        )
+
+        # GPT-2 is loaded on first use, or lives in the shared inference pool
         self.hf_model = None
         self.hf_tokenizer = None
-        self.load_huggingface_model()
+        self._hf_load_attempted = False
+        self._hf_lock = threading.Lock()
+        if HF_INFERENCE_POOL if use_inference_pool is None else use_inference_pool:
+            from inference_pool import InferenceClient
+            self.inference_client = InferenceClient()
+        else:
+            self.inference_client = None
+
+    @property
+    def huggingface_available(self) -> bool:
+        """Whether GPT-2 generation can be used (without loading the model)"""
+        if not huggingface_installed():
+            return False
+        return not self._hf_load_attempted or self.hf_model is not None
+
+    def ensure_huggingface_model(self) -> bool:
+        """Load the GPT-2 model on first use; returns whether it is usable"""
+        with self._hf_lock:
+            if not self._hf_load_attempted:
+                self._hf_load_attempted = True
+                self.load_huggingface_model()
+        return self.hf_model is not None
     
     def load_huggingface_model(self):
         """Load HuggingFace GPT-2 model for name generation"""
         try:
+            from transformers import GPT2LMHeadModel, GPT2Tokenizer
+
             model_name = "gpt2"
             self.hf_tokenizer = GPT2Tokenizer.from_pretrained(model_name)
             self.hf_model = GPT2LMHeadModel.from_pretrained(model_name)
             
-            # Add padding token
+            # Add padding token; pad on the left so batched prompts all end at the
+            # same position and sampling continues straight from the prompt text
             if self.hf_tokenizer.pad_token is None:
                 self.hf_tokenizer.pad_token = self.hf_tokenizer.eos_token
+            self.hf_tokenizer.padding_side = 'left'
             
             logger.info("HuggingFace GPT-2 model loaded successfully")
         except Exception as e:
@@ -34,6 +364,7 @@ class AINameGenerator:
             self.hf_model = None
             self.hf_tokenizer = None
 
+    @timed('openai_names')
     def generate_openai_names(self, keywords: List[str], tone: str, count: int = 10) -> List[str]:
         """Generate business names using OpenAI API"""
         if not self.openai_api_key:
@@ -41,19 +372,32 @@ class AINameGenerator:
             return []
         
         try:
-            # Create prompt based on keywords and tone
-            keywords_str = ", ".join(keywords[:5])
-            
-            tone_descriptions = {
-                'professional': 'professional, corporate, and trustworthy',
-                'playful': 'fun, creative, and memorable',
-                'elegant': 'sophisticated, luxurious, and premium',
-                'minimal': 'simple, clean, and modern'
-            }
-            
-            tone_desc = tone_descriptions.get(tone, 'creative and memorable')
-            
-            prompt = f"""Generate {count} creative business names for a company related to: {keywords_str}
+            content = self.openai_client.chat_completion(self.openai_names_request(keywords, tone, count),
+                                                         timeout=30)
+            if content is None:
+                return []
+            return self.parse_openai_names(content, count)
+                
+        except Exception as e:
+            logger.error(f"Error generating OpenAI names: {e}")
+            return []
+
+    @staticmethod
+    def openai_names_request(keywords: List[str], tone: str, count: int) -> Dict:
+        """Chat completion payload asking for count names"""
+        # Create prompt based on keywords and tone
+        keywords_str = ", ".join(keywords[:5])
+        
+        tone_descriptions = {
+            'professional': 'professional, corporate, and trustworthy',
+            'playful': 'fun, creative, and memorable',
+            'elegant': 'sophisticated, luxurious, and premium',
+            'minimal': 'simple, clean, and modern'
+        }
+        
+        tone_desc = tone_descriptions.get(tone, 'creative and memorable')
+        
+        prompt = f"""Generate {count} creative business names for a company related to: {keywords_str}
             
 The names should be {tone_desc}. Each name should be:
 - Short and memorable (1-3 words)
@@ -64,67 +408,121 @@ The names should be {tone_desc}. Each name should be:
 Business names:
 1."""
 
-            headers = {
-                'Authorization': f'Bearer {self.openai_api_key}',
-                'Content-Type': 'application/json',
-            }
-            
-            data = {
-                'model': 'gpt-3.5-turbo',
-                'messages': [
-                    {
-                        'role': 'system', 
-                        'content': 'You are a creative business naming expert. Generate only business names, one per line, numbered.'
-                    },
-                    {'role': 'user', 'content': prompt}
-                ],
-                'max_tokens': 300,
-                'temperature': 0.8,
-                'top_p': 0.9
-            }
-            
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers=headers,
-                json=data,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result['choices'][0]['message']['content']
-                
-                # Parse the generated names
-                names = []
-                lines = content.strip().split('\n')
-                for line in lines:
-                    # Remove numbering and clean up
-                    clean_line = line.strip()
-                    if clean_line:
-                        # Remove common numbering patterns
-                        import re
-                        clean_line = re.sub(r'^\d+\.?\s*', '', clean_line)
-                        clean_line = re.sub(r'^[•\-\*]\s*', '', clean_line)
-                        
-                        if clean_line and len(clean_line.split()) <= 4:
-                            names.append(clean_line.strip())
-                
-                logger.info(f"Generated {len(names)} names using OpenAI")
-                return names[:count]
-            else:
-                logger.error(f"OpenAI API error: {response.status_code}")
-                return []
+        return {
+            'model': 'gpt-3.5-turbo',
+            'messages': [
+                {
+                    'role': 'system', 
+                    'content': 'You are a creative business naming expert. Generate only business names, one per line, numbered.'
+                },
+                {'role': 'user', 'content': prompt}
+            ],
+            'max_tokens': 300,
+            'temperature': 0.8,
+            'top_p': 0.9
+        }
+
+    @staticmethod
+    def parse_openai_names(content: str, count: int) -> List[str]:
+        """Parse the numbered list of names in a completion"""
+        names = []
+        lines = content.strip().split('\n')
+        for line in lines:
+            # Remove numbering and clean up
+            clean_line = line.strip()
+            if clean_line:
+                # Remove common numbering patterns
+                clean_line = re.sub(r'^\d+\.?\s*', '', clean_line)
+                clean_line = re.sub(r'^[•\-\*]\s*', '', clean_line)
                 
-        except Exception as e:
-            logger.error(f"Error generating OpenAI names: {e}")
-            return []
+                if clean_line and len(clean_line.split()) <= 4:
+                    names.append(clean_line.strip())
+        
+        logger.info(f"Generated {len(names)} names using OpenAI")
+        return names[:count]
 
-    def generate_huggingface_names(self, keywords: List[str], tone: str, count: int = 10) -> List[str]:
+    @timed('huggingface_names')
+    def generate_huggingface_names(self, keywords: List[str], tone: str, count: int = 10,
+                                   batched: Optional[bool] = None) -> List[str]:
         """Generate business names using HuggingFace GPT-2"""
-        if not self.hf_model or not self.hf_tokenizer:
+        if self.inference_client is not None:
+            return self.inference_client.generate_names(keywords, count, batched=batched)
+
+        if not self.ensure_huggingface_model():
             logger.warning("HuggingFace model not available")
             return []
-        
+
+        if HF_BATCHED if batched is None else batched:
+            return self._generate_huggingface_names_batched(keywords, count)
+        return self._generate_huggingface_names_sequential(keywords, count)
+
+    @staticmethod
+    def huggingface_prompts(keyword: str) -> List[str]:
+        """Prompt variants used to sample names for one keyword"""
+        return [
+            f"Business name for {keyword} company:",
+            f"{keyword.title()} company called",
+            f"Creative name for {keyword} business:",
+            f"Brand name: {keyword.title()}"
+        ]
+
+    def _generate_huggingface_names_batched(self, keywords: List[str], count: int) -> List[str]:
+        """Sample many candidates per generate() call from a padded batch of prompts.
+
+        Draws at most the same number of samples as the sequential loop
+        (count * 2) but in batches of at most HF_BATCH_SIZE rows, one sample per
+        row, stopping as soon as enough names have passed clean_generated_name.
+        Rows cycle through the prompts in a shuffled order, so every prompt is
+        used once before any is repeated.
+        """
+        import torch
+
+        try:
+            names = []
+            prompts = [prompt for keyword in keywords[:3] for prompt in self.huggingface_prompts(keyword)]
+            random.shuffle(prompts)
+            drawn = 0
+            remaining = count * 2
+
+            while remaining > 0 and len(names) < count:
+                samples = min(HF_BATCH_SIZE, remaining)
+                batch_prompts = [prompts[(drawn + row) % len(prompts)] for row in range(samples)]
+                drawn += samples
+                remaining -= samples
+
+                inputs = self.hf_tokenizer(batch_prompts, return_tensors='pt', padding=True)
+                with torch.no_grad():
+                    outputs = self.hf_model.generate(
+                        **inputs,
+                        max_new_tokens=15,  # Short generation
+                        temperature=0.8,
+                        do_sample=True,
+                        pad_token_id=self.hf_tokenizer.eos_token_id,
+                        no_repeat_ngram_size=2
+                    )
+
+                # Rows share the (left-padded) prompt length, so the new tokens line up
+                generated_parts = self.hf_tokenizer.batch_decode(
+                    outputs[:, inputs['input_ids'].shape[1]:], skip_special_tokens=True
+                )
+                for generated_part in generated_parts:
+                    name = self.clean_generated_name(generated_part.strip())
+                    if name and len(name.split()) <= 3 and name not in names:
+                        names.append(name)
+                        if len(names) >= count:
+                            break
+
+            logger.info(f"Generated {len(names)} names using HuggingFace (batched)")
+            return names[:count]
+
+        except Exception as e:
+            logger.error(f"Error generating HuggingFace names: {e}")
+            return []
+
+    def _generate_huggingface_names_sequential(self, keywords: List[str], count: int) -> List[str]:
+        """Sample one candidate per generate() call (original implementation)"""
+        import torch
+
         try:
             names = []
             keywords_sample = keywords[:3]  # Use top 3 keywords
@@ -134,14 +532,7 @@ Business names:
                 # Create varied prompts
                 keyword = random.choice(keywords_sample)
                 
-                prompts = [
-                    f"Business name for {keyword} company:",
-                    f"{keyword.title()} company called",
-                    f"Creative name for {keyword} business:",
-                    f"Brand name: {keyword.title()}"
-                ]
-                
-                prompt = random.choice(prompts)
+                prompt = random.choice(self.huggingface_prompts(keyword))
                 
                 # Tokenize and generate
                 inputs = self.hf_tokenizer.encode(prompt, return_tensors='pt')
@@ -181,7 +572,6 @@ Business names:
 
     def clean_generated_name(self, text: str) -> Optional[str]:
         """Clean and validate generated business name"""
-        import re
         
         # Split into lines and take the first meaningful line
         lines = text.split('\n')
@@ -218,67 +608,237 @@ Business names:
         
         # Try HuggingFace if we need more names
         remaining_count = count - len(all_names)
-        if remaining_count > 0 and self.hf_model:
+        if remaining_count > 0 and self.huggingface_available:
             hf_names = self.generate_huggingface_names(keywords, tone, remaining_count)
             all_names.extend(hf_names)
         
-        # Remove duplicates while preserving order
+        return self.unique_names(all_names, count)
+
+    @staticmethod
+    def unique_names(names: List[str], count: int) -> List[str]:
+        """Remove case-insensitive duplicates while preserving order"""
         seen = set()
         unique_names = []
-        for name in all_names:
+        for name in names:
             if name.lower() not in seen:
                 seen.add(name.lower())
                 unique_names.append(name)
         
         return unique_names[:count]
 
-    def generate_ai_taglines(self, business_names: List[str], industry: str) -> List[str]:
-        """Generate AI-powered taglines for business names"""
+    @timed('ai_taglines')
+    def generate_ai_taglines(self, business_names: List[str], industry: str,
+                             fallback: Optional[List[str]] = None, mode: Optional[str] = None,
+                             deadline: Optional[float] = None) -> List[str]:
+        """Generate AI-powered taglines for business names, aligned with the input order.
+
+        Names whose tagline is not ready within ``deadline`` seconds (or whose call
+        fails) get the matching entry of ``fallback``, e.g. template taglines.
+        """
+        if fallback is None:
+            fallback = [f"Excellence in {industry}" for _ in business_names]
         if not self.openai_api_key:
             return [f"Innovation in {industry}" for _ in business_names]
+        if not business_names:
+            return []
+
+        mode = mode or TAGLINE_MODE
+        deadline = TAGLINE_DEADLINE if deadline is None else deadline
+
+        try:
+            if mode == 'batched':
+                taglines = self._request_batched_taglines(business_names, industry, deadline)
+            else:
+                taglines = self._request_concurrent_taglines(business_names, industry, deadline)
+        except Exception as e:
+            logger.error(f"Error generating AI taglines: {e}")
+            return list(fallback)
+
+        missing = sum(1 for tagline in taglines if not tagline)
+        if missing:
+            logger.info(f"{missing}/{len(taglines)} AI taglines fell back to templates")
+        return [tagline or fallback[i] for i, tagline in enumerate(taglines)]
+
+    @staticmethod
+    def tagline_request(name: str, industry: str) -> Dict:
+        """Chat completion payload asking for one tagline"""
+        prompt = f"Create a short, catchy tagline for a {industry} business called '{name}'. The tagline should be 2-5 words, memorable, and professional."
         
+        return {
+            'model': 'gpt-3.5-turbo',
+            'messages': [
+                {'role': 'system', 'content': 'You are a marketing expert. Create only short, catchy taglines.'},
+                {'role': 'user', 'content': prompt}
+            ],
+            'max_tokens': 50,
+            'temperature': 0.7
+        }
+
+    @staticmethod
+    def clean_tagline(content: Optional[str]) -> Optional[str]:
+        if not content:
+            return None
+        # Clean up quotes
+        return content.strip().strip('"\'')
+
+    def _request_tagline(self, name: str, industry: str, timeout: float) -> Optional[str]:
+        """Ask OpenAI for one tagline"""
+        return self.clean_tagline(self.openai_client.chat_completion(self.tagline_request(name, industry), timeout))
+
+    def _request_concurrent_taglines(self, business_names: List[str], industry: str,
+                                     deadline: float) -> List[Optional[str]]:
+        """One request per name on the shared pool; unfinished calls become None"""
+        timeout = min(15, deadline)
+        futures = [
+            self.tagline_executor.submit(self._request_tagline, name, industry, timeout)
+            for name in business_names
+        ]
+        done, _ = wait(futures, timeout=deadline)
+
+        taglines = []
+        for future in futures:
+            if future in done and future.exception() is None:
+                taglines.append(future.result())
+            else:
+                future.cancel()  # drop calls that haven't started yet
+                taglines.append(None)
+        return taglines
+
+    def _request_batched_taglines(self, business_names: List[str], industry: str,
+                                  deadline: float) -> List[Optional[str]]:
+        """Ask for every tagline in one numbered completion and map them back by number"""
+        content = self.openai_client.chat_completion(self.batched_taglines_request(business_names, industry),
+                                                     deadline)
+        return self.parse_batched_taglines(content, len(business_names))
+
+    @staticmethod
+    def batched_taglines_request(business_names: List[str], industry: str) -> Dict:
+        """Chat completion payload asking for one numbered tagline per name"""
+        numbered_names = "\n".join(f"{i}. {name}" for i, name in enumerate(business_names, 1))
+        prompt = f"""Create a short, catchy tagline for each of these {industry} businesses. Each tagline should be 2-5 words, memorable, and professional.
+
+Answer with one line per business, using the same numbers and no business names:
+{numbered_names}"""
+
+        return {
+            'model': 'gpt-3.5-turbo',
+            'messages': [
+                {'role': 'system', 'content': 'You are a marketing expert. Create only short, catchy taglines.'},
+                {'role': 'user', 'content': prompt}
+            ],
+            'max_tokens': 20 * len(business_names) + 20,
+            'temperature': 0.7
+        }
+
+    @staticmethod
+    def parse_batched_taglines(content: Optional[str], count: int) -> List[Optional[str]]:
+        taglines = [None] * count
+        if not content:
+            return taglines
+
+        for line in content.strip().split('\n'):
+            match = re.match(r'^\s*(\d+)[\.\):]\s*(.+)$', line)
+            if match:
+                position = int(match.group(1)) - 1
+                if 0 <= position < len(taglines) and taglines[position] is None:
+                    taglines[position] = match.group(2).strip().strip('"\'')
+        return taglines
+
+    # --- coroutine variants used by the ASGI server (asgi.py) ---------------------
+
+    @property
+    def async_openai_client(self) -> Optional[AsyncOpenAIClient]:
+        """Async OpenAI client, created in the running event loop on first use"""
+        if self.openai_client is None:
+            return None
+        if self._async_openai_client is None:
+            self._async_openai_client = AsyncOpenAIClient(self.openai_api_key, breaker=self.openai_client.breaker)
+        return self._async_openai_client
+
+    async def agenerate_openai_names(self, keywords: List[str], tone: str, count: int = 10) -> List[str]:
+        """generate_openai_names without blocking the event loop"""
+        if not self.openai_api_key:
+            logger.warning("OpenAI API key not found")
+            return []
+
         try:
-            taglines = []
-            
-            for name in business_names:
-                prompt = f"Create a short, catchy tagline for a {industry} business called '{name}'. The tagline should be 2-5 words, memorable, and professional."
-                
-                headers = {
-                    'Authorization': f'Bearer {self.openai_api_key}',
-                    'Content-Type': 'application/json',
-                }
-                
-                data = {
-                    'model': 'gpt-3.5-turbo',
-                    'messages': [
-                        {'role': 'system', 'content': 'You are a marketing expert. Create only short, catchy taglines.'},
-                        {'role': 'user', 'content': prompt}
-                    ],
-                    'max_tokens': 50,
-                    'temperature': 0.7
-                }
-                
-                response = requests.post(
-                    'https://api.openai.com/v1/chat/completions',
-                    headers=headers,
-                    json=data,
-                    timeout=15
+            with timed('openai_names'):
+                content = await self.async_openai_client.chat_completion(
+                    self.openai_names_request(keywords, tone, count), timeout=30
                 )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    tagline = result['choices'][0]['message']['content'].strip()
-                    # Clean up quotes
-                    tagline = tagline.strip('"\'')
-                    taglines.append(tagline)
-                else:
-                    taglines.append(f"Excellence in {industry}")
-            
-            return taglines
-            
+            if content is None:
+                return []
+            return self.parse_openai_names(content, count)
         except Exception as e:
-            logger.error(f"Error generating AI taglines: {e}")
+            logger.error(f"Error generating OpenAI names: {e}")
+            return []
+
+    async def agenerate_creative_names(self, keywords: List[str], tone: str, count: int = 10) -> List[str]:
+        """generate_creative_names with OpenAI awaited and GPT-2 run in a thread"""
+        all_names = []
+
+        if self.openai_api_key:
+            all_names.extend(await self.agenerate_openai_names(keywords, tone, count // 2))
+
+        remaining_count = count - len(all_names)
+        if remaining_count > 0 and self.huggingface_available:
+            all_names.extend(await asyncio.to_thread(self.generate_huggingface_names, keywords, tone,
+                                                     remaining_count))
+
+        return self.unique_names(all_names, count)
+
+    async def agenerate_ai_taglines(self, business_names: List[str], industry: str,
+                                    fallback: Optional[List[str]] = None, mode: Optional[str] = None,
+                                    deadline: Optional[float] = None) -> List[str]:
+        """generate_ai_taglines as coroutines; per-name calls are bounded by a semaphore"""
+        if fallback is None:
+            fallback = [f"Excellence in {industry}" for _ in business_names]
+        if not self.openai_api_key:
             return [f"Innovation in {industry}" for _ in business_names]
+        if not business_names:
+            return []
+
+        mode = mode or TAGLINE_MODE
+        deadline = TAGLINE_DEADLINE if deadline is None else deadline
+        client = self.async_openai_client
+
+        with timed('ai_taglines'):
+            try:
+                if mode == 'batched':
+                    content = await client.chat_completion(self.batched_taglines_request(business_names, industry),
+                                                           deadline)
+                    taglines = self.parse_batched_taglines(content, len(business_names))
+                else:
+                    semaphore = asyncio.Semaphore(TAGLINE_CONCURRENCY)
+                    timeout = min(15, deadline)
+
+                    async def request_tagline(name):
+                        async with semaphore:
+                            content = await client.chat_completion(self.tagline_request(name, industry), timeout)
+                            return self.clean_tagline(content)
+
+                    tasks = [asyncio.ensure_future(request_tagline(name)) for name in business_names]
+                    await asyncio.wait(tasks, timeout=deadline)
+                    taglines = []
+                    for task in tasks:
+                        if task.done() and not task.cancelled() and task.exception() is None:
+                            taglines.append(task.result())
+                        else:
+                            task.cancel()
+                            taglines.append(None)
+            except Exception as e:
+                logger.error(f"Error generating AI taglines: {e}")
+                return list(fallback)
+
+        missing = sum(1 for tagline in taglines if not tagline)
+        if missing:
+            logger.info(f"{missing}/{len(taglines)} AI taglines fell back to templates")
+        return [tagline or fallback[i] for i, tagline in enumerate(taglines)]
+
+    async def aclose(self):
+        if self._async_openai_client is not None:
+            await self._async_openai_client.aclose()
+            self._async_openai_client = None
 
 # Test function
 if __name__ == "__main__":
@@ -1,353 +1,682 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
-import nltk
 import re
 import random
 import json
-from collections import defaultdict
+import hashlib
+from itertools import islice
 import os
+import threading
+import time
+import logging
 from dotenv import load_dotenv
+from lru_cache import LRUCache
+from cursors import CursorCodec
+from domain_index import domain_label, load_domain_index
+from favorites_store import load_favorites_store, MAX_NAME_LENGTH, MAX_TAGLINE_LENGTH
+from name_generator import BusinessNameGenerator, ensure_nltk_data, EXPANSION_BACKENDS
+from singleflight import FileSingleFlight, SingleFlight
+import metrics
+from metrics import timed
 
-# Optional AI generator import (disabled for now due to dependency issues)
+from nltk.corpus import wordnet
+from nltk.tokenize import word_tokenize
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Optional AI generator (OpenAI and/or GPT-2). torch/transformers are only imported
+# when a model is actually loaded, so it is cheap to enable.
+AI_ENABLED = os.getenv('AI_ENABLED', 'false').lower() in ('1', 'true', 'yes')
 AI_AVAILABLE = False
-ai_generator = None
-print("AI features temporarily disabled - install spacy and transformers to enable")
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Seeded rule-based /generate responses are deterministic, so they are cached and
+# sent with an ETag; RESPONSE_CACHE_TTL is also the Cache-Control max-age. AI
+# names don't follow from the seed, so use_ai responses are never cached
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 512))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 3600))
 
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# Identical /generate requests in flight at the same time are generated once and
+# share the response. With COALESCE_DIR set (gunicorn.conf.py creates one), the
+# workers of a host also coordinate through lock files there, waiting at most
+# COALESCE_WAIT seconds for another worker's result
+COALESCE_REQUESTS = os.getenv('COALESCE_REQUESTS', 'true').lower() in ('1', 'true', 'yes')
+COALESCE_DIR = os.getenv('COALESCE_DIR') or None
+COALESCE_WAIT = float(os.getenv('COALESCE_WAIT', 30))
 
-try:
-    nltk.data.find('corpora/wordnet')
-except LookupError:
-    nltk.download('wordnet')
+# /generate responses carry a signed cursor for the next page of rule-based names
+# (see cursors.py). Every worker must sign with the same CURSOR_SECRET;
+# gunicorn.conf.py generates one for the server's lifetime when it is unset
+CURSOR_SECRET = os.getenv('CURSOR_SECRET') or None
+CURSOR_VERSION = 1
 
-from nltk.corpus import stopwords, wordnet
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
+# Registered-domain index built from zone files (see domain_index.py); without it
+# availability is reported as unknown
+DOMAIN_INDEX_PATH = os.getenv(
+    'DOMAIN_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'domains.idx')
+)
+DOMAIN_TLDS = tuple(tld.strip().lstrip('.').lower()
+                    for tld in os.getenv('DOMAIN_TLDS', 'com,net,org,io,co,ai,app,dev,shop,xyz').split(',')
+                    if tld.strip())
+DOMAIN_BULK_MAX = int(os.getenv('DOMAIN_BULK_MAX', 5000))
 
-load_dotenv()
+# available_only generation keeps checking rule-based candidates until it has
+# enough names with free domains, for at most this long / this many candidates
+AVAILABLE_ONLY_BUDGET = float(os.getenv('AVAILABLE_ONLY_BUDGET', 2.0))
+AVAILABLE_ONLY_MAX_CANDIDATES = int(os.getenv('AVAILABLE_ONLY_MAX_CANDIDATES', 50000))
+AVAILABLE_ONLY_CHUNK = 256
+
+# Server-side favorites (SQLite, WAL mode); writes from concurrent requests are
+# committed together in batches of up to FAVORITES_BATCH_SIZE operations
+FAVORITES_DB_PATH = os.getenv(
+    'FAVORITES_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'favorites.db')
+)
+FAVORITES_BATCH_SIZE = int(os.getenv('FAVORITES_BATCH_SIZE', 256))
+FAVORITES_BULK_MAX = int(os.getenv('FAVORITES_BULK_MAX', 500))
+FAVORITES_PAGE_MAX = 100
 
 app = Flask(__name__)
 CORS(app)
 
-class BusinessNameGenerator:
-    def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
-        self.lemmatizer = WordNetLemmatizer()
-        
-        # Predefined word lists for name generation
-        self.prefixes = [
-            'Meta', 'Neo', 'Pro', 'Ultra', 'Super', 'Smart', 'Tech', 'Digital',
-            'Cyber', 'Cloud', 'Quantum', 'Alpha', 'Beta', 'Prime', 'Elite',
-            'Global', 'Rapid', 'Swift', 'Pure', 'Fresh', 'Green', 'Blue',
-            'Crystal', 'Golden', 'Silver', 'Star', 'Moon', 'Sun', 'Fire'
-        ]
-        
-        self.suffixes = [
-            'Labs', 'Works', 'Studio', 'Solutions', 'Systems', 'Technologies',
-            'Innovations', 'Ventures', 'Enterprises', 'Group', 'Corp', 'Inc',
-            'Hub', 'Spot', 'Zone', 'Base', 'Center', 'Point', 'Space',
-            'ify', 'ly', 'wise', 'flow', 'sync', 'mind', 'wave', 'sphere'
-        ]
-        
-        self.connectors = ['&', 'and', '+', 'x', 'meets', 'plus']
-        
-        # Industry-specific keywords
-        self.industry_keywords = {
-            'tech': ['tech', 'digital', 'cyber', 'smart', 'ai', 'data', 'cloud', 'app'],
-            'food': ['fresh', 'tasty', 'bite', 'flavor', 'kitchen', 'chef', 'gourmet'],
-            'health': ['wellness', 'care', 'health', 'fit', 'pure', 'vital', 'life'],
-            'fashion': ['style', 'chic', 'trend', 'mode', 'elite', 'luxury', 'boutique'],
-            'eco': ['green', 'eco', 'natural', 'earth', 'pure', 'clean', 'sustainable'],
-            'pet': ['pet', 'paw', 'tail', 'furry', 'companion', 'animal', 'care'],
-            'beauty': ['beauty', 'glow', 'radiant', 'luxe', 'elegant', 'charm', 'allure']
-        }
-        
-        # Tone-based modifiers
-        self.tone_modifiers = {
-            'professional': {
-                'prefixes': ['Pro', 'Elite', 'Prime', 'Global', 'Alpha', 'Strategic'],
-                'suffixes': ['Solutions', 'Enterprises', 'Group', 'Corp', 'Systems', 'Consulting']
-            },
-            'playful': {
-                'prefixes': ['Bubble', 'Happy', 'Jolly', 'Funky', 'Crazy', 'Wild'],
-                'suffixes': ['Zone', 'Spot', 'Hub', 'Corner', 'Place', 'World']
-            },
-            'elegant': {
-                'prefixes': ['Luxe', 'Elite', 'Royal', 'Golden', 'Crystal', 'Pearl'],
-                'suffixes': ['Collection', 'Studio', 'Boutique', 'Gallery', 'House', 'Atelier']
-            },
-            'minimal': {
-                'prefixes': ['Pure', 'Simple', 'Clean', 'Clear', 'Bare', 'Core'],
-                'suffixes': ['Co', 'Lab', 'Studio', 'Works', 'Space', 'House']
-            }
-        }
+# Initialize the generators
+generator = BusinessNameGenerator()
+domain_index = load_domain_index(DOMAIN_INDEX_PATH)
+ai_generator = None
+if AI_ENABLED:
+    from ai_generator import AINameGenerator
+    ai_generator = AINameGenerator()
+    AI_AVAILABLE = bool(ai_generator.openai_api_key) or ai_generator.huggingface_available
+if not AI_AVAILABLE:
+    logger.info("AI features disabled - set AI_ENABLED=true with an OpenAI key or transformers installed")
 
-    def extract_keywords(self, text):
-        """Extract and process keywords from input text using NLP"""
-        # Tokenize and clean
-        tokens = word_tokenize(text.lower())
-        
-        # Remove stopwords and non-alphabetic tokens
-        keywords = [word for word in tokens if word.isalpha() and word not in self.stop_words]
-        
-        # Lemmatize words
-        keywords = [self.lemmatizer.lemmatize(word) for word in keywords]
-        
-        # Get synonyms for each keyword
-        expanded_keywords = set(keywords)
-        for keyword in keywords:
-            synonyms = self.get_synonyms(keyword)
-            expanded_keywords.update(synonyms[:3])  # Add up to 3 synonyms
-        
-        return list(expanded_keywords)
-
-    def get_synonyms(self, word):
-        """Get synonyms for a word using WordNet"""
-        synonyms = set()
-        for syn in wordnet.synsets(word):
-            for lemma in syn.lemmas():
-                synonym = lemma.name().replace('_', ' ')
-                if synonym != word and len(synonym) <= 12:  # Avoid very long synonyms
-                    synonyms.add(synonym)
-        return list(synonyms)
-
-    def detect_industry(self, keywords):
-        """Detect industry based on keywords"""
-        industry_scores = defaultdict(int)
-        
-        for keyword in keywords:
-            for industry, terms in self.industry_keywords.items():
-                if any(term in keyword.lower() for term in terms):
-                    industry_scores[industry] += 1
-        
-        if industry_scores:
-            return max(industry_scores, key=industry_scores.get)
-        return 'general'
-
-    def generate_rule_based_names(self, keywords, tone='professional', count=10):
-        """Generate business names using rule-based logic"""
-        names = []
-        industry = self.detect_industry(keywords)
-        
-        # Get tone-specific modifiers
-        tone_data = self.tone_modifiers.get(tone, self.tone_modifiers['professional'])
-        available_prefixes = self.prefixes + tone_data['prefixes']
-        available_suffixes = self.suffixes + tone_data['suffixes']
-        
-        # Add industry-specific keywords if detected
-        if industry in self.industry_keywords:
-            available_prefixes.extend(self.industry_keywords[industry])
-        
-        # Generate different types of names
-        main_keywords = keywords[:5]  # Use top 5 keywords
-        
-        for _ in range(count):
-            name_type = random.choice(['prefix_keyword', 'keyword_suffix', 'compound', 'modified'])
-            
-            if name_type == 'prefix_keyword':
-                prefix = random.choice(available_prefixes)
-                keyword = random.choice(main_keywords)
-                name = f"{prefix.title()}{keyword.title()}"
-                
-            elif name_type == 'keyword_suffix':
-                keyword = random.choice(main_keywords)
-                suffix = random.choice(available_suffixes)
-                name = f"{keyword.title()}{suffix.title()}"
-                
-            elif name_type == 'compound':
-                if len(main_keywords) >= 2:
-                    k1, k2 = random.sample(main_keywords, 2)
-                    connector = random.choice(['', ' & ', ' + ', ''])
-                    name = f"{k1.title()}{connector}{k2.title()}"
-                else:
-                    keyword = random.choice(main_keywords)
-                    suffix = random.choice(available_suffixes)
-                    name = f"{keyword.title()}{suffix}"
-                    
-            else:  # modified
-                keyword = random.choice(main_keywords)
-                # Add creative modifications
-                if random.choice([True, False]):
-                    name = keyword.title() + random.choice(['ify', 'ly', 'wise', 'hub', 'lab'])
-                else:
-                    name = random.choice(['The ', '']) + keyword.title() + random.choice([' Co', ' Lab', ' Works'])
-            
-            if name not in names and len(name) <= 25:
-                names.append(name)
-        
-        return names[:count]
-
-    def generate_taglines(self, business_names, industry='general'):
-        """Generate simple taglines for business names"""
-        tagline_templates = {
-            'general': [
-                "Innovating the future",
-                "Excellence delivered",
-                "Your success, our mission",
-                "Where quality meets innovation",
-                "Leading the way forward"
-            ],
-            'tech': [
-                "Powering digital transformation",
-                "Code the future",
-                "Where innovation meets technology",
-                "Building tomorrow's solutions",
-                "Smart technology, smarter results"
-            ],
-            'food': [
-                "Taste the difference",
-                "Fresh flavors, every time",
-                "Crafted with passion",
-                "Where taste meets quality",
-                "Bringing flavor to life"
-            ],
-            'health': [
-                "Your wellness journey starts here",
-                "Healthy living, better life",
-                "Care that counts",
-                "Wellness redefined",
-                "Your health, our priority"
-            ]
+_favorites_lock = threading.Lock()
+_favorites_store = None
+_favorites_opened = False
+
+def get_favorites_store():
+    """The favorites database, opened (created and migrated if needed) on first use; None if unavailable"""
+    global _favorites_store, _favorites_opened
+    with _favorites_lock:
+        if not _favorites_opened:
+            _favorites_store = load_favorites_store(FAVORITES_DB_PATH, batch_size=FAVORITES_BATCH_SIZE)
+            _favorites_opened = True
+        return _favorites_store
+
+STARTUP_TIMINGS = {}
+
+def warmup():
+    """Load all NLTK data up front and return how long each phase took (seconds).
+
+    Meant to run once in the gunicorn master with --preload (see gunicorn.conf.py),
+    so forked workers share the loaded corpora copy-on-write instead of each paying
+    for them on their first request.
+    """
+    def phase(name, load):
+        started = time.perf_counter()
+        load()
+        STARTUP_TIMINGS[name] = round(time.perf_counter() - started, 4)
+
+    phase('nltk_data', ensure_nltk_data)
+    phase('stopwords', lambda: generator.stop_words)
+    phase('tokenizer', lambda: word_tokenize('warm up'))
+    phase('wordnet', lambda: wordnet.ensure_loaded())
+    phase('lemmatizer', lambda: generator.lemmatizer.lemmatize('businesses'))
+    phase('synonyms', lambda: generator.get_synonyms('business'))
+    if generator.embedding_index is not None:
+        phase('embeddings', lambda: generator.get_neighbors('business'))
+
+    logger.info("Warm-up finished: " + ", ".join(f"{k}={v:.3f}s" for k, v in STARTUP_TIMINGS.items()))
+    return dict(STARTUP_TIMINGS)
+
+MAX_NAMES_PER_REQUEST = 50
+BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', 1000))
+
+def parse_generation_options(data):
+    """Validate the input_text/tone/count fields shared by /generate and /generate/batch"""
+    if not isinstance(data, dict):
+        raise ValueError('Expected a JSON object')
+
+    input_text = data.get('input_text', '')
+    if not isinstance(input_text, str) or not input_text.strip():
+        raise ValueError('Please provide input text')
+
+    tone = data.get('tone', 'professional')
+    return input_text, tone, parse_count(data)
+
+def parse_count(data):
+    """Number of names to generate, capped at MAX_NAMES_PER_REQUEST"""
+    try:
+        count = min(int(data.get('count', 15)), MAX_NAMES_PER_REQUEST)
+    except (TypeError, ValueError):
+        raise ValueError('count must be an integer')
+    if count < 1:
+        raise ValueError('count must be at least 1')
+    return count
+
+def parse_seed(data):
+    """Optional integer seed that makes a generation reproducible"""
+    seed = data.get('seed')
+    if seed is None or seed == '':
+        return None
+    if isinstance(seed, bool):
+        raise ValueError('seed must be an integer')
+    try:
+        return int(seed)
+    except (TypeError, ValueError):
+        raise ValueError('seed must be an integer')
+
+def parse_expansion(data):
+    """Keyword expansion backend from the 'expansion' field (default KEYWORD_EXPANSION)"""
+    expansion = data.get('expansion')
+    if expansion is None or expansion == '':
+        return generator.expansion
+    if expansion not in EXPANSION_BACKENDS:
+        raise ValueError('expansion must be one of: ' + ', '.join(EXPANSION_BACKENDS))
+    if expansion == 'embedding' and generator.embedding_index is None:
+        raise ValueError('expansion=embedding needs an embedding index, and none is loaded')
+    return expansion
+
+def request_rng(seed):
+    """Per-request random source; seeded requests always produce the same output"""
+    return random.Random(seed)
+
+if CURSOR_SECRET is None:
+    logger.warning("CURSOR_SECRET is not set; page cursors are only valid in this process and its forks")
+cursor_codec = CursorCodec(CURSOR_SECRET.encode('utf-8') if CURSOR_SECRET else None)
+
+def parse_page_cursor(data):
+    """Decoded 'cursor' field of a request for the next page, or None for a new generation"""
+    if not isinstance(data, dict):
+        raise ValueError('Expected a JSON object')
+    token = data.get('cursor')
+    if token is None or token == '':
+        return None
+    cursor = cursor_codec.decode(token)
+    if cursor.get('v') != CURSOR_VERSION:
+        raise ValueError('Invalid cursor')
+    if cursor['vocabulary'] != generator.vocabulary.version:
+        raise ValueError('The word lists changed since this cursor was issued; start a new generation')
+    return cursor
+
+def cursor_input(cursor):
+    """Keywords and industry of the generation a cursor continues"""
+    metrics.set_labels(industry=cursor['industry'])
+    return cursor['keywords'], cursor['industry']
+
+def cursor_rng(cursor):
+    """Random source for the taglines of the page after cursor (same page, same taglines)"""
+    return request_rng(f"{cursor['seed']}:{sum(cursor['state'])}")
+
+def rule_based_page(keywords, industry, tone, count, rng, cursor=None):
+    """Rule-based names of a new generation, or of the page after cursor, and the next page's cursor"""
+    if cursor is None:
+        seed, state = rng.getrandbits(64), None
+    else:
+        seed, state = cursor['seed'], tuple(cursor['state'])
+    names, state = generator.rule_based_page(keywords, tone, count, industry, seed, state)
+    if state is None:
+        return names, None  # every candidate has been shown
+    return names, cursor_codec.encode({
+        'v': CURSOR_VERSION,
+        'seed': seed,
+        'state': list(state),
+        'keywords': keywords[:10],
+        'industry': industry,
+        'tone': tone,
+        'vocabulary': generator.vocabulary.version
+    })
+
+def request_payload():
+    """JSON body for POST requests, query parameters for GET"""
+    if request.method == 'GET':
+        data = request.args.to_dict()
+        for flag in ('use_ai', 'check_domains', 'available_only'):
+            if flag in data:
+                data[flag] = data[flag].lower() in ('1', 'true', 'yes')
+        return data
+    return request.get_json()
+
+TLD_PATTERN = re.compile(r'^[a-z0-9-]{2,63}$')
+
+def parse_tlds(value):
+    """TLDs from a list or comma-separated string (default DOMAIN_TLDS)"""
+    if value is None or value == '':
+        return DOMAIN_TLDS
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list) or not value:
+        raise ValueError('tlds must be a list of TLDs')
+
+    tlds = []
+    for tld in value:
+        tld = tld.strip().lstrip('.').lower() if isinstance(tld, str) else ''
+        if not TLD_PATTERN.match(tld):
+            raise ValueError('tlds must be a list of TLDs')
+        if tld not in tlds:
+            tlds.append(tld)
+    return tuple(tlds)
+
+def parse_domain_options(data):
+    """(TLDs to check the generated names against or None, available_only flag)"""
+    if data.get('available_only'):
+        # Only names whose domain is free under every TLD are kept (default: the first DOMAIN_TLDS)
+        tlds = parse_tlds(data.get('tlds')) if data.get('tlds') is not None else DOMAIN_TLDS[:1]
+        if domain_index is None:
+            raise ValueError('available_only needs a domain index, and none is loaded')
+        unindexed = [tld for tld in tlds if tld not in domain_index.tlds]
+        if unindexed:
+            raise ValueError('available_only needs TLDs in the domain index; unknown: '
+                             + ', '.join(unindexed))
+        return tlds, True
+    if not data.get('check_domains') and data.get('tlds') is None:
+        return None, False
+    return parse_tlds(data.get('tlds')), False
+
+def build_result(names, taglines, keywords, industry, generation_method, cursor=None):
+    """Assemble the JSON payload returned for one generation"""
+    metrics.set_labels(method=generation_method)
+    
+    # Categorize names
+    categories = generator.categorize_names(names)
+    
+    # Combine names with taglines
+    name_data = [
+        {
+            'name': name,
+            'tagline': tagline,
+            'id': i
         }
+        for i, (name, tagline) in enumerate(zip(names, taglines))
+    ]
+    
+    return {
+        'names': name_data,
+        'categories': categories,
+        'keywords_extracted': keywords[:10],  # Show top 10 keywords
+        'industry_detected': industry,
+        'total_generated': len(names),
+        'generation_method': generation_method,
+        'ai_available': AI_AVAILABLE,
+        'cursor': cursor  # pass back as 'cursor' for the next page of rule-based names
+    }
+
+response_cache = LRUCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL, name='responses')
+
+request_flight = None
+if COALESCE_REQUESTS:
+    request_flight = FileSingleFlight(COALESCE_DIR, COALESCE_WAIT) if COALESCE_DIR else SingleFlight()
+
+def coalesce(key, build):
+    """(build() or the result of an identical build already running, None or where that result came from)"""
+    if request_flight is None:
+        return build(), None
+    return request_flight.do(key, build)
+
+def count_coalesced(scope):
+    """Count and label the current request as answered by another one's work"""
+    metrics.COALESCED_REQUESTS.inc((scope,))
+    metrics.set_labels(method='coalesced')
+
+def coalesced(key, build):
+    """build(), or the result of an identical build that is already running (see singleflight.py)"""
+    result, scope = coalesce(key, build)
+    if scope is not None:
+        count_coalesced(scope)
+    return result
+
+def encode_cacheable(payload):
+    """JSON body and its ETag for a response_cache entry"""
+    body = app.json.dumps(payload).encode() + b'\n'
+    return body, hashlib.blake2b(body, digest_size=16).hexdigest()
+
+def cached_json_response(key, build):
+    """JSON response with an ETag, served from response_cache when key is set.
+
+    Only seeded rule-based requests and next-page requests get a key: their
+    output is reproducible, so it may be cached here and by clients/CDNs.
+    Everything else, AI names included, is marked no-store.
+    """
+    if key is None:
+        response = jsonify(build())
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    entry = response_cache.get(key)
+    if entry is None:
+        entry = encode_cacheable(build())
+        response_cache.set(key, entry)
+
+    body, etag = entry
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'public, max-age={int(RESPONSE_CACHE_TTL)}'
+    return response.make_conditional(request)
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream'
+}
+
+def requested_stream_format(data):
+    """Return 'ndjson' or 'sse' if the client asked for a streamed response, else None"""
+    stream = data.get('stream')
+    if stream in STREAM_FORMATS:
+        return stream
+    if stream is True:
+        return 'ndjson'
+
+    accept = request.headers.get('Accept', '')
+    for stream_format, mimetype in STREAM_FORMATS.items():
+        if mimetype in accept:
+            return stream_format
+    return None
+
+def encode_frame(frame, stream_format):
+    """Serialize one stream frame as an NDJSON line or a server-sent event"""
+    payload = json.dumps(frame)
+    if stream_format == 'sse':
+        return f"event: {frame['type']}\ndata: {payload}\n\n"
+    return payload + '\n'
+
+def stream_start(input_text, expansion, tone, count, use_ai, rng, cursor=None):
+    """Keywords, industry, rule-based names and taglines of a streamed generation: what is sent before AI names"""
+    keywords, industry = analyze_input(input_text, expansion) if cursor is None else cursor_input(cursor)
+    rule_count = split_ai_count(count)[1] if use_ai and ai_generator else count
+    names, next_cursor = rule_based_page(keywords, industry, tone, rule_count, rng, cursor)
+    return {
+        'keywords': keywords,
+        'industry': industry,
+        'names': names,
+        'taglines': generator.generate_taglines(names, industry, rng),
+        'cursor': next_cursor
+    }
+
+def stream_ai_names(keywords, industry, tone, count, exclude, rng):
+    """AI names not in exclude and their taglines, for a streamed generation"""
+    names = [name for name in ai_generator.generate_creative_names(keywords, tone, count) if name not in exclude]
+    if ai_generator.openai_api_key:
+        taglines = ai_generator.generate_ai_taglines(
+            names, industry, fallback=generator.generate_taglines(names, industry, rng)
+        )
+    else:
+        taglines = generator.generate_taglines(names, industry, rng)
+    return {'names': names, 'taglines': taglines}
+
+def iter_generation_frames(start, tone, count, use_ai, rng, request_key, scope=None):
+    """Yield a frame per name as soon as it is produced, then a summary frame.
+
+    start is stream_start's result, and scope where it came from (None if this
+    request generated it). Rule-based names are sent first since they take
+    microseconds; AI names follow once the remote/model calls return, shared
+    with identical streams in flight like the start is. Categories and metadata
+    go in the final 'done' frame because they depend on the complete list.
+    """
+    keywords, industry = start['keywords'], start['industry']
+    names = []
+    taglines = []
+
+    def name_frame(name, tagline):
+        names.append(name)
+        taglines.append(tagline)
+        return {'type': 'name', 'id': len(names) - 1, 'name': name, 'tagline': tagline}
+
+    try:
+        if use_ai and ai_generator:
+            ai_count = split_ai_count(count)[0]
+            generation_method = "AI + Rule-based"
+        else:
+            ai_count = 0
+            generation_method = "Rule-based"
+        # Labelled up front, so a stream the client abandons is still attributed to its method
+        metrics.set_labels(method=generation_method if scope is None else 'coalesced')
+
+        for name, tagline in zip(start['names'], start['taglines']):
+            yield name_frame(name, tagline)
+
+        if ai_count:
+            ai, ai_scope = coalesce(('ai',) + request_key, lambda: stream_ai_names(
+                keywords, industry, tone, ai_count, set(names), rng
+            ))
+            if ai_scope is not None and scope is None:
+                scope = ai_scope
+                count_coalesced(scope)
+            for name, tagline in zip(ai['names'], ai['taglines']):
+                if name not in names:  # the shared AI names were filtered against another request's names
+                    yield name_frame(name, tagline)
+
+        summary = build_result(names[:count], taglines[:count], keywords, industry, generation_method,
+                               start['cursor'])
+        if scope is not None:
+            metrics.set_labels(method='coalesced')
+        del summary['names']
+        yield {'type': 'done', **summary}
+
+    except Exception as e:
+        yield {'type': 'error', 'error': str(e)}
+
+def stream_response(frames, stream_format):
+    """Wrap a frame iterator in an unbuffered streaming response"""
+    body = stream_with_context(encode_frame(frame, stream_format) for frame in frames)
+    return Response(body, mimetype=STREAM_FORMATS[stream_format], headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # don't let nginx-style proxies hold frames back
+    })
+
+def generate_batch_results(items):
+    """Generate rule-based names for many items, sharing work between identical inputs"""
+    analyses = {}  # (normalized text, expansion) -> (keywords, industry)
+    generated = {}  # (normalized text, expansion, tone, count, seed) -> result
+    results = []
+
+    for index, item in enumerate(items):
+        try:
+            input_text, tone, count = parse_generation_options(item)
+            seed = parse_seed(item)
+            expansion = parse_expansion(item)
+            text_key = (generator.normalize_text(input_text), expansion)
+            key = (*text_key, tone, count, seed)
+
+            if key not in generated:
+                if text_key not in analyses:
+                    keywords = generator.extract_keywords(*text_key)
+                    industry = generator.detect_industry(keywords) if keywords else None
+                    analyses[text_key] = (keywords, industry)
+                keywords, industry = analyses[text_key]
+
+                if not keywords:
+                    raise ValueError('No valid keywords found in input')
+
+                rng = request_rng(seed)
+                names, cursor = rule_based_page(keywords, industry, tone, count, rng)
+                taglines = generator.generate_taglines(names, industry, rng)
+                generated[key] = build_result(names, taglines, keywords, industry, "Rule-based", cursor)
+
+            results.append({'index': index, **generated[key]})
+        except Exception as e:
+            results.append({'index': index, 'error': str(e)})
+
+    return results, len(generated)
+
+def analyze_input(input_text, expansion=None):
+    """Keywords and industry for an input text; raises ValueError if nothing usable remains"""
+    # Extract keywords using NLP
+    keywords = generator.extract_keywords(input_text, expansion)
+    
+    if not keywords:
+        raise ValueError('No valid keywords found in input')
+    
+    # Detect industry for better taglines
+    industry = generator.detect_industry(keywords)
+    metrics.set_labels(industry=industry)
+    return keywords, industry
+
+def split_ai_count(count):
+    """How many of count names to request from AI and from the rule-based generator"""
+    ai_count = min(count // 2, 15)  # Limit AI calls
+    return ai_count, count - ai_count
+
+def mixed_result(keywords, industry, count, rng, ai_names, rule_names, ai_taglines=None, cursor=None):
+    """Shuffle AI and rule-based names together and line up their taglines"""
+    all_names = ai_names + rule_names
+    rng.shuffle(all_names)
+    names = all_names[:count]
+    
+    if ai_taglines is not None:
+        rule_taglines = generator.generate_taglines(rule_names, industry, rng)
         
-        templates = tagline_templates.get(industry, tagline_templates['general'])
-        
+        # Combine taglines in the same order as names
         taglines = []
-        for name in business_names:
-            tagline = random.choice(templates)
-            taglines.append(tagline)
-        
-        return taglines
-
-    def categorize_names(self, names):
-        """Categorize names by theme"""
-        categories = {
-            'Tech & Innovation': [],
-            'Professional': [],
-            'Creative': [],
-            'Elegant': []
-        }
-        
-        tech_keywords = ['tech', 'digital', 'cyber', 'smart', 'cloud', 'lab', 'system']
-        professional_keywords = ['corp', 'group', 'enterprise', 'solution', 'consulting', 'global']
-        elegant_keywords = ['luxe', 'elite', 'royal', 'golden', 'crystal', 'boutique', 'studio']
+        ai_tagline_dict = dict(zip(ai_names, ai_taglines))
+        rule_tagline_dict = dict(zip(rule_names, rule_taglines))
         
         for name in names:
-            name_lower = name.lower()
-            
-            if any(keyword in name_lower for keyword in tech_keywords):
-                categories['Tech & Innovation'].append(name)
-            elif any(keyword in name_lower for keyword in professional_keywords):
-                categories['Professional'].append(name)
-            elif any(keyword in name_lower for keyword in elegant_keywords):
-                categories['Elegant'].append(name)
+            if name in ai_tagline_dict:
+                taglines.append(ai_tagline_dict[name])
+            elif name in rule_tagline_dict:
+                taglines.append(rule_tagline_dict[name])
             else:
-                categories['Creative'].append(name)
-        
-        # Remove empty categories
-        return {k: v for k, v in categories.items() if v}
+                taglines.append(generator.generate_taglines([name], industry, rng)[0])
+    else:
+        taglines = generator.generate_taglines(names, industry, rng)
+    
+    return build_result(names, taglines, keywords, industry, "AI + Rule-based", cursor)
 
-# Initialize the generators
-generator = BusinessNameGenerator()
-# AI generator disabled for now
-# ai_generator = AINameGenerator() if AI_AVAILABLE else None
+def generate_result(input_text, tone, count, use_ai, rng, tlds=None, available_only=False, expansion=None,
+                    cursor=None):
+    """Run one non-streamed generation (or the page after cursor) and return the response payload"""
+    if cursor is not None:
+        keywords, industry = cursor_input(cursor)
+        result = _generate_result(keywords, industry, tone, count, False, rng, cursor)
+        if tlds:
+            add_domain_availability(result, tlds)
+        return result
+    
+    keywords, industry = analyze_input(input_text, expansion)
+    if available_only:
+        return available_result(keywords, industry, tone, count, rng, tlds)
+    result = _generate_result(keywords, industry, tone, count, use_ai, rng)
+    if tlds:
+        add_domain_availability(result, tlds)
+    return result
+
+def _generate_result(keywords, industry, tone, count, use_ai, rng, cursor=None):
+    
+    if use_ai and ai_generator:
+        # Mix AI and rule-based names
+        ai_count, rule_count = split_ai_count(count)
+        ai_names = ai_generator.generate_creative_names(keywords, tone, ai_count)
+        rule_names, next_cursor = rule_based_page(keywords, industry, tone, rule_count, rng)
+        
+        # Try to generate AI taglines for AI names
+        ai_taglines = None
+        if ai_generator.openai_api_key:
+            ai_taglines = ai_generator.generate_ai_taglines(
+                ai_names, industry, fallback=generator.generate_taglines(ai_names, industry, rng)
+            )
+        return mixed_result(keywords, industry, count, rng, ai_names, rule_names, ai_taglines, next_cursor)
+    
+    # Use only rule-based generation
+    names, next_cursor = rule_based_page(keywords, industry, tone, count, rng, cursor)
+    taglines = generator.generate_taglines(names, industry, rng)
+    return build_result(names, taglines, keywords, industry, "Rule-based", next_cursor)
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/generate', methods=['POST'])
+@app.route('/generate', methods=['GET', 'POST'])
 def generate_names():
     try:
-        data = request.get_json()
-        input_text = data.get('input_text', '')
-        tone = data.get('tone', 'professional')
-        count = min(int(data.get('count', 15)), 50)  # Limit to 50 names max
-        use_ai = data.get('use_ai', False) and AI_AVAILABLE
+        data = request_payload()
+        try:
+            cursor = parse_page_cursor(data)
+            if cursor is None:
+                input_text, tone, count = parse_generation_options(data)
+                expansion = parse_expansion(data)
+            else:
+                # The next page of an earlier generation: its text, tone and seed come from the cursor
+                input_text, tone, count = None, cursor['tone'], parse_count(data)
+                expansion = None
+            seed = parse_seed(data)
+            tlds, available_only = parse_domain_options(data)
+            if available_only and cursor is not None:
+                raise ValueError('available_only results have no next page')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        # available_only searches the rule-based candidate space, so it never uses AI; nor do next pages
+        use_ai = bool(data.get('use_ai', False) and AI_AVAILABLE and not available_only and cursor is None)
+        rng = request_rng(seed) if cursor is None else cursor_rng(cursor)
         
-        if not input_text.strip():
-            return jsonify({'error': 'Please provide input text'}), 400
+        # Identical requests generating at the same time share one result; seeded rule-based
+        # ones and next pages (a cursor fixes the seed) are cached too
+        if cursor is None:
+            request_key = (generator.normalize_text(input_text), tone, count, seed, use_ai, tlds, available_only,
+                           expansion, generator.content_version())
+        else:
+            request_key = ('cursor', data['cursor'], count, tlds, generator.content_version())
         
-        # Extract keywords using NLP
-        keywords = generator.extract_keywords(input_text)
+        stream_format = requested_stream_format(data)
+        if stream_format:
+            if available_only:
+                return jsonify({'error': 'available_only is not supported for streamed responses'}), 400
+            # Timed until the last frame is sent (or the client goes away). The headers leave
+            # before any name is generated, so streamed responses carry no X-Timing
+            timer = metrics.StageTimer(tone=metric_tone(tone))
+            stream_key = ('stream',) + request_key
+            try:
+                with metrics.current_timer(timer):
+                    start, scope = coalesce(stream_key, lambda: stream_start(
+                        input_text, expansion, tone, count, use_ai, rng, cursor
+                    ))
+                    metrics.set_labels(industry=start['industry'])
+                    if scope is not None:
+                        count_coalesced(scope)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            frames = iter_generation_frames(start, tone, count, use_ai, rng, stream_key, scope)
+            return stream_response(metrics.timed_iterator(frames, timer), stream_format)
         
-        if not keywords:
-            return jsonify({'error': 'No valid keywords found in input'}), 400
+        cache_key = request_key if (seed is not None or cursor is not None) and not use_ai else None
         
-        # Detect industry for better taglines
-        industry = generator.detect_industry(keywords)
+        def build():
+            return generate_result(input_text, tone, count, use_ai, rng, tlds, available_only, expansion, cursor)
         
-        # Generate business names
-        if use_ai and ai_generator:
-            # Mix AI and rule-based names
-            ai_count = min(count // 2, 15)  # Limit AI calls
-            rule_count = count - ai_count
-            
-            ai_names = ai_generator.generate_creative_names(keywords, tone, ai_count)
-            rule_names = generator.generate_rule_based_names(keywords, tone, rule_count)
-            
-            # Combine and shuffle
-            all_names = ai_names + rule_names
-            random.shuffle(all_names)
-            names = all_names[:count]
-            
-            # Try to generate AI taglines for AI names
-            if ai_generator.openai_api_key:
-                ai_taglines = ai_generator.generate_ai_taglines(ai_names, industry)
-                rule_taglines = generator.generate_taglines(rule_names, industry)
-                
-                # Combine taglines in the same order as names
-                taglines = []
-                ai_tagline_dict = dict(zip(ai_names, ai_taglines))
-                rule_tagline_dict = dict(zip(rule_names, rule_taglines))
-                
-                for name in names:
-                    if name in ai_tagline_dict:
-                        taglines.append(ai_tagline_dict[name])
-                    elif name in rule_tagline_dict:
-                        taglines.append(rule_tagline_dict[name])
-                    else:
-                        taglines.append(generator.generate_taglines([name], industry)[0])
-            else:
-                taglines = generator.generate_taglines(names, industry)
-                
-            generation_method = "AI + Rule-based"
-        else:
-            # Use only rule-based generation
-            names = generator.generate_rule_based_names(keywords, tone, count)
-            taglines = generator.generate_taglines(names, industry)
-            generation_method = "Rule-based"
+        try:
+            # Seeded cache hits keep the 'cached' method label; anything generated relabels it
+            with metrics.request_timer(tone=metric_tone(tone), method='cached') as timer:
+                response = cached_json_response(cache_key, lambda: coalesced(request_key, build))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if wants_timing_header(request.headers.get('X-Timing')):
+            response.headers['X-Timing'] = timer.header_value()
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/generate/batch', methods=['POST'])
+def generate_names_batch():
+    """Generate rule-based names for a list of {input_text, tone, count} items"""
+    try:
+        data = request.get_json()
+        items = data.get('items') if isinstance(data, dict) else data
         
-        # Categorize names
-        categories = generator.categorize_names(names)
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'Please provide a non-empty list of items'}), 400
+        if len(items) > BATCH_MAX_ITEMS:
+            return jsonify({'error': f'A batch can contain at most {BATCH_MAX_ITEMS} items'}), 400
         
-        # Combine names with taglines
-        name_data = [
-            {
-                'name': name,
-                'tagline': tagline,
-                'id': i
-            }
-            for i, (name, tagline) in enumerate(zip(names, taglines))
-        ]
+        results, unique_inputs = generate_batch_results(items)
         
         return jsonify({
-            'names': name_data,
-            'categories': categories,
-            'keywords_extracted': keywords[:10],  # Show top 10 keywords
-            'industry_detected': industry,
-            'total_generated': len(names),
-            'generation_method': generation_method,
-            'ai_available': AI_AVAILABLE
+            'results': results,
+            'total_items': len(items),
+            'unique_inputs': unique_inputs,
+            'failed_items': sum(1 for result in results if 'error' in result)
         })
         
     except Exception as e:
@@ -355,71 +684,355 @@ def generate_names():
 
 @app.route('/save_favorite', methods=['POST'])
 def save_favorite():
-    """Save favorite name to local storage (backend endpoint for future use)"""
+    """Save one favorite ({user_id, name, tagline}) or several ({user_id, favorites: [...]})"""
     try:
+        favorites_store = get_favorites_store()
+        if favorites_store is None:
+            return jsonify({'error': 'Favorites storage is unavailable'}), 503
+        
+        data = request.get_json()
+        try:
+            user_id = parse_user_id(data)
+            favorites = parse_favorites(data)
+            tone, industry = parse_favorite_context(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        saved = favorites_store.add(user_id, favorites, tone, industry)
+        return jsonify({'success': True, 'message': 'Favorite saved!', 'saved': saved})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/remove_favorite', methods=['POST'])
+def remove_favorite():
+    """Remove favorites by name ({user_id, name} or {user_id, names: [...]})"""
+    try:
+        favorites_store = get_favorites_store()
+        if favorites_store is None:
+            return jsonify({'error': 'Favorites storage is unavailable'}), 503
+        
         data = request.get_json()
-        name = data.get('name')
-        tagline = data.get('tagline')
+        try:
+            user_id = parse_user_id(data)
+            names = data.get('names', [data.get('name')])
+            if not isinstance(names, list) or not names or not all(isinstance(n, str) and n.strip() for n in names):
+                raise ValueError('Provide a name or a list of names')
+            if len(names) > FAVORITES_BULK_MAX:
+                raise ValueError(f'At most {FAVORITES_BULK_MAX} favorites can be removed at once')
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # For now, just return success (frontend handles local storage)
-        return jsonify({'success': True, 'message': 'Favorite saved!'})
+        return jsonify({'success': True, 'removed': favorites_store.remove(user_id, names)})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/favorites')
+def list_favorites():
+    """A user's favorites, newest first; pass next_cursor back as cursor for the next page"""
+    try:
+        favorites_store = get_favorites_store()
+        if favorites_store is None:
+            return jsonify({'error': 'Favorites storage is unavailable'}), 503
+        
+        try:
+            user_id = parse_user_id(request.args)
+            limit = parse_limit(request.args.get('limit'), 50)
+            before_id = parse_favorites_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        favorites, next_cursor = favorites_store.page(user_id, limit, before_id)
+        return jsonify({'favorites': favorites, 'next_cursor': next_cursor and str(next_cursor)})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/favorites/popular')
+def popular_favorites():
+    """Most-saved names across all users"""
+    try:
+        favorites_store = get_favorites_store()
+        if favorites_store is None:
+            return jsonify({'error': 'Favorites storage is unavailable'}), 503
+        try:
+            limit = parse_limit(request.args.get('limit'), 20)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return jsonify({'names': favorites_store.popular(limit)})
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+USER_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+def parse_user_id(data):
+    """Opaque per-browser id the frontend keeps in localStorage"""
+    user_id = data.get('user_id') if hasattr(data, 'get') else None
+    if not isinstance(user_id, str) or not USER_ID_PATTERN.match(user_id):
+        raise ValueError('user_id must be 1-64 letters, digits, "-" or "_"')
+    return user_id
+
+def parse_favorites(data):
+    """(name, tagline) pairs from a single favorite or a favorites list"""
+    items = data.get('favorites', [data])
+    if not isinstance(items, list) or not items:
+        raise ValueError('favorites must be a non-empty list')
+    if len(items) > FAVORITES_BULK_MAX:
+        raise ValueError(f'At most {FAVORITES_BULK_MAX} favorites can be saved at once')
+    
+    favorites = []
+    for item in items:
+        name = item.get('name') if isinstance(item, dict) else None
+        tagline = item.get('tagline') if isinstance(item, dict) else None
+        if not isinstance(name, str) or not name.strip() or len(name) > MAX_NAME_LENGTH:
+            raise ValueError(f'Each favorite needs a name of at most {MAX_NAME_LENGTH} characters')
+        if tagline is not None and not isinstance(tagline, str):
+            raise ValueError('tagline must be a string')
+        favorites.append((name.strip(), tagline[:MAX_TAGLINE_LENGTH] if tagline else None))
+    return favorites
+
+def parse_favorite_context(data):
+    """Optional tone and industry the favorites were generated for (ranking input)"""
+    tone = data.get('tone') or None
+    industry = data.get('industry') or None
+    if tone is not None and (not isinstance(tone, str) or tone not in generator.tone_modifiers):
+        raise ValueError(f'tone must be one of: {", ".join(generator.tone_modifiers)}')
+    if industry is not None and (not isinstance(industry, str) or not re.match(r'^[a-z_]{1,32}$', industry)):
+        raise ValueError('Invalid industry')
+    return tone, industry
+
+def parse_favorites_cursor(value):
+    """Keyset cursor: favorites older than this id"""
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError('Invalid cursor')
+
+def parse_limit(value, default):
+    """Page size between 1 and FAVORITES_PAGE_MAX"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    return max(1, min(limit, FAVORITES_PAGE_MAX))
+
 @app.route('/health')
 def health_check():
     return jsonify({'status': 'healthy', 'message': 'Business Name Generator API is running!'})
 
+@app.route('/stats')
+def get_stats():
+    """Cache statistics for this worker process"""
+    return jsonify({
+        'pid': os.getpid(),
+        'warmup': STARTUP_TIMINGS,
+        'caches': {
+            'keywords': generator.keyword_cache.stats(),
+            'industry': generator.industry_cache.stats(),
+            'candidates': generator.candidate_cache.stats(),
+            'lemmas': generator.lemma_cache.stats(),
+            'synonyms': generator.synonym_cache.stats(),
+            'responses': response_cache.stats()
+        },
+        'coalescing': request_flight.stats() if request_flight else None,
+        'domain_index': {'domains': len(domain_index), 'tlds': sorted(domain_index.tlds)}
+                        if domain_index else None,
+        'inference': ai_generator.inference_client.stats()
+                     if ai_generator and ai_generator.inference_client else None
+    })
+
+@app.route('/metrics')
+def get_metrics():
+    """Per-stage /generate latency histograms (all workers) in Prometheus text format"""
+    return Response(metrics.render(), content_type=metrics.PROMETHEUS_CONTENT_TYPE)
+
+def metric_tone(tone):
+    """Tone as a metrics label: unknown tones are folded into 'other' to bound cardinality"""
+    return tone if tone in generator.tone_modifiers else 'other'
+
+def wants_timing_header(value):
+    """Clients opt in to the X-Timing breakdown by sending X-Timing: 1"""
+    return (value or '').lower() in ('1', 'true', 'yes')
+
 @app.route('/features')
 def get_features():
     """Get available features and capabilities"""
-    features = {
+    return jsonify(feature_flags())
+
+def feature_flags():
+    """Capabilities reported by /features"""
+    return {
         'ai_generation': AI_AVAILABLE,
         'openai_available': ai_generator.openai_api_key is not None if AI_AVAILABLE else False,
-        'huggingface_available': ai_generator.hf_model is not None if AI_AVAILABLE else False,
+        'huggingface_available': ai_generator.huggingface_available if AI_AVAILABLE else False,
         'rule_based_generation': True,
         'nlp_processing': True,
         'category_filtering': True,
         'favorites_storage': True,
-        'tagline_generation': True
+        'server_favorites': get_favorites_store() is not None,
+        'tagline_generation': True,
+        'domain_checking': domain_index is not None,
+        'embedding_expansion': generator.embedding_index is not None
     }
-    
-    return jsonify(features)
 
 @app.route('/check-domain', methods=['POST'])
 def check_domain_availability():
-    """Placeholder for domain availability checking"""
+    """Check business names against the registered-domain index"""
     try:
         data = request.get_json()
-        business_name = data.get('business_name', '')
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
         
-        if not business_name:
-            return jsonify({'error': 'Business name is required'}), 400
+        try:
+            tlds = parse_tlds(data.get('tlds'))
+            business_names = parse_business_names(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Placeholder response - in a real implementation, you'd use a domain API
-        domain_suggestions = [
-            f"{business_name.lower().replace(' ', '')}.com",
-            f"{business_name.lower().replace(' ', '')}.net",
-            f"{business_name.lower().replace(' ', '')}.org",
-            f"{business_name.lower().replace(' ', '')}.io"
-        ]
+        if business_names is None:
+            return jsonify(domain_availability(data['business_name'], tlds))
+        return jsonify(bulk_domain_availability(business_names, tlds))
         
-        # Simulate some domains being taken
-        availability = {
-            domain: random.choice([True, False]) 
-            for domain in domain_suggestions
-        }
-        
-        return jsonify({
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def parse_business_names(data):
+    """None for a single-name check, the list of names for a bulk check"""
+    names = data.get('business_names')
+    if names is None:
+        if not data.get('business_name') or not isinstance(data['business_name'], str):
+            raise ValueError('Business name is required')
+        return None
+    if not isinstance(names, list) or not names or not all(isinstance(name, str) for name in names):
+        raise ValueError('business_names must be a non-empty list of names')
+    if len(names) > DOMAIN_BULK_MAX:
+        raise ValueError(f'At most {DOMAIN_BULK_MAX} names can be checked at once')
+    return names
+
+def name_domains(business_name, tlds):
+    """Candidate domains for a business name, one per TLD"""
+    label = domain_label(business_name)
+    return [f"{label}.{tld}" for tld in tlds] if label else []
+
+def lookup_domains(domains):
+    """domain -> available (True/False), or None if it can't be determined locally"""
+    if domain_index is None:
+        return {domain: None for domain in domains}
+    return domain_index.availability(domains)
+
+def domain_note(has_unknown):
+    """Explanation for null availabilities, if there are any"""
+    if not has_unknown:
+        return None
+    if domain_index is None:
+        return 'No domain index is loaded, so availability is unknown. Build one with domain_index.py.'
+    return 'Availability is unknown (null) for TLDs that are not in the domain index.'
+
+def domain_availability(business_name, tlds=DOMAIN_TLDS):
+    """Availability of a business name's domain under each TLD"""
+    domain_suggestions = name_domains(business_name, tlds)
+    availability = lookup_domains(domain_suggestions)
+    
+    result = {
+        'business_name': business_name,
+        'domain_suggestions': domain_suggestions,
+        'availability': availability
+    }
+    note = domain_note(None in availability.values())
+    if note:
+        result['note'] = note
+    return result
+
+def bulk_domain_availability(business_names, tlds=DOMAIN_TLDS):
+    """Bulk mode of /check-domain: one availability map per name"""
+    results = []
+    has_unknown = False
+    for business_name in business_names:
+        availability = lookup_domains(name_domains(business_name, tlds))
+        has_unknown = has_unknown or None in availability.values()
+        results.append({
             'business_name': business_name,
-            'domain_suggestions': domain_suggestions,
             'availability': availability,
-            'note': 'This is a demo. Real domain checking requires a domain API service.'
+            'available_domains': [domain for domain, available in availability.items() if available]
         })
+    
+    response = {'results': results, 'tlds': list(tlds), 'total_names': len(business_names)}
+    note = domain_note(has_unknown)
+    if note:
+        response['note'] = note
+    return response
+
+@timed('domain_search')
+def available_rule_based_names(keywords, industry, tone, count, rng, tlds):
+    """Rule-based names whose domains are free under every TLD, plus search statistics.
+
+    Candidates are drawn lazily from the seeded candidate engine and checked in
+    bulk a chunk at a time, until count names are found, the candidate space
+    runs out, or AVAILABLE_ONLY_BUDGET / AVAILABLE_ONLY_MAX_CANDIDATES is hit.
+    """
+    started = time.monotonic()
+    candidates = generator.iter_rule_based_names(keywords, tone, industry, seed=rng.getrandbits(64))
+    names = []
+    seen_labels = set()
+    tried = 0
+    stopped_by = 'count'
+    
+    while len(names) < count:
+        if time.monotonic() - started >= AVAILABLE_ONLY_BUDGET:
+            stopped_by = 'time_budget'
+            break
+        if tried >= AVAILABLE_ONLY_MAX_CANDIDATES:
+            stopped_by = 'candidate_limit'
+            break
+        chunk = list(islice(candidates, min(AVAILABLE_ONLY_CHUNK, AVAILABLE_ONLY_MAX_CANDIDATES - tried)))
+        if not chunk:
+            stopped_by = 'exhausted'
+            break
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        labels = [domain_label(name) for name in chunk]
+        availability = domain_index.availability(
+            f"{label}.{tld}" for label in set(labels) if label for tld in tlds
+        )
+        for name, label in zip(chunk, labels):
+            tried += 1
+            # "Coffee & Lab" and "CoffeeLab" share a domain; keep the first
+            if not label or label in seen_labels:
+                continue
+            if all(availability[f"{label}.{tld}"] for tld in tlds):
+                seen_labels.add(label)
+                names.append(name)
+                if len(names) == count:
+                    break
+    
+    return names, {
+        'candidates_tried': tried,
+        'available_found': len(names),
+        'stopped_by': stopped_by,
+        'search_ms': round((time.monotonic() - started) * 1000, 1)
+    }
+
+def available_result(keywords, industry, tone, count, rng, tlds):
+    """available_only generation: names with free domains, reporting the search"""
+    names, search = available_rule_based_names(keywords, industry, tone, count, rng, tlds)
+    taglines = generator.generate_taglines(names, industry, rng)
+    result = build_result(names, taglines, keywords, industry, "Rule-based (available domains)")
+    add_domain_availability(result, tlds)
+    result['domain_search'] = search
+    return result
+
+@timed('domain_lookup')
+def add_domain_availability(result, tlds):
+    """Bulk-check every generated name and attach its availability map"""
+    for entry in result['names']:
+        entry['domains'] = lookup_domains(name_domains(entry['name'], tlds))
+    result['tlds'] = list(tlds)
+    return result
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""
+ASGI serving mode for the generation API.
+
+Serves /generate, /check-domain, /features, /metrics and /health with the same request
+format and responses as the Flask app, but as coroutines: OpenAI calls go
+through an aiohttp connection pool without holding a thread, while NLTK and the
+other CPU-bound work runs on a small thread pool (ASGI_CPU_THREADS).  One
+process can therefore keep hundreds of requests in flight while they wait on
+the model API.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8000 --workers 2
+
+The Flask app (app.py) remains the default and still serves the UI, batch,
+favourites and stats endpoints.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import app as flask_app
+import metrics
+from singleflight import AsyncFileSingleFlight, AsyncSingleFlight
+from app import (add_domain_availability, analyze_input, bulk_domain_availability, cursor_rng, domain_availability,
+                 encode_cacheable, feature_flags, generate_result, generator, metric_tone, mixed_result,
+                 parse_business_names, parse_count, parse_domain_options, parse_expansion,
+                 parse_generation_options, parse_page_cursor, parse_seed, parse_tlds, request_rng, response_cache,
+                 rule_based_page, split_ai_count, wants_timing_header,
+                 COALESCE_DIR, COALESCE_REQUESTS, COALESCE_WAIT, RESPONSE_CACHE_TTL)
+
+logger = logging.getLogger(__name__)
+
+ASGI_CPU_THREADS = int(os.getenv('ASGI_CPU_THREADS', 4))
+ASGI_MAX_BODY = int(os.getenv('ASGI_MAX_BODY', 1024 * 1024))
+
+cpu_executor = ThreadPoolExecutor(max_workers=ASGI_CPU_THREADS, thread_name_prefix='asgi-cpu')
+
+# Identical /generate requests in flight share one result (see app.COALESCE_*)
+request_flight = None
+if COALESCE_REQUESTS:
+    request_flight = AsyncFileSingleFlight(COALESCE_DIR, COALESCE_WAIT) if COALESCE_DIR else AsyncSingleFlight()
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """The parts of an ASGI HTTP request the handlers need"""
+
+    def __init__(self, scope: Dict, body: bytes):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', [])}
+        self.query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        self.body = body
+
+    def payload(self):
+        """JSON body for POST requests, query parameters for GET (as in app.request_payload)"""
+        if self.method == 'GET':
+            data = dict(self.query)
+            for flag in ('use_ai', 'check_domains', 'available_only'):
+                if flag in data:
+                    data[flag] = data[flag].lower() in ('1', 'true', 'yes')
+            return data
+        try:
+            return json.loads(self.body or b'null')
+        except ValueError:
+            raise HTTPError(400, 'Invalid JSON body')
+
+
+Response = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+def json_response(payload, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    return raw_response(flask_app.app.json.dumps(payload).encode() + b'\n', status, headers)
+
+
+def raw_response(body: bytes, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    header_list = [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    header_list.extend((name.lower().encode('latin-1'), value.encode('latin-1'))
+                       for name, value in (headers or {}).items())
+    return status, header_list, body
+
+
+async def run_cpu(func, *args, **kwargs):
+    """Run blocking, CPU-bound work (NLTK, rule-based generation) off the event loop"""
+    # Carry the request's context (its metrics.StageTimer) into the worker thread
+    call = partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(cpu_executor, call)
+
+
+# --- routes --------------------------------------------------------------------
+
+async def generate_ai_result(input_text: str, tone: str, count: int, rng, tlds, expansion: str) -> Dict:
+    """generate_result's AI path with the OpenAI calls awaited"""
+    ai_generator = flask_app.ai_generator
+    keywords, industry = await run_cpu(analyze_input, input_text, expansion)
+    ai_count, rule_count = split_ai_count(count)
+
+    ai_names = await ai_generator.agenerate_creative_names(keywords, tone, ai_count)
+    rule_names, cursor = await run_cpu(rule_based_page, keywords, industry, tone, rule_count, rng)
+
+    ai_taglines = None
+    if ai_generator.openai_api_key:
+        ai_taglines = await ai_generator.agenerate_ai_taglines(
+            ai_names, industry, fallback=generator.generate_taglines(ai_names, industry, rng)
+        )
+    result = mixed_result(keywords, industry, count, rng, ai_names, rule_names, ai_taglines, cursor)
+    if tlds:
+        add_domain_availability(result, tlds)
+    return result
+
+
+async def generate(request: Request) -> Response:
+    data = request.payload()
+    try:
+        cursor = parse_page_cursor(data)
+        if cursor is None:
+            input_text, tone, count = parse_generation_options(data)
+            expansion = parse_expansion(data)
+        else:
+            input_text, tone, count = None, cursor['tone'], parse_count(data)
+            expansion = None
+        seed = parse_seed(data)
+        tlds, available_only = parse_domain_options(data)
+        if available_only and cursor is not None:
+            raise ValueError('available_only results have no next page')
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+    use_ai = bool(data.get('use_ai', False) and flask_app.AI_AVAILABLE and flask_app.ai_generator
+                  and not available_only and cursor is None)
+    rng = request_rng(seed) if cursor is None else cursor_rng(cursor)
+
+    if cursor is None:
+        key = (generator.normalize_text(input_text), tone, count, seed, use_ai, tlds, available_only,
+               expansion, generator.content_version())
+    else:
+        key = ('cursor', data['cursor'], count, tlds, generator.content_version())
+
+    async def generate_once():
+        if use_ai:
+            return await generate_ai_result(input_text, tone, count, rng, tlds, expansion)
+        return await run_cpu(generate_result, input_text, tone, count, False, rng, tlds, available_only, expansion,
+                             cursor)
+
+    async def build():
+        """generate_once(), or the result of an identical request already generating"""
+        if request_flight is None:
+            return await generate_once()
+        result, scope = await request_flight.do(key, generate_once)
+        if scope is not None:
+            metrics.COALESCED_REQUESTS.inc((scope,))
+            metrics.set_labels(method='coalesced')
+        return result
+
+    try:
+        with metrics.request_timer(tone=metric_tone(tone), method='cached') as timer:
+            if (seed is None and cursor is None) or use_ai:
+                result, entry = await build(), None
+            else:
+                # Seeded rule-based responses and next pages are reproducible: cache them and
+                # answer conditional GETs
+                entry = response_cache.get(key)
+                if entry is None:
+                    entry = encode_cacheable(await build())
+                    response_cache.set(key, entry)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+
+    timing = {'X-Timing': timer.header_value()} if wants_timing_header(request.headers.get('x-timing')) else {}
+    if entry is None:
+        return json_response(result, headers={'Cache-Control': 'no-store', **timing})
+
+    body, etag = entry
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': f'public, max-age={int(RESPONSE_CACHE_TTL)}', **timing}
+    if request.method == 'GET' and etag_matches(request.headers.get('if-none-match'), etag):
+        return 304, [(name.lower().encode(), value.encode()) for name, value in headers.items()], b''
+    return raw_response(body, headers=headers)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in candidates or f'"{etag}"' in candidates
+
+
+async def check_domain(request: Request) -> Response:
+    data = request.payload()
+    if not isinstance(data, dict):
+        return json_response({'error': 'Expected a JSON object'}, 400)
+    try:
+        tlds = parse_tlds(data.get('tlds'))
+        business_names = parse_business_names(data)
+    except ValueError as e:
+        return json_response({'error': str(e)}, 400)
+
+    if business_names is None:
+        return json_response(domain_availability(data['business_name'], tlds))
+    return json_response(await run_cpu(bulk_domain_availability, business_names, tlds))
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    body = metrics.render().encode()
+    return 200, [(b'content-type', metrics.PROMETHEUS_CONTENT_TYPE.encode()),
+                 (b'content-length', str(len(body)).encode())], body
+
+
+async def features(request: Request) -> Response:
+    return json_response(feature_flags())
+
+
+async def health(request: Request) -> Response:
+    return json_response({'status': 'healthy', 'message': 'Business Name Generator API is running!'})
+
+
+ROUTES = {
+    '/generate': (('GET', 'POST'), generate),
+    '/check-domain': (('POST',), check_domain),
+    '/features': (('GET',), features),
+    '/metrics': (('GET',), metrics_endpoint),
+    '/health': (('GET',), health),
+}
+
+
+# --- ASGI plumbing -------------------------------------------------------------
+
+async def read_body(receive) -> bytes:
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise HTTPError(400, 'Client disconnected')
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > ASGI_MAX_BODY:
+            raise HTTPError(413, 'Request body too large')
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            return b''.join(chunks)
+
+
+async def handle_http(scope, receive, send):
+    try:
+        route = ROUTES.get(scope['path'])
+        if route is None:
+            raise HTTPError(404, 'Not found')
+        methods, handler = route
+        if scope['method'] == 'OPTIONS':
+            response = raw_response(b'', 204, {'Allow': ', '.join(methods)})
+        elif scope['method'] not in methods:
+            raise HTTPError(405, 'Method not allowed')
+        else:
+            request = Request(scope, await read_body(receive))
+            response = await handler(request)
+    except HTTPError as e:
+        response = json_response({'error': str(e)}, e.status)
+    except Exception as e:
+        logger.exception("Unhandled error in ASGI handler")
+        response = json_response({'error': str(e)}, 500)
+
+    status, headers, body = response
+    # Same permissive CORS policy as flask_cors in app.py
+    headers.append((b'access-control-allow-origin', b'*'))
+    if scope['method'] == 'OPTIONS':
+        headers.append((b'access-control-allow-headers', b'Content-Type'))
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                await run_cpu(flask_app.warmup)
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if flask_app.ai_generator is not None:
+                await flask_app.ai_generator.aclose()
+            cpu_executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'http':
+        await handle_http(scope, receive, send)
+    elif scope['type'] == 'lifespan':
+        await lifespan(receive, send)
@@ -0,0 +1,148 @@
+"""
+Load test: gunicorn sync workers (app.py) vs the ASGI server (asgi.py) on the
+AI path, with OpenAI replaced by the local fake server.
+
+    python -m benchmarks.bench_asgi
+    python -m benchmarks.bench_asgi --concurrency 200 --duration 20 --latency 0.5
+
+Every request is POST /generate with use_ai=true, so each one waits on one
+names completion plus a tagline completion per AI name.  The sync server can
+only have as many requests in flight as it has workers; the ASGI server keeps
+them all in flight on one event loop.  Needs gunicorn, uvicorn and aiohttp.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAYLOAD = {'input_text': 'organic coffee roastery with fresh pastries', 'tone': 'professional',
+           'count': 10, 'use_ai': True}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start(command, env) -> subprocess.Popen:
+    return subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_until_up(url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 3)
+
+
+async def load(base_url: str, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    deadline = time.monotonic() + duration
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=120)
+
+    async with aiohttp.ClientSession(base_url, connector=connector, timeout=timeout) as session:
+        async def user():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                try:
+                    async with session.post('/generate', json=PAYLOAD) as response:
+                        ok = response.status == 200 and (await response.json()).get('names')
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    ok = False
+                if ok:
+                    latencies.append(time.monotonic() - started)
+                else:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_second': round(len(latencies) / elapsed, 2),
+        'latency_p50': percentile(latencies, 0.5),
+        'latency_p95': percentile(latencies, 0.95),
+    }
+
+
+def run_server(label, command, port, env, args):
+    process = start(command, env)
+    try:
+        base_url = f'http://127.0.0.1:{port}'
+        wait_until_up(base_url + '/health')
+        asyncio.run(load(base_url, min(args.concurrency, 10), 2))  # warm caches and connections
+        result = asyncio.run(load(base_url, args.concurrency, args.duration))
+        return {'server': label, **result}
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=100, help="simultaneous clients")
+    parser.add_argument('--duration', type=float, default=15, help="seconds per server")
+    parser.add_argument('--latency', type=float, default=0.5, help="fake OpenAI response time")
+    parser.add_argument('--sync-workers', type=int, default=4, help="gunicorn sync workers")
+    parser.add_argument('--async-workers', type=int, default=1, help="uvicorn worker processes")
+    args = parser.parse_args()
+
+    fake_port = free_port()
+    fake = start([sys.executable, '-m', 'benchmarks.fake_openai', '--port', str(fake_port),
+                  '--latency', str(args.latency)], os.environ.copy())
+
+    env = dict(os.environ, AI_ENABLED='true', OPENAI_API_KEY='test',
+               OPENAI_BASE_URL=f'http://127.0.0.1:{fake_port}/v1',
+               # keep GPT-2 out of the measurement: no download, so it is skipped after one attempt
+               HF_HUB_OFFLINE='1', TRANSFORMERS_OFFLINE='1', HF_INFERENCE_POOL='false')
+
+    try:
+        sync_port = free_port()
+        async_port = free_port()
+        results = [
+            run_server('gunicorn sync', [sys.executable, '-m', 'gunicorn', 'app:app', '--workers',
+                                         str(args.sync_workers), '--bind', f'127.0.0.1:{sync_port}',
+                                         '--timeout', '120'], sync_port, env, args),
+            run_server('uvicorn asgi', [sys.executable, '-m', 'uvicorn', 'asgi:app', '--workers',
+                                        str(args.async_workers), '--port', str(async_port),
+                                        '--log-level', 'warning'], async_port, env, args),
+        ]
+    finally:
+        fake.terminate()
+
+    for result in results:
+        print(f"{result['server']:>14}: {result['requests_per_second']:8.2f} req/s  "
+              f"p50 {result['latency_p50']}s  p95 {result['latency_p95']}s  "
+              f"({result['requests']} ok, {result['errors']} errors)")
+    print(json.dumps({'concurrency': args.concurrency, 'duration': args.duration,
+                      'openai_latency': args.latency, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Rule-based name generation: the candidate engine vs the old random-template loop.
+
+    python -m benchmarks.bench_candidates
+    python -m benchmarks.bench_candidates --count 50 --rounds 500
+
+Reports time per call and how often each implementation returned fewer than
+the requested number of names.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from name_generator import BusinessNameGenerator
+
+KEYWORDS = [
+    ['coffee', 'roastery', 'organic', 'bean', 'brew'],
+    ['pet', 'grooming'],
+    ['cloud'],
+    ['skincare', 'natural', 'glow', 'radiance', 'botanical'],
+]
+
+
+def legacy_rule_based_names(available_prefixes, available_suffixes, keywords, count):
+    """generate_rule_based_names as it was before the candidate engine"""
+    names = []
+    main_keywords = keywords[:5]
+    for _ in range(count):
+        name_type = random.choice(['prefix_keyword', 'keyword_suffix', 'compound', 'modified'])
+        if name_type == 'prefix_keyword':
+            name = f"{random.choice(available_prefixes).title()}{random.choice(main_keywords).title()}"
+        elif name_type == 'keyword_suffix':
+            name = f"{random.choice(main_keywords).title()}{random.choice(available_suffixes).title()}"
+        elif name_type == 'compound':
+            if len(main_keywords) >= 2:
+                k1, k2 = random.sample(main_keywords, 2)
+                connector = random.choice(['', ' & ', ' + ', ''])
+                name = f"{k1.title()}{connector}{k2.title()}"
+            else:
+                name = f"{random.choice(main_keywords).title()}{random.choice(available_suffixes)}"
+        else:
+            keyword = random.choice(main_keywords)
+            if random.choice([True, False]):
+                name = keyword.title() + random.choice(['ify', 'ly', 'wise', 'hub', 'lab'])
+            else:
+                name = random.choice(['The ', '']) + keyword.title() + random.choice([' Co', ' Lab', ' Works'])
+        if name not in names and len(name) <= 25:
+            names.append(name)
+    return names[:count]
+
+
+def run(label, generate, count, rounds):
+    short = 0
+    produced = 0
+    started = time.perf_counter()
+    for i in range(rounds):
+        keywords = KEYWORDS[i % len(KEYWORDS)]
+        names = generate(keywords, count)
+        produced += len(names)
+        short += len(names) < count
+    elapsed = time.perf_counter() - started
+    return {
+        'implementation': label,
+        'us_per_call': round(elapsed / rounds * 1e6, 1),
+        'names_per_call': round(produced / rounds, 2),
+        'short_calls': short,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--tone', default='professional')
+    args = parser.parse_args()
+
+    generator = BusinessNameGenerator()
+    random.seed(0)
+
+    def legacy(keywords, count):
+        parts = generator.get_name_parts(args.tone, generator._detect_industry(keywords))
+        return legacy_rule_based_names(parts.prefixes, parts.suffixes, keywords, count)
+
+    def engine(keywords, count):
+        return generator.generate_rule_based_names(keywords, args.tone, count, seed=random.getrandbits(32))
+
+    results = [run('legacy', legacy, args.count, args.rounds), run('engine', engine, args.count, args.rounds)]
+    for result in results:
+        print(f"{result['implementation']:>8}: {result['us_per_call']:8.1f} us/call  "
+              f"{result['names_per_call']:6.2f} names/call  {result['short_calls']} of {args.rounds} calls short")
+    print(json.dumps({'count': args.count, 'rounds': args.rounds, 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
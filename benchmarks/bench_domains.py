@@ -0,0 +1,68 @@
+"""
+Domain index: build time, file size and lookup cost on a synthetic zone.
+
+    python -m benchmarks.bench_domains
+    python -m benchmarks.bench_domains --domains 5000000 --lookups 200000
+
+Builds an index of random registered .com/.net/.io names in a temporary
+directory, then checks a mix of registered and unregistered domains (most
+candidate names are unregistered, so the Bloom filter answers them).
+"""
+
+import argparse
+import json
+import os
+import random
+import string
+import tempfile
+import time
+
+from domain_index import DomainIndex, write_index
+
+TLDS = ['com', 'net', 'io']
+
+
+def random_domain(rng: random.Random) -> str:
+    label = ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 14)))
+    return f"{label}.{rng.choice(TLDS)}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--domains', type=int, default=1_000_000)
+    parser.add_argument('--lookups', type=int, default=100_000)
+    parser.add_argument('--registered-share', type=float, default=0.1,
+                        help="fraction of looked-up domains that are registered")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    registered = [random_domain(rng) for _ in range(args.domains)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'domains.idx')
+        started = time.perf_counter()
+        size = write_index(registered, path)
+        build_seconds = time.perf_counter() - started
+
+        index = DomainIndex(path)
+        queries = [rng.choice(registered) if rng.random() < args.registered_share else random_domain(rng)
+                   for _ in range(args.lookups)]
+        started = time.perf_counter()
+        found = sum(index.is_registered(domain) for domain in queries)
+        lookup_seconds = time.perf_counter() - started
+        index.close()
+
+    result = {
+        'domains': len(set(registered)),
+        'index_mib': round(size / 2 ** 20, 1),
+        'build_seconds': round(build_seconds, 2),
+        'us_per_lookup': round(lookup_seconds / args.lookups * 1e6, 2),
+        'registered_found': found,
+    }
+    print(f"{result['domains']} domains -> {result['index_mib']} MiB in {result['build_seconds']}s; "
+          f"{result['us_per_lookup']} us/lookup")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Keyword expansion backends compared: WordNet synonyms vs word-vector neighbours.
+
+    python -m benchmarks.bench_expansion
+    python -m benchmarks.bench_expansion --index data/embeddings.idx
+    python -m benchmarks.bench_expansion --vectors glove.6B.300d.txt --max-words 100000
+
+Without an index or vector file, builds one from synthetic clustered vectors
+(``--synthetic-words`` words of ``--dimensions`` components, including every
+word of the benchmark corpus) in a temporary directory.  Each backend then
+runs in a fresh process that extracts keywords for the benchmark descriptions,
+bypassing the keyword cache, and reports:
+
+* the first pass, which includes loading WordNet or paging in the index;
+* the steady state per description, with the per-word neighbour memo cleared
+  every round, and with it kept (repeated keywords);
+* resident memory added by the backend, split into anonymous memory (heap,
+  paid by every worker) and file pages (the mapped index, shared by every
+  worker through the page cache).
+
+It also reports recall@k of the approximate search against an exact scan.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.corpus import DESCRIPTIONS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKENDS = ('none', 'wordnet', 'embedding')
+
+
+def memory():
+    """(resident, anonymous, file-backed) MiB of this process, from /proc"""
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                fields[name] = int(value.split()[0]) / 1024
+    return fields['Rss'], fields['Anonymous'], fields['Rss'] - fields['Anonymous']
+
+
+def write_synthetic_vectors(path: str, words: int, dimensions: int, seed: int = 0):
+    """Clustered random vectors: words of one topic share a direction plus noise"""
+    rng = np.random.default_rng(seed)
+    vocabulary = list(dict.fromkeys(word.lower() for text in DESCRIPTIONS for word in text.split()
+                                    if word.isalpha()))
+    letters = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+    while len(vocabulary) < words:
+        vocabulary.append(''.join(rng.choice(letters, rng.integers(4, 11))))
+    vocabulary = list(dict.fromkeys(vocabulary))[:words]
+
+    topics = rng.standard_normal((max(1, words // 50), dimensions)).astype(np.float32)
+    with open(path, 'w') as f:
+        for word in vocabulary:
+            vector = topics[rng.integers(len(topics))] + 0.6 * rng.standard_normal(dimensions)
+            f.write(word + ' ' + ' '.join(f'{x:.4f}' for x in vector) + '\n')
+
+
+def measure(backend: str, rounds: int):
+    """Runs in a fresh process; prints this backend's numbers as JSON"""
+    from app import generator
+
+    texts = [text.lower() for text in DESCRIPTIONS]
+    generator.keyword_tokens('warm up')  # stopwords, tokenizer and lemma table
+    np.ones((2, 2), dtype=np.float16).astype(np.float32) @ np.ones(2, dtype=np.float32)  # map BLAS code
+    rss_before, anonymous_before, file_before = memory()
+
+    started = time.perf_counter()
+    keywords = [generator._extract_keywords(text, backend) for text in texts]
+    first_pass = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        if generator.embedding_index is not None:
+            generator.embedding_index.neighbors.cache_clear()
+        for text in texts:
+            generator._extract_keywords(text, backend)
+    per_text = (time.perf_counter() - started) / (rounds * len(texts))
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            generator._extract_keywords(text, backend)
+    memoized_per_text = (time.perf_counter() - started) / (rounds * len(texts))
+
+    rss, anonymous, file = memory()
+    print(json.dumps({
+        'first_pass_ms': first_pass * 1e3,
+        'us_per_text': per_text * 1e6,
+        'memoized_us_per_text': memoized_per_text * 1e6,
+        'rss_mb': rss - rss_before,
+        'anonymous_mb': anonymous - anonymous_before,
+        'file_mb': file - file_before,
+        'keywords_per_text': sum(len(k) for k in keywords) / len(keywords),
+        'example': sorted(keywords[4]),
+    }))
+
+
+def recall(index, words, k: int):
+    """Share of the exact top-k neighbours the approximate search returns"""
+    matrix = np.asarray(index.vectors, dtype=np.float32)
+    found = total = 0
+    for word in words:
+        row = index.row(word)
+        query = matrix[row]
+        exact = np.argsort(-(matrix @ query), kind='stable')[:k + 1]
+        approximate, _ = index.search(query, k + 1)
+        exact, approximate = set(exact.tolist()) - {row}, set(approximate.tolist()) - {row}
+        found += len(exact & approximate)
+        total += len(exact)
+    return found / max(total, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--index', help="existing embedding index")
+    parser.add_argument('--vectors', help="GloVe/word2vec text file to build an index from")
+    parser.add_argument('--max-words', type=int, default=100000)
+    parser.add_argument('--synthetic-words', type=int, default=50000)
+    parser.add_argument('--dimensions', type=int, default=300)
+    parser.add_argument('--nprobe', type=int, default=4)
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--measure', choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.rounds)
+        return
+
+    import embedding_index
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.index
+        if path is None:
+            vectors = args.vectors
+            if vectors is None:
+                vectors = os.path.join(directory, 'vectors.txt')
+                write_synthetic_vectors(vectors, args.synthetic_words, args.dimensions)
+            path = os.path.join(directory, 'embeddings.idx')
+            started = time.perf_counter()
+            words, matrix = embedding_index.read_vectors(vectors, args.max_words)
+            size = embedding_index.write_index(words, matrix, path)
+            print(f"built {path}: {len(words)} words, {size / 1024 / 1024:.1f} MiB, "
+                  f"{time.perf_counter() - started:.1f}s")
+
+        index = embedding_index.EmbeddingIndex(path, args.nprobe)
+        sample = [index.word(row) for row in range(0, len(index), max(1, len(index) // 500))]
+        print(f"recall@3 with nprobe={args.nprobe} over {len(sample)} words: {recall(index, sample, 3):.3f}")
+        index.close()
+
+        env = dict(os.environ, EMBEDDING_INDEX_PATH=path, EMBEDDING_NPROBE=str(args.nprobe))
+        print(f"{'backend':<10} {'first pass ms':>14} {'us/text':>9} {'memoized':>9} {'RSS MiB':>8} "
+              f"{'anon':>6} {'file':>6} {'keywords':>9}")
+        for backend in BACKENDS:
+            output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_expansion', '--measure', backend,
+                                     '--rounds', str(args.rounds)],
+                                    cwd=ROOT, env=env, check=True, capture_output=True, text=True).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{backend:<10} {result['first_pass_ms']:>14.1f} {result['us_per_text']:>9.1f} "
+                  f"{result['memoized_us_per_text']:>9.1f} "
+                  f"{result['rss_mb']:>8.1f} {result['anonymous_mb']:>6.1f} {result['file_mb']:>6.1f} "
+                  f"{result['keywords_per_text']:>9.1f}")
+            print(f"{'':<10} e.g. {', '.join(result['example'])}")
+
+
+if __name__ == '__main__':
+    main()
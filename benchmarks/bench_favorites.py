@@ -0,0 +1,97 @@
+"""
+Favorites store at scale: write throughput with batching and read latency on a
+large table.
+
+    python -m benchmarks.bench_favorites
+    python -m benchmarks.bench_favorites --rows 5000000 --users 200000
+
+Fills a temporary database with --rows favorites (through the store's insert
+path, so the popularity triggers run), then measures concurrent single-save
+throughput (the writer thread groups them into batches), first and deep
+listing pages for a heavy user, popular names and popularity lookups.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from favorites_store import FavoritesStore
+
+WORDS = ['Nova', 'Bright', 'Harbor', 'Maple', 'Summit', 'Echo', 'Lumen', 'Vista', 'Kindred', 'Atlas',
+         'Glow', 'Brew', 'Paw', 'Cloud', 'Pure', 'Crisp', 'Golden', 'Swift', 'Leaf', 'Stone']
+
+
+def random_name(rng: random.Random) -> str:
+    return f"{rng.choice(WORDS)}{rng.choice(WORDS)}{rng.choice(['', ' Co', ' Labs', ' Studio', 'ify'])}"
+
+
+def median_us(func, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=50_000)
+    parser.add_argument('--writers', type=int, default=32, help="threads saving one favorite per call")
+    parser.add_argument('--saves', type=int, default=200, help="saves per writer thread")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        store = FavoritesStore(os.path.join(directory, 'favorites.db'))
+        heavy_user = 'user-0'
+
+        started = time.perf_counter()
+        written = 0
+        while written < args.rows:
+            user = heavy_user if written < 20_000 else f'user-{rng.randrange(args.users)}'
+            batch = [(random_name(rng) + str(rng.randrange(1000)), None) for _ in range(200)]
+            written += store.add(user, batch)
+        fill_seconds = time.perf_counter() - started
+
+        def writer(index):
+            for i in range(args.saves):
+                store.add(f'writer-{index}', [(f'Saved {i}', 'tagline')])
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        write_seconds = time.perf_counter() - started
+
+        _, cursor = store.page(heavy_user, 50)
+        deep_cursor = None
+        for _ in range(200):  # walk 10,000 rows down
+            _, deep_cursor = store.page(heavy_user, 50, deep_cursor)
+        lookup_names = [random_name(rng) for _ in range(100)]
+
+        result = {
+            'rows': written,
+            'fill_rows_per_second': round(written / fill_seconds),
+            'concurrent_saves_per_second': round(args.writers * args.saves / write_seconds),
+            'first_page_us': median_us(lambda: store.page(heavy_user, 50), 200),
+            'deep_page_us': median_us(lambda: store.page(heavy_user, 50, deep_cursor), 200),
+            'popular_us': median_us(lambda: store.popular(20), 200),
+            'popularity_100_names_us': median_us(lambda: store.popularity(lookup_names), 100),
+        }
+
+    for key, value in result.items():
+        print(f"{key:>28}: {value}")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
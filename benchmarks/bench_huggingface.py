@@ -0,0 +1,129 @@
+"""
+Names per second on CPU: batched GPT-2 sampling vs the one-prompt-per-call loop.
+
+    python -m benchmarks.bench_huggingface                # pretrained gpt2 (downloads once)
+    python -m benchmarks.bench_huggingface --model PATH   # local model directory
+    python -m benchmarks.bench_huggingface --tiny         # random 2-layer model, no download
+
+The tiny model produces gibberish, so few candidates survive
+clean_generated_name; compare "samples/s" there and "names/s" with real GPT-2.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+import torch
+from transformers import GPT2Config, GPT2LMHeadModel, GPT2Tokenizer
+
+import ai_generator
+from ai_generator import AINameGenerator
+
+KEYWORDS = [
+    ['coffee', 'roastery', 'organic'],
+    ['pet', 'grooming', 'care'],
+    ['cloud', 'data', 'security'],
+    ['skincare', 'natural', 'glow'],
+]
+
+
+def tiny_model():
+    """A randomly initialised byte-level GPT-2 small enough to build offline"""
+    from transformers.models.gpt2.tokenization_gpt2 import bytes_to_unicode
+
+    vocab = {char: i for i, char in enumerate(bytes_to_unicode().values())}
+    vocab['<|endoftext|>'] = len(vocab)
+    directory = tempfile.mkdtemp(prefix='tiny-gpt2-')
+    with open(os.path.join(directory, 'vocab.json'), 'w') as f:
+        json.dump(vocab, f)
+    with open(os.path.join(directory, 'merges.txt'), 'w') as f:
+        f.write('#version: 0.2\n')
+
+    tokenizer = GPT2Tokenizer(os.path.join(directory, 'vocab.json'), os.path.join(directory, 'merges.txt'))
+    config = GPT2Config(vocab_size=len(vocab), n_positions=128, n_embd=64, n_layer=2, n_head=2,
+                        bos_token_id=len(vocab) - 1, eos_token_id=len(vocab) - 1)
+    return tokenizer, GPT2LMHeadModel(config)
+
+
+def load_generator(args) -> AINameGenerator:
+    generator = AINameGenerator(use_inference_pool=False)
+    generator._hf_load_attempted = True
+    if args.tiny:
+        generator.hf_tokenizer, generator.hf_model = tiny_model()
+    else:
+        generator.hf_tokenizer = GPT2Tokenizer.from_pretrained(args.model)
+        generator.hf_model = GPT2LMHeadModel.from_pretrained(args.model)
+    generator.hf_model.eval()
+    generator.hf_tokenizer.pad_token = generator.hf_tokenizer.eos_token
+    generator.hf_tokenizer.padding_side = 'left'
+    return generator
+
+
+def count_generate_calls(generator):
+    """Wrap hf_model.generate to count calls and sampled sequences"""
+    stats = {'calls': 0, 'samples': 0}
+    original = generator.hf_model.generate
+
+    def generate(*args, **kwargs):
+        outputs = original(*args, **kwargs)
+        stats['calls'] += 1
+        stats['samples'] += outputs.shape[0]
+        return outputs
+
+    generator.hf_model.generate = generate
+    return stats
+
+
+def run(generator, batched: bool, count: int, rounds: int):
+    stats = count_generate_calls(generator)
+    produced = 0
+    started = time.perf_counter()
+    for i in range(rounds):
+        produced += len(generator.generate_huggingface_names(KEYWORDS[i % len(KEYWORDS)], 'professional',
+                                                             count, batched=batched))
+    elapsed = time.perf_counter() - started
+    del generator.hf_model.generate
+    return {
+        'mode': 'batched' if batched else 'sequential',
+        'seconds': round(elapsed, 3),
+        'names': produced,
+        'names_per_second': round(produced / elapsed, 2),
+        'generate_calls': stats['calls'],
+        'samples_per_second': round(stats['samples'] / elapsed, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default='gpt2', help="model name or local directory")
+    parser.add_argument('--tiny', action='store_true', help="use a random tiny model (no download)")
+    parser.add_argument('--count', type=int, default=10, help="names requested per call")
+    parser.add_argument('--rounds', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=ai_generator.HF_BATCH_SIZE)
+    parser.add_argument('--threads', type=int, default=None, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    ai_generator.HF_BATCH_SIZE = args.batch_size
+    generator = load_generator(args)
+
+    results = []
+    for batched in (False, True):
+        random.seed(0)
+        torch.manual_seed(0)
+        results.append(run(generator, batched, args.count, args.rounds))
+
+    for result in results:
+        print(f"{result['mode']:>10}: {result['names_per_second']:8.2f} names/s  "
+              f"{result['samples_per_second']:8.2f} samples/s  "
+              f"{result['generate_calls']:4d} generate() calls  ({result['names']} names in {result['seconds']}s)")
+    print(json.dumps({'batch_size': args.batch_size, 'torch_threads': torch.get_num_threads(),
+                      'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Micro-benchmarks for industry detection and name categorisation: the
+precompiled Aho-Corasick matchers vs the nested substring scans they replaced.
+
+    python -m benchmarks.bench_matching
+    python -m benchmarks.bench_matching --number 20000
+
+Before timing, both implementations are run over a randomised corpus and the
+script exits non-zero if any result differs.
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import timeit
+from collections import defaultdict
+
+from name_generator import BusinessNameGenerator
+from pattern_matcher import PatternMatcher, reference_matches
+
+
+def legacy_detect_industry(industry_keywords, keywords):
+    """detect_industry as it was before the matcher"""
+    industry_scores = defaultdict(int)
+    for keyword in keywords:
+        for industry, terms in industry_keywords.items():
+            if any(term in keyword.lower() for term in terms):
+                industry_scores[industry] += 1
+    if industry_scores:
+        return max(industry_scores, key=industry_scores.get)
+    return 'general'
+
+
+def legacy_categorize_names(category_keywords, names):
+    """categorize_names as it was before the matcher"""
+    categories = {'Tech & Innovation': [], 'Professional': [], 'Creative': [], 'Elegant': []}
+    tech_keywords, professional_keywords, elegant_keywords = category_keywords.values()
+    for name in names:
+        name_lower = name.lower()
+        if any(keyword in name_lower for keyword in tech_keywords):
+            categories['Tech & Innovation'].append(name)
+        elif any(keyword in name_lower for keyword in professional_keywords):
+            categories['Professional'].append(name)
+        elif any(keyword in name_lower for keyword in elegant_keywords):
+            categories['Elegant'].append(name)
+        else:
+            categories['Creative'].append(name)
+    return {k: v for k, v in categories.items() if v}
+
+
+def corpus(generator, size, rng):
+    """Random words mixing real terms, overlapping fragments and noise"""
+    terms = [term for group in (generator.industry_keywords, generator.category_keywords)
+             for terms in group.values() for term in terms]
+    words = []
+    for _ in range(size):
+        parts = []
+        for _ in range(rng.randint(1, 3)):
+            choice = rng.random()
+            if choice < 0.4:
+                term = rng.choice(terms)
+                parts.append(term[rng.randint(0, len(term) - 1):] if rng.random() < 0.3 else term)
+            else:
+                parts.append(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 8))))
+        word = ''.join(parts)
+        words.append(word.title() if rng.random() < 0.5 else word)
+    return words
+
+
+def check_parity(generator, words, rng):
+    mismatches = 0
+    for patterns, matcher in ((generator.industry_keywords, generator.industry_matcher),
+                              (generator.category_keywords, generator.category_matcher)):
+        for word in words:
+            if matcher.matches(word.lower()) != reference_matches(patterns, word.lower()):
+                mismatches += 1
+    for _ in range(len(words) // 4):
+        sample = rng.sample(words, rng.randint(1, 10))
+        if generator._detect_industry(sample) != legacy_detect_industry(generator.industry_keywords, sample):
+            mismatches += 1
+        if generator.categorize_names(sample) != legacy_categorize_names(generator.category_keywords, sample):
+            mismatches += 1
+    return mismatches
+
+
+def bench(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    return {'case': label, 'us_per_call': round(seconds / number * 1e6, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=5000, help="calls per timing run")
+    parser.add_argument('--corpus', type=int, default=4000, help="random words for the parity check")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    generator = BusinessNameGenerator()
+    words = corpus(generator, args.corpus, rng)
+
+    mismatches = check_parity(generator, words, rng)
+    print(f"parity: {mismatches} mismatches over {len(words)} words")
+
+    keywords = ['coffee', 'roastery', 'organic', 'sustainable', 'care']
+    names = ['TechFlow Labs', 'Golden Bean Studio', 'Prime Consulting Group', 'Brewly', 'The Roast Co',
+             'CloudNest', 'Organic & Roastery', 'EliteBrew', 'Bean Sphere', 'CoffeeWorks']
+    build_patterns = dict(generator.industry_keywords)
+
+    results = [
+        bench('detect_industry legacy', lambda: legacy_detect_industry(generator.industry_keywords, keywords),
+              args.number),
+        bench('detect_industry matcher', lambda: generator._detect_industry(keywords), args.number),
+        bench('categorize_names legacy', lambda: legacy_categorize_names(generator.category_keywords, names),
+              args.number),
+        bench('categorize_names matcher', lambda: generator.categorize_names(names), args.number),
+        bench('build industry matcher', lambda: PatternMatcher(build_patterns), max(args.number // 10, 1)),
+    ]
+    for result in results:
+        print(f"{result['case']:>26}: {result['us_per_call']:9.3f} us/call")
+    print(json.dumps({'mismatches': mismatches, 'results': results}, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
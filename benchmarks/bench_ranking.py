@@ -0,0 +1,82 @@
+"""
+Cost of ranking rule-based names with favorites-derived weights.
+
+    python -m benchmarks.bench_ranking
+    python -m benchmarks.bench_ranking --count 50 --rounds 2000
+
+Builds weights from synthetic favorites that prefer a few prefixes and
+suffixes, then times generate_rule_based_names with and without them.  The
+difference is what ranking adds per request: the extra candidates plus
+scoring them.
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from name_generator import BusinessNameGenerator
+from ranking import build_weights, load_ranking_weights, write_weights
+from reloadable import ReloadableFile
+
+KEYWORDS = [
+    ['coffee', 'roastery', 'organic', 'bean', 'brew'],
+    ['pet', 'grooming'],
+    ['cloud'],
+    ['skincare', 'natural', 'glow', 'radiance', 'botanical'],
+]
+TONE = 'playful'
+
+
+def time_per_call(generator, count, rounds):
+    started = time.perf_counter()
+    for i in range(rounds):
+        generator.generate_rule_based_names(KEYWORDS[i % len(KEYWORDS)], TONE, count, 'general', seed=i)
+    return (time.perf_counter() - started) / rounds
+
+
+def synthetic_favorites(generator, rng):
+    """Names from every keyword set, saved more often when they use a 'popular' part"""
+    parts = generator.get_name_parts(TONE, 'general')
+    popular = {parts.titled_prefixes[0], parts.titled_suffixes[0], ' Co'}
+    for keywords in KEYWORDS:
+        for name in generator.generate_rule_based_names(keywords, TONE, 500, 'general', seed=rng.randrange(2 ** 32)):
+            liked = any(part in name for part in popular)
+            if rng.random() < (0.5 if liked else 0.05):
+                yield name, TONE, 'general'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=5000)
+    args = parser.parse_args()
+
+    generator = BusinessNameGenerator()
+    generator.ranking_weights = None
+    plain = time_per_call(generator, args.count, args.rounds)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'ranking_weights.json')
+        parts = generator.get_name_parts(TONE, 'general')
+        weights = build_weights(synthetic_favorites(generator, random.Random(0)), parts.prefixes, parts.suffixes)
+        write_weights(weights, path)
+        generator.ranking_weights = ReloadableFile(path, load_ranking_weights)
+        ranked = time_per_call(generator, args.count, args.rounds)
+        result = {
+            'favorites_used': weights['favorites_used'],
+            'weights_file_bytes': os.path.getsize(path),
+            'unranked_us': round(plain * 1e6, 1),
+            'ranked_us': round(ranked * 1e6, 1),
+            'ranking_overhead_us': round((ranked - plain) * 1e6, 1),
+        }
+
+    for key, value in result.items():
+        print(f"{key:>20}: {value}")
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Parity check for the fast keyword path (fast_nlp.py) against NLTK.
+
+    python -m benchmarks.check_tokenizer_parity
+    python -m benchmarks.check_tokenizer_parity --descriptions 200000 --lemma-table data/lemmas.idx
+
+Generates a large, seeded corpus of business descriptions from the benchmark
+corpus, WordNet lemmas and their inflections, mixed with the punctuation,
+contractions, numbers, abbreviations and non-ASCII text real users type.  For
+every description it compares the keyword tokens of a generator using
+KEYWORD_TOKENIZER=fast with those of one using nltk.  Then it checks the lemma
+table against WordNetLemmatizer for every word in the pool.  Prints the
+mismatches, the share of descriptions that fell back to NLTK and the time per
+description on each path, for the generated corpus and for the benchmark
+descriptions alone.  Exits 1 if anything differs.
+
+tests/test_tokenizer_parity.py runs the same cases on a smaller corpus as
+part of the test suite.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from nltk.corpus import wordnet
+from nltk.stem import WordNetLemmatizer
+
+import fast_nlp
+from name_generator import BusinessNameGenerator
+from benchmarks.corpus import DESCRIPTIONS
+
+FRAGMENTS = [
+    "we're", "it's", "don't", "can't", "won't", "shop's", "kids'", "i'm", "you'll", "they've", "we'd",
+    "rock'n'roll", "o'brien", "24/7", "2nd", "3.5", "1,000", "$20", "100%", "e-commerce", "eco-friendly",
+    "b2b", "co-op", "node.js", "e.g.", "etc.", "dr.", "inc.", "café", "naïve", "résumé", "ai/ml", "c++",
+    "gonna", "wanna", "cannot", "'tis", "'n", "a+", "x'y", "--", "...", "''", "``",
+]
+PUNCTUATION = [',', '.', '!', '?', ';', ':', '(', ')', '"', "'", '&', '/', '-', '*', '@', '#']
+
+
+def word_pool(rng: random.Random, size: int):
+    """Words for the corpus: benchmark vocabulary, WordNet lemmas and inflected forms"""
+    words = {word.lower() for text in DESCRIPTIONS for word in text.split()}
+    lemmas = sorted(name for name in wordnet.all_lemma_names() if name.isalpha())
+    words.update(rng.sample(lemmas, min(size, len(lemmas))))
+    for word in list(words):
+        words.update((word + 's', word + 'es', word[:-1] + 'ies', word + "'s", word.title()))
+    return sorted(words)
+
+
+def generate_corpus(rng: random.Random, words, count: int):
+    corpus = [text for text in DESCRIPTIONS]
+    while len(corpus) < count:
+        parts = []
+        for _ in range(rng.randint(2, 14)):
+            roll = rng.random()
+            if roll < 0.08:
+                parts.append(rng.choice(FRAGMENTS))
+            elif roll < 0.22:
+                # Punctuation attached to the previous word, standing alone, or glued to the next
+                mark = rng.choice(PUNCTUATION)
+                style = rng.random()
+                if parts and style < 0.6:
+                    parts[-1] += mark
+                elif style < 0.8:
+                    parts.append(mark)
+                else:
+                    parts.append(mark + rng.choice(words))
+            else:
+                parts.append(rng.choice(words))
+        text = ' '.join(parts)
+        if rng.random() < 0.3:
+            text += rng.choice(['.', '!', '?', '."', '.)'])
+        corpus.append(text)
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--descriptions', type=int, default=50000)
+    parser.add_argument('--words', type=int, default=20000, help="WordNet lemmas sampled into the word pool")
+    parser.add_argument('--lemma-table', default=None, help="lemma table to check (default: the app's)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = word_pool(rng, args.words)
+    corpus = [text.lower() for text in generate_corpus(rng, words, args.descriptions)]
+
+    fast = BusinessNameGenerator()
+    fast.keyword_tokenizer = 'fast'
+    if args.lemma_table:
+        fast.lemma_table = fast_nlp.load_lemma_table(args.lemma_table)
+    reference = BusinessNameGenerator()
+    reference.keyword_tokenizer = 'nltk'
+    reference.lemma_table = None
+    reference.lemma_cache.capacity = 0  # time the plain NLTK path
+
+    failures = 0
+    for text in corpus:
+        expected = reference.keyword_tokens(text)
+        actual = fast.keyword_tokens(text)
+        if actual != expected:
+            failures += 1
+            if failures <= 20:
+                print(f"MISMATCH {text!r}\n    nltk: {expected}\n    fast: {actual}")
+
+    lemma_failures = 0
+    if fast.lemma_table is not None:
+        lemmatizer = WordNetLemmatizer()
+        for word in words:
+            word = word.lower()
+            if word.isalpha() and fast.lemma_table.lemma(word) != lemmatizer.lemmatize(word):
+                lemma_failures += 1
+                if lemma_failures <= 20:
+                    print(f"LEMMA MISMATCH {word}: table {fast.lemma_table.lemma(word)!r}, "
+                          f"wordnet {lemmatizer.lemmatize(word)!r}")
+
+    fallbacks = sum(fast_nlp.tokenize(text) is None for text in corpus)
+    realistic = [text.lower() for text in DESCRIPTIONS]
+    timings = {}
+    for label, generator in (('nltk', reference), ('fast', fast)):
+        for texts, name in ((corpus, 'corpus'), (realistic, 'descriptions')):
+            rounds = max(1, 20000 // len(texts))
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for text in texts:
+                    generator.keyword_tokens(text)
+            timings[label, name] = (time.perf_counter() - started) / (rounds * len(texts)) * 1e6
+
+    print(f"descriptions: {len(corpus)}, keyword mismatches: {failures}, "
+          f"fell back to NLTK: {fallbacks} ({fallbacks / len(corpus):.1%})")
+    if fast.lemma_table is None:
+        print("lemma table: not built, fast path lemmatized with WordNet")
+    else:
+        print(f"lemma table: {len(fast.lemma_table)} entries, {lemma_failures} mismatches over {len(words)} words")
+    for name in ('corpus', 'descriptions'):
+        print(f"us per text ({name}): nltk {timings['nltk', name]:.1f}, fast {timings['fast', name]:.1f} "
+              f"({timings['nltk', name] / timings['fast', name]:.1f}x)")
+    sys.exit(1 if failures or lemma_failures else 0)
+
+
+if __name__ == '__main__':
+    main()
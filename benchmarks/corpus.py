@@ -0,0 +1,35 @@
+"""
+Fixed corpus of business descriptions shared by the benchmark suite.
+
+Realistic /generate inputs of different lengths and industries; keep the list
+stable so results stay comparable with a saved baseline.
+"""
+
+DESCRIPTIONS = [
+    "eco-friendly skincare products",
+    "AI startup for healthcare",
+    "pet grooming services",
+    "sustainable tech startup",
+    "organic coffee roastery with fresh pastries and a small reading corner",
+    "mobile app that helps freelancers track invoices and expenses",
+    "boutique fashion label for handmade linen dresses",
+    "family-run Italian kitchen serving wood-fired pizza",
+    "cloud security consulting for small businesses",
+    "yoga and wellness retreat in the mountains",
+    "dog walking and pet sitting in the city",
+    "luxury bridal makeup and hair styling",
+    "vegan bakery with gluten free cakes and cookies",
+    "data analytics platform for retail stores",
+    "personal fitness coaching and nutrition plans",
+    "green cleaning service using natural products",
+    "handcrafted leather bags and wallets",
+    "craft brewery and taproom with live music",
+    "children's coding classes and robotics camps",
+    "elegant wedding photography studio",
+    "electric bike rental and repair shop",
+    "natural skincare line with botanical oils and clean ingredients",
+    "cyber security training for remote teams",
+    "farm to table restaurant sourcing from local growers",
+]
+
+TONES = ['professional', 'playful', 'elegant', 'minimal']
@@ -0,0 +1,111 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Used to exercise OpenAIClient (pooling, retries, circuit breaker) and the AI
+code paths without network access or an API key:
+
+    python -m benchmarks.fake_openai --port 8765 --latency 0.2
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=test python app.py
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+WORDS = ['Nova', 'Bright', 'Harbor', 'Maple', 'Summit', 'Echo', 'Lumen', 'Vista', 'Kindred', 'Atlas']
+
+
+def fake_completion(prompt: str) -> str:
+    """Produce a plausible completion for the prompts ai_generator sends"""
+    numbered = re.findall(r'^(\d+)\. (.+)$', prompt, re.MULTILINE)
+    if numbered:  # batched taglines
+        return "\n".join(f"{number}. Built for {name}" for number, name in numbered)
+
+    match = re.search(r'Generate (\d+) creative business names', prompt)
+    if match:
+        count = int(match.group(1))
+        return "\n".join(f"{i}. {WORDS[i % len(WORDS)]} {WORDS[(i * 3 + 1) % len(WORDS)]}"
+                         for i in range(1, count + 1))
+
+    match = re.search(r"called '([^']+)'", prompt)
+    return f'"{match.group(1) if match else "Your"} made simple"'
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Threaded HTTP/1.1 server with configurable latency and scripted failures"""
+
+    daemon_threads = True
+    request_queue_size = 1024  # listen backlog; load tests open hundreds of connections at once
+
+    def __init__(self, address: Tuple[str, int] = ('127.0.0.1', 0), latency: float = 0.0,
+                 failures: Optional[List[int]] = None):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.failures = list(failures or [])  # status codes returned before succeeding
+        self.request_count = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> 'FakeOpenAIServer':
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def next_status(self, client_address) -> int:
+        with self._lock:
+            self.request_count += 1
+            self.connections.add(client_address)
+            return self.failures.pop(0) if self.failures else 200
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is observable
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        status = self.server.next_status(self.client_address)
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if status == 200:
+            request = json.loads(body or b'{}')
+            prompt = request.get('messages', [{}])[-1].get('content', '')
+            payload = {'choices': [{'message': {'role': 'assistant', 'content': fake_completion(prompt)}}]}
+        else:
+            payload = {'error': {'message': f'scripted failure {status}'}}
+
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI chat completions server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds to wait before each response")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer((args.host, args.port), latency=args.latency)
+    print(f"Fake OpenAI API listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
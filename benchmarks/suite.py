@@ -0,0 +1,341 @@
+"""
+Reproducible benchmark suite with a JSON baseline.
+
+    python -m benchmarks.suite                                   # all sections
+    python -m benchmarks.suite --quick --sections micro,e2e
+    python -m benchmarks.suite --save-baseline                   # record this machine's baseline
+    python -m benchmarks.suite --baseline --fail-on-regression   # compare with it
+    python -m benchmarks.suite --sections e2e --url http://localhost:5000
+
+Sections:
+
+  micro  every BusinessNameGenerator method over the fixed corpus
+         (benchmarks/corpus.py), microseconds per call
+  e2e    /generate in-process (Flask test client, one per thread) at several
+         count values and concurrency levels: throughput, p50 and p99
+  ai     the use_ai path against the fake OpenAI server, then again with a
+         tiny random GPT-2 (needs torch and transformers, no download)
+
+Results are flat ``metric -> number`` maps.  Metrics ending in ``_per_second``
+are higher-is-better, all others (``_us``, ``_ms``) lower-is-better; with
+--baseline every metric is compared and anything worse by more than
+--tolerance is reported as a regression.  Timings only compare on the same
+machine and data (WordNet, vocabulary), so the baseline is recorded locally
+and not kept in the repository.  Every /generate response is also
+checked (status 200, names returned): any failure makes the run exit with
+status 1, which replaces the old test_api.py smoke checks.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.corpus import DESCRIPTIONS, TONES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+E2E_COUNTS = (5, 15, 50)
+E2E_CONCURRENCY = (1, 8)
+AI_COUNTS = (10,)
+AI_CONCURRENCY = (1, 8)
+
+
+def time_per_call(func: Callable, calls: Sequence[tuple], repeats: int) -> float:
+    """Median over repeats of the mean time per call, in microseconds"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for args in calls:
+            func(*args)
+        samples.append((time.perf_counter() - started) / len(calls))
+    return round(statistics.median(samples) * 1e6, 2)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+# --- micro-benchmarks --------------------------------------------------------------
+
+def micro_section(args) -> Dict[str, float]:
+    from app import generator
+
+    texts = [generator.normalize_text(description) for description in DESCRIPTIONS]
+    keywords = [generator._extract_keywords(text) for text in texts]  # also loads NLTK data
+    industries = [generator._detect_industry(words) for words in keywords]
+    tones = [TONES[i % len(TONES)] for i in range(len(texts))]
+    names = [generator.generate_rule_based_names(words, tone, 15, industry, seed=i)
+             for i, (words, tone, industry) in enumerate(zip(keywords, tones, industries))]
+    words = sorted({word for keyword_list in keywords for word in keyword_list})
+
+    cases = {
+        'extract_keywords_uncached': (generator._extract_keywords, [(text,) for text in texts]),
+        'extract_keywords_cached': (generator.extract_keywords, [(text,) for text in texts]),
+        'get_synonyms': (generator.get_synonyms, [(word,) for word in words]),
+        'detect_industry_uncached': (generator._detect_industry, [(k,) for k in keywords]),
+        'get_name_parts': (generator.get_name_parts, list(zip(tones, industries))),
+        'generate_rule_based_names': (
+            generator.generate_rule_based_names,
+            [(k, tone, 15, industry, i) for i, (k, tone, industry) in enumerate(zip(keywords, tones, industries))]
+        ),
+        'generate_taglines': (
+            generator.generate_taglines,
+            [(n, industry, random.Random(i)) for i, (n, industry) in enumerate(zip(names, industries))]
+        ),
+        'categorize_names': (generator.categorize_names, [(n,) for n in names]),
+    }
+
+    results = {}
+    for name, (func, calls) in cases.items():
+        results[f'micro.{name}_us'] = time_per_call(func, calls, args.repeats)
+        print(f"  {name:>28}: {results[f'micro.{name}_us']:10.2f} us/call")
+    return results
+
+
+# --- end-to-end load ----------------------------------------------------------------
+
+class InProcessClient:
+    """POST /generate through Flask test clients, one per thread"""
+
+    def __init__(self):
+        import app as flask_app
+        self.app = flask_app.app
+        self.local = threading.local()
+
+    def post(self, payload: Dict) -> Tuple[int, Optional[Dict]]:
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        response = client.post('/generate', json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+
+class HTTPClient:
+    """POST /generate to a running server, one keep-alive session per thread"""
+
+    def __init__(self, base_url: str):
+        import requests
+        self.requests = requests
+        self.base_url = base_url.rstrip('/')
+        self.local = threading.local()
+
+    def post(self, payload: Dict) -> Tuple[int, Optional[Dict]]:
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        try:
+            response = session.post(f'{self.base_url}/generate', json=payload, timeout=120)
+        except self.requests.RequestException:
+            return 0, None
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+
+def run_load(client, count: int, concurrency: int, total: int, use_ai: bool = False) -> Dict:
+    payloads = [{'input_text': DESCRIPTIONS[i % len(DESCRIPTIONS)], 'tone': TONES[i % len(TONES)],
+                 'count': count, 'use_ai': use_ai} for i in range(total)]
+
+    def one_request(payload):
+        started = time.perf_counter()
+        status, data = client.post(payload)
+        elapsed = time.perf_counter() - started
+        ok = status == 200 and bool(data and data.get('names'))
+        return elapsed, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one_request, payloads))
+    elapsed = time.perf_counter() - started
+
+    latencies = [latency for latency, ok in outcomes if ok]
+    return {
+        'requests_per_second': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+        'errors': len(outcomes) - len(latencies),
+    }
+
+
+def load_scenarios(prefix: str, client, counts, concurrencies, total: int, use_ai: bool = False):
+    """Metrics for every count x concurrency combination, plus the number of failed requests"""
+    results = {}
+    errors = 0
+    for count in counts:
+        for concurrency in concurrencies:
+            run_load(client, count, concurrency, min(total, 2 * concurrency), use_ai)  # warm-up
+            outcome = run_load(client, count, concurrency, total, use_ai)
+            errors += outcome.pop('errors')
+            key = f'{prefix}.count{count}.c{concurrency}'
+            for metric, value in outcome.items():
+                if value is not None:
+                    results[f'{key}.{metric}'] = value
+            print(f"  count={count:<3} concurrency={concurrency:<3}: {outcome['requests_per_second']:8.2f} req/s"
+                  f"  p50 {outcome['p50_ms']} ms  p99 {outcome['p99_ms']} ms")
+    return results, errors
+
+
+def e2e_section(args):
+    client = HTTPClient(args.url) if args.url else InProcessClient()
+    return load_scenarios('e2e', client, E2E_COUNTS, E2E_CONCURRENCY, args.requests)
+
+
+# --- AI paths -----------------------------------------------------------------------
+
+def tiny_gpt2(generator):
+    """Give an AINameGenerator the random 2-layer GPT-2 from bench_huggingface"""
+    from benchmarks.bench_huggingface import tiny_model
+
+    generator.hf_tokenizer, generator.hf_model = tiny_model()
+    generator.hf_model.eval()
+    generator.hf_tokenizer.pad_token = generator.hf_tokenizer.eos_token
+    generator.hf_tokenizer.padding_side = 'left'
+
+
+def ai_section(args):
+    import app as flask_app
+    from ai_generator import AINameGenerator, OpenAIClient, huggingface_installed
+    from benchmarks.fake_openai import FakeOpenAIServer
+
+    fake = FakeOpenAIServer(latency=args.openai_latency).start()
+    saved = flask_app.ai_generator, flask_app.AI_AVAILABLE
+
+    generator = AINameGenerator(use_inference_pool=False)
+    generator.openai_api_key = 'test'
+    generator.openai_client = OpenAIClient('test', base_url=fake.base_url)
+    generator._hf_load_attempted = True  # no GPT-2 until tiny_gpt2() installs one
+    flask_app.ai_generator, flask_app.AI_AVAILABLE = generator, True
+
+    client = InProcessClient()
+    total = max(args.requests // 4, 8)
+    try:
+        print("  fake OpenAI:")
+        results, errors = load_scenarios('ai.openai', client, AI_COUNTS, AI_CONCURRENCY, total, use_ai=True)
+
+        if not huggingface_installed():
+            print("  torch/transformers not installed: skipping the tiny GPT-2 runs")
+            return results, errors
+
+        tiny_gpt2(generator)
+        calls = [([word for word in description.split() if len(word) > 3][:3], 'professional', 5)
+                 for description in DESCRIPTIONS[:4]]
+        results['ai.huggingface_tiny.generate_names_us'] = time_per_call(
+            generator.generate_huggingface_names, calls, max(args.repeats // 2, 1)
+        )
+        print(f"  tiny GPT-2 generate_huggingface_names: {results['ai.huggingface_tiny.generate_names_us']:.0f} us/call")
+
+        print("  fake OpenAI + tiny GPT-2:")
+        hf_results, hf_errors = load_scenarios('ai.openai_tiny_gpt2', client, AI_COUNTS, AI_CONCURRENCY, total,
+                                               use_ai=True)
+        results.update(hf_results)
+        return results, errors + hf_errors
+    finally:
+        flask_app.ai_generator, flask_app.AI_AVAILABLE = saved
+        fake.shutdown()
+
+
+SECTIONS = {'micro': micro_section, 'e2e': e2e_section, 'ai': ai_section}
+
+
+# --- baseline comparison ------------------------------------------------------------
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> List[str]:
+    """Print current vs baseline for shared metrics; return the regressed ones"""
+    regressions = []
+    for metric in sorted(set(results) & set(baseline)):
+        before, after = baseline[metric], results[metric]
+        if not before:
+            continue
+        change = (after - before) / before
+        worse = -change if metric.endswith('_per_second') else change
+        flag = ''
+        if worse > tolerance:
+            flag = '  REGRESSION'
+            regressions.append(metric)
+        print(f"  {metric:<52} {before:>12.2f} -> {after:>12.2f}  {change:+7.1%}{flag}")
+    return regressions
+
+
+def machine_info() -> Dict:
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(), 'cpus': os.cpu_count()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sections', default='micro,e2e,ai', help="comma-separated: micro, e2e, ai")
+    parser.add_argument('--quick', action='store_true', help="fewer repeats and requests (noisier)")
+    parser.add_argument('--repeats', type=int, help="micro-benchmark repeats (default 7, quick 3)")
+    parser.add_argument('--requests', type=int, help="requests per e2e scenario (default 200, quick 40)")
+    parser.add_argument('--openai-latency', type=float, default=0.05, help="fake OpenAI response time (s)")
+    parser.add_argument('--url', help="run the e2e section against a live server instead of in-process")
+    parser.add_argument('--output', help="write the results JSON here")
+    parser.add_argument('--baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f"compare against this results JSON (default {DEFAULT_BASELINE})")
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, metavar='PATH',
+                        help=f"write the results as the new baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    if args.baseline and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}; record one on this machine with --save-baseline")
+    args.repeats = args.repeats or (3 if args.quick else 7)
+    args.requests = args.requests or (40 if args.quick else 200)
+    sections = [section.strip() for section in args.sections.split(',') if section.strip()]
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+
+    random.seed(0)
+    results = {}
+    errors = 0
+    for section in sections:
+        print(f"[{section}]")
+        outcome = SECTIONS[section](args)
+        if isinstance(outcome, tuple):
+            outcome, section_errors = outcome
+            errors += section_errors
+        results.update(outcome)
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'machine': machine_info(),
+        'settings': {'sections': sections, 'repeats': args.repeats, 'requests': args.requests,
+                     'openai_latency': args.openai_latency, 'url': args.url},
+        'failed_requests': errors,
+        'results': results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Wrote {path}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get('machine') != report['machine']:
+            print("Note: the baseline was recorded on a different machine; compare with care")
+        print(f"[compare with {args.baseline}, tolerance {args.tolerance:.0%}]")
+        regressions = compare(results, baseline['results'], args.tolerance)
+        print(f"{len(regressions)} regression(s)")
+
+    if errors:
+        print(f"{errors} /generate request(s) failed")
+    if errors or (regressions and args.fail_on_regression):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
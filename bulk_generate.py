@@ -0,0 +1,317 @@
+"""
+Offline bulk generation: names for a file of descriptions, on every core.
+
+    python bulk_generate.py listings.jsonl -o names.jsonl
+    python bulk_generate.py listings.csv.gz -o names.jsonl --workers 8 --count 5 --unordered
+
+Reads JSONL (one object per line) or CSV (with a header row), ``-`` for
+stdin, ``.gz`` allowed.  Each record needs the description in ``input_text``
+(``--text-field``); ``tone``, ``count``, ``seed`` and ``expansion`` are
+optional per record and default to the command-line options, and ``id``
+(``--id-field``) is copied to the output.  Writes one JSON line per record,
+shaped like a /generate/batch result: ``index`` (the record's position in the
+input), ``names``, ``categories``, ``keywords_extracted``,
+``industry_detected`` ... or ``error`` for a record that could not be used.
+Names are rule-based only.
+
+Records are read in chunks and fanned out to a process pool; each worker
+builds its own ``BusinessNameGenerator`` (name_generator.py, so neither Flask
+nor the web app is imported) and serializes its results itself.  At most two
+chunks per worker are in flight, so memory stays flat however large the
+input is.  Output follows input order unless ``--unordered`` is given, which
+writes chunks as they finish and keeps slow chunks from holding back the
+others.  Progress and throughput are reported on stderr.
+
+With ``--seed`` the output is reproducible: record i is generated from the
+seed and i, whatever the number of workers or the chunk size.
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterator, Optional, Tuple
+
+from name_generator import BusinessNameGenerator, ensure_nltk_data, EXPANSION_BACKENDS
+
+CHUNK_SIZE = 256
+PENDING_CHUNKS_PER_WORKER = 2
+PROGRESS_INTERVAL = 5.0    # seconds between progress lines
+
+# Set in each worker process by _init_worker
+_generator: Optional[BusinessNameGenerator] = None
+_options: Dict = {}
+
+
+# --- input ----------------------------------------------------------------------------
+
+class _CountingReader(io.RawIOBase):
+    """Binary stream wrapper that counts the bytes read through it (for progress)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        return len(data)
+
+
+def input_format(path: str, requested: str) -> str:
+    if requested != 'auto':
+        return requested
+    name = path[:-3] if path.endswith('.gz') else path
+    return 'csv' if name.lower().endswith('.csv') else 'jsonl'
+
+
+def read_records(stream, fmt: str) -> Iterator:
+    """Records in input order: raw JSON lines (parsed by the workers) or CSV rows as dicts"""
+    lines = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    if fmt == 'csv':
+        yield from csv.DictReader(lines)
+        return
+    for line in lines:
+        if line.strip():
+            yield line
+
+
+def chunks(records: Iterator, size: int) -> Iterator[Tuple[int, list]]:
+    """(index of the first record, records) in chunks of size"""
+    start = 0
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+# --- workers --------------------------------------------------------------------------
+
+def _init_worker(options: Dict):
+    global _generator, _options
+    _generator = BusinessNameGenerator()
+    _options = options
+
+
+def _field(item: Dict, name: str, default):
+    value = item.get(name)
+    return default if value is None or value == '' else value
+
+
+def parse_record(item) -> Dict:
+    """An input record as a dict: CSV rows already are one, JSONL lines are parsed"""
+    if isinstance(item, str):
+        try:
+            item = json.loads(item)
+        except ValueError:
+            raise ValueError('Invalid JSON')
+    if not isinstance(item, dict):
+        raise ValueError('Expected a JSON object')
+    return item
+
+
+def generate_record(generator: BusinessNameGenerator, index: int, item: Dict, options: Dict) -> Dict:
+    """Names, taglines and analysis for one input record; raises ValueError if it is unusable"""
+    text = item.get(options['text_field'])
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError(f"Missing {options['text_field']}")
+    tone = _field(item, 'tone', options['tone'])
+    expansion = _field(item, 'expansion', options['expansion'] or generator.expansion)
+    if expansion not in EXPANSION_BACKENDS:
+        raise ValueError('expansion must be one of: ' + ', '.join(EXPANSION_BACKENDS))
+    if expansion == 'embedding' and generator.embedding_index is None:
+        raise ValueError('expansion=embedding needs an embedding index, and none is loaded')
+    try:
+        count = int(_field(item, 'count', options['count']))
+        seed = _field(item, 'seed', None)
+        seed = int(seed) if seed is not None else None
+    except (TypeError, ValueError):
+        raise ValueError('count and seed must be integers')
+    if count < 1:
+        raise ValueError('count must be at least 1')
+
+    if seed is None and options['seed'] is not None:
+        seed = f"{options['seed']}:{index}"
+    rng = random.Random(seed)
+
+    keywords = generator.extract_keywords(generator.normalize_text(text), expansion)
+    if not keywords:
+        raise ValueError('No valid keywords found in input')
+    industry = generator.detect_industry(keywords)
+    names = generator.generate_rule_based_names(keywords, tone, count, industry, seed=rng.getrandbits(64))
+    taglines = generator.generate_taglines(names, industry, rng)
+
+    return {
+        'names': [{'name': name, 'tagline': tagline, 'id': i}
+                  for i, (name, tagline) in enumerate(zip(names, taglines))],
+        'categories': generator.categorize_names(names),
+        'keywords_extracted': keywords[:10],
+        'industry_detected': industry,
+        'total_generated': len(names),
+        'generation_method': 'Rule-based'
+    }
+
+
+def generate_chunk(start: int, records: list) -> Tuple[str, int, int]:
+    """(JSON lines, records, errors) for the chunk of records starting at index start"""
+    lines = []
+    errors = 0
+    for index, item in enumerate(records, start):
+        record = {'index': index}
+        try:
+            item = parse_record(item)
+            if _options['id_field'] in item:
+                record['id'] = item[_options['id_field']]
+            record.update(generate_record(_generator, index, item, _options))
+        except Exception as e:
+            errors += 1
+            record['error'] = str(e)
+        lines.append(json.dumps(record))
+    return '\n'.join(lines) + '\n', len(records), errors
+
+
+# --- driver ---------------------------------------------------------------------------
+
+class Progress:
+    """Records done, errors and throughput, reported on stderr every interval seconds"""
+
+    def __init__(self, total_bytes: Optional[int], counter: _CountingReader, interval: float):
+        self.total_bytes = total_bytes
+        self.counter = counter
+        self.interval = interval
+        self.started = self.reported = time.monotonic()
+        self.records = 0
+        self.errors = 0
+
+    def add(self, records: int, errors: int):
+        self.records += records
+        self.errors += errors
+        now = time.monotonic()
+        if self.interval and now - self.reported >= self.interval:
+            self.reported = now
+            self.report()
+
+    def report(self, final: bool = False):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        read = ''
+        if self.total_bytes and not final:
+            read = f" ({min(self.counter.bytes_read / self.total_bytes, 1):.0%} of input read)"
+        print(f"{'Done: ' if final else ''}{self.records:,} records, {self.errors:,} errors, "
+              f"{self.records / elapsed:,.0f} records/s, {elapsed:.1f}s{read}", file=sys.stderr, flush=True)
+
+
+def run(chunks_in: Iterator[Tuple[int, list]], output, workers: int, ordered: bool, options: Dict,
+        progress: Progress):
+    """Generate every chunk, writing results as they are ready with at most 2 chunks per worker in flight"""
+    if workers <= 1:
+        _init_worker(options)
+        for start, records in chunks_in:
+            text, done, errors = generate_chunk(start, records)
+            output.write(text)
+            progress.add(done, errors)
+        return
+
+    def write(future):
+        text, done, errors = future.result()
+        output.write(text)
+        progress.add(done, errors)
+
+    max_pending = workers * PENDING_CHUNKS_PER_WORKER
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(options,)) as pool:
+        pending = deque() if ordered else set()
+        try:
+            for start, records in chunks_in:
+                if len(pending) >= max_pending:
+                    if ordered:
+                        write(pending.popleft())
+                    else:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            write(future)
+                future = pool.submit(generate_chunk, start, records)
+                if ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+            for future in (pending if ordered else as_completed(pending)):
+                write(future)
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+
+def open_input(path: str) -> Tuple[io.BufferedIOBase, _CountingReader, Optional[int]]:
+    """(decompressed binary stream, byte counter of the file, file size or None when unknown)"""
+    raw = sys.stdin.buffer if path == '-' else open(path, 'rb')
+    size = None if path == '-' else os.fstat(raw.fileno()).st_size
+    counter = _CountingReader(raw)
+    stream = io.BufferedReader(counter)
+    if path.endswith('.gz'):
+        stream = gzip.GzipFile(fileobj=stream)
+    return stream, counter, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate names for a JSONL or CSV file of descriptions")
+    parser.add_argument('input', help="JSONL or CSV file (.gz allowed), - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSONL output file (default: stdout)")
+    parser.add_argument('--format', choices=('auto', 'jsonl', 'csv'), default='auto',
+                        help="input format (default: from the file name, else jsonl)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: one per CPU; 1 runs in this process)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="records per task sent to a worker")
+    parser.add_argument('--unordered', action='store_true', help="write results as they finish")
+    parser.add_argument('--text-field', default='input_text')
+    parser.add_argument('--id-field', default='id', help="field copied to the output")
+    parser.add_argument('--tone', default='professional', help="default tone")
+    parser.add_argument('--count', type=int, default=10, help="default names per record")
+    parser.add_argument('--expansion', choices=EXPANSION_BACKENDS,
+                        help="default keyword expansion (default: KEYWORD_EXPANSION)")
+    parser.add_argument('--seed', type=int, help="make the output reproducible")
+    parser.add_argument('--progress-interval', type=float, default=PROGRESS_INTERVAL,
+                        help="seconds between progress lines on stderr (0: only the summary)")
+    args = parser.parse_args()
+    if args.workers < 1 or args.chunk_size < 1:
+        parser.error('--workers and --chunk-size must be at least 1')
+
+    # Fetch missing NLTK data once, before the workers need it
+    ensure_nltk_data()
+
+    options = {
+        'text_field': args.text_field, 'id_field': args.id_field, 'tone': args.tone,
+        'count': args.count, 'expansion': args.expansion, 'seed': args.seed
+    }
+    stream, counter, size = open_input(args.input)
+    records = read_records(stream, input_format(args.input, args.format))
+    progress = Progress(size, counter, args.progress_interval)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    try:
+        run(chunks(records, args.chunk_size), output, args.workers, not args.unordered, options, progress)
+    except BrokenPipeError:
+        # Output closed early (e.g. piped into head); keep the interpreter from complaining at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        counter.stream.close()
+    progress.report(final=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,334 @@
+"""
+Combinatorial candidate engine for rule-based business names.
+
+Every rule-based name is the concatenation of one item from each of a few part
+lists (prefix + keyword, keyword + suffix, ...).  Instead of drawing random
+templates until enough distinct names turn up, the engine lays each template
+family out as the cartesian product of its part lists, computes all name
+lengths at once with NumPy, drops the ones over the length limit in bulk and
+walks a seeded permutation of what is left.  Sampling is therefore without
+replacement: it returns exactly ``count`` unique names whenever the space has
+that many, and the same seed always gives the same names.
+
+``CandidateEngine.page`` does the walking, in pages that can be resumed from
+a small state (how far each family's walk has got), so "more names" needs
+neither the earlier pages nor a record of the names already shown;
+``iter_names`` chains the pages for callers that filter candidates:
+
+* each family's order is a keyed Feistel permutation, whose i-th element is
+  computed directly instead of shuffling the whole family up front;
+* the family of the j-th pick is a hash of the seed and j;
+* a name several templates can spell (``'Smart' + 'Tech'`` as prefix +
+  keyword and as a compound) is only emitted by its canonical spelling -- the
+  first space in ``NAME_TYPES`` order that contains it, with its smallest
+  combination there -- so no page repeats a name from any other page.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from math import prod
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAX_NAME_LENGTH = 25
+
+# Template families, in the order the generator picks between them
+NAME_TYPES = ('prefix_keyword', 'keyword_suffix', 'compound', 'modified')
+
+COMPOUND_CONNECTORS = ('', ' & ', ' + ')
+MODIFIED_ENDINGS = ('ify', 'ly', 'wise', 'hub', 'lab')
+MODIFIED_ARTICLES = ('The ', '')
+MODIFIED_SUFFIXES = (' Co', ' Lab', ' Works')
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+def _unique(parts: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(parts))
+
+
+class ProductSpace:
+    """All concatenations of one item from each part list, minus excluded ones.
+
+    ``indices`` holds the flat indices of the combinations that fit within
+    ``max_length``; ``distinct_axes`` optionally names two axes whose items
+    must differ (e.g. the two keywords of a compound).
+    """
+
+    def __init__(self, parts: Sequence[Sequence[str]], max_length: int = MAX_NAME_LENGTH,
+                 distinct_axes: Optional[Tuple[int, int]] = None):
+        self.parts = tuple(tuple(axis) for axis in parts)
+        self.shape = tuple(len(axis) for axis in self.parts)
+        self.max_length = max_length
+        self.distinct_axes = distinct_axes
+        self._lookups = None
+
+        if not all(self.shape):
+            self.indices = []
+            return
+
+        lengths = np.zeros(self.shape, dtype=np.int32)
+        for axis, items in enumerate(self.parts):
+            view = [1] * len(self.shape)
+            view[axis] = len(items)
+            lengths = lengths + np.fromiter(map(len, items), dtype=np.int32, count=len(items)).reshape(view)
+        valid = lengths <= max_length
+
+        if distinct_axes is not None:
+            first, second = distinct_axes
+            grid = np.indices(self.shape, sparse=True)
+            valid &= grid[first] != grid[second]
+
+        self.indices = np.flatnonzero(valid).tolist()
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def name(self, position: int) -> str:
+        """The name at a position of ``indices``"""
+        return ''.join(self.items(position))
+
+    def items(self, position: int) -> Tuple[str, ...]:
+        """The part items the name at a position of ``indices`` is made of"""
+        return self.split(self.indices[position])
+
+    def split(self, flat: int) -> Tuple[str, ...]:
+        """The part items of the combination at a flat index"""
+        pieces = []
+        for items, size in zip(reversed(self.parts), reversed(self.shape)):
+            flat, index = divmod(flat, size)
+            pieces.append(items[index])
+        return tuple(reversed(pieces))
+
+    def first_split(self, name: str) -> Optional[int]:
+        """Smallest flat index of a combination in this space that spells name, or None"""
+        if not self.indices or len(name) > self.max_length:
+            return None
+        if self._lookups is None:
+            # Per axis: item -> index, and the distinct item lengths in increasing order
+            self._lookups = [({item: index for index, item in enumerate(items)}, sorted(set(map(len, items))))
+                             for items in self.parts]
+
+        if len(self._lookups) == 2:
+            # Fast path for the common two-part spaces
+            (first, lengths), (second, _) = self._lookups
+            best = None
+            for length in lengths:
+                if length > len(name):
+                    break
+                head = first.get(name[:length])
+                if head is not None:
+                    tail = second.get(name[length:])
+                    if tail is not None and (self.distinct_axes is None or head != tail):
+                        flat = head * self.shape[1] + tail
+                        if best is None or flat < best:
+                            best = flat
+            return best
+
+        best = None
+        for split in self._splits(name, 0, 0):
+            if self.distinct_axes is not None and split[self.distinct_axes[0]] == split[self.distinct_axes[1]]:
+                continue
+            flat = 0
+            for index, size in zip(split, self.shape):
+                flat = flat * size + index
+            if best is None or flat < best:
+                best = flat
+        return best
+
+    def _splits(self, name: str, axis: int, start: int) -> Iterator[Tuple[int, ...]]:
+        """Item indices, one per axis from ``axis`` on, of every way to spell name[start:]"""
+        index, lengths = self._lookups[axis]
+        if axis == len(self._lookups) - 1:
+            item = index.get(name[start:])
+            if item is not None:
+                yield (item,)
+            return
+        for length in lengths:
+            if start + length > len(name):
+                break
+            item = index.get(name[start:start + length])
+            if item is not None:
+                for rest in self._splits(name, axis + 1, start + length):
+                    yield (item,) + rest
+
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer: a well-spread 64-bit hash of an integer"""
+    value = (value + _GOLDEN) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class Permutation:
+    """Keyed pseudo-random permutation of range(size) with O(1) access to any element.
+
+    A 4-round Feistel network over the smallest even number of bits that
+    covers ``size``; values that land outside the range are walked through
+    the network again until they fall inside (under 4 rounds on average).
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, size: int, key: int):
+        self.size = size
+        self._half = max(1, ((size - 1).bit_length() + 1) // 2)
+        self._keys = [_mix(key + round_) for round_ in range(self.ROUNDS)]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, position: int) -> int:
+        if not 0 <= position < self.size:
+            raise IndexError(position)
+        half, keys = self._half, self._keys
+        low, shift = (1 << half) - 1, 64 - half
+        value = position
+        while True:
+            left, right = value >> half, value & low
+            for key in keys:
+                left, right = right, left ^ ((((right ^ key) * _GOLDEN) & _MASK64) >> shift)
+            value = (left << half) | right
+            if value < self.size:
+                return value
+
+
+class CandidateEngine:
+    """Seeded sampling without replacement over the rule-based name spaces"""
+
+    def __init__(self, keywords: Sequence[str], prefixes: Sequence[str], suffixes: Sequence[str],
+                 max_length: int = MAX_NAME_LENGTH, titled_prefixes: Optional[Sequence[str]] = None,
+                 titled_suffixes: Optional[Sequence[str]] = None):
+        # Callers with a precomputed vocabulary pass the title-cased, de-duplicated parts
+        titled_keywords = _unique(keyword.title() for keyword in keywords)
+        if titled_prefixes is None:
+            titled_prefixes = _unique(prefix.title() for prefix in prefixes)
+        if titled_suffixes is None:
+            titled_suffixes = _unique(suffix.title() for suffix in suffixes)
+
+        if len(titled_keywords) >= 2:
+            compound = [ProductSpace([titled_keywords, COMPOUND_CONNECTORS, titled_keywords], max_length,
+                                     distinct_axes=(0, 2))]
+        else:
+            compound = [ProductSpace([titled_keywords, _unique(suffixes)], max_length)]
+
+        self.spaces = {
+            'prefix_keyword': [ProductSpace([titled_prefixes, titled_keywords], max_length)],
+            'keyword_suffix': [ProductSpace([titled_keywords, titled_suffixes], max_length)],
+            'compound': compound,
+            'modified': [
+                ProductSpace([titled_keywords, MODIFIED_ENDINGS], max_length),
+                ProductSpace([MODIFIED_ARTICLES, titled_keywords, MODIFIED_SUFFIXES], max_length)
+            ]
+        }
+        # Canonical order for page(): a name belongs to the first of these that can spell it
+        self._ordered = [space for name_type in NAME_TYPES for space in self.spaces[name_type]]
+        self._families = [name_type for name_type in NAME_TYPES for _ in self.spaces[name_type]]
+        self._owners = {}  # name -> (canonical space index, flat index), filled in as pages need it
+
+        # Per family: sub-space offsets within the family, and (canonical index, space) per non-empty sub-space
+        self._layout = []
+        canonical = 0
+        for name_type in NAME_TYPES:
+            spaces = []
+            for space in self.spaces[name_type]:
+                if len(space):
+                    spaces.append((canonical, space))
+                canonical += 1
+            self._layout.append((list(accumulate([len(space) for _, space in spaces], initial=0)), spaces))
+
+    def size(self) -> int:
+        """Number of candidates within the length limit (before de-duplication)"""
+        return sum(len(space) for spaces in self.spaces.values() for space in spaces)
+
+    def iter_names(self, seed: int, page_size: int = 256) -> Iterator[str]:
+        """Every unique name, lazily, in the order of seed's pages (see page).
+
+        For callers that filter candidates (e.g. by domain availability) and
+        don't know in advance how many they will need.
+        """
+        state = None
+        while True:
+            candidates, state = self.page(page_size, seed, state)
+            for name, _, _ in candidates:
+                yield name
+            if state is None:
+                return
+
+    def family_sizes(self) -> List[int]:
+        """Candidates per template family, in NAME_TYPES order (the bounds of a page state)"""
+        return [offsets[-1] for offsets, _ in self._layout]
+
+    def _owner(self, name: str) -> Tuple[int, int]:
+        """(canonical space index, flat index) of the spelling of name that page() emits"""
+        owner = self._owners.get(name)
+        if owner is None:
+            for canonical, space in enumerate(self._ordered):
+                flat = space.first_split(name)
+                if flat is not None:
+                    owner = self._owners[name] = (canonical, flat)
+                    break
+        return owner
+
+    def candidate_id(self, name: str) -> int:
+        """Small integer id of an emitted name, for carrying it in a page state (see candidate)"""
+        canonical, flat = self._owner(name)
+        return flat * len(self._ordered) + canonical
+
+    def candidate(self, candidate_id: int) -> Tuple[str, str, Tuple[str, ...]]:
+        """The (name, family, items) candidate a candidate_id was made from"""
+        flat, canonical = divmod(candidate_id, len(self._ordered))
+        space = self._ordered[canonical]
+        if not 0 <= flat < prod(space.shape):
+            raise ValueError('candidate id does not match the candidate space')
+        items = space.split(flat)
+        return ''.join(items), self._families[canonical], items
+
+    def page(self, count: int, seed: int, state: Optional[Sequence[int]] = None
+             ) -> Tuple[List[Tuple[str, str, Tuple[str, ...]]], Optional[Tuple[int, ...]]]:
+        """The next up to count (name, family, items) candidates after state, and the state after them.
+
+        ``state`` is None for the first page, then whatever the previous page
+        returned: how many candidates of each family (NAME_TYPES order) have
+        been walked.  It is None again once every family is exhausted.  A page
+        costs O(count) whatever its depth, and the pages of one seed never
+        share a name.  Each pick chooses a family uniformly among those not
+        yet exhausted, so families stay evenly mixed however different their
+        sizes.
+        """
+        sizes = self.family_sizes()
+        positions = [0] * len(sizes) if state is None else list(state)
+        if len(positions) != len(sizes) or not all(0 <= position <= size
+                                                    for position, size in zip(positions, sizes)):
+            raise ValueError('page state does not match the candidate space')
+
+        base = _mix(seed & _MASK64)
+        permutations = {}  # per family, made when the page first picks it
+        active = [family for family, size in enumerate(sizes) if positions[family] < size]
+        pick = sum(positions)  # every pick walks one step of one family
+        candidates = []
+        while len(candidates) < count and active:
+            family = active[_mix(base + pick) % len(active)]
+            pick += 1
+            permutation = permutations.get(family)
+            if permutation is None:
+                permutation = permutations[family] = Permutation(sizes[family], _mix(base ^ (family + 1)))
+            flat = permutation[positions[family]]
+            positions[family] += 1
+            if positions[family] == sizes[family]:
+                active.remove(family)
+
+            offsets, spaces = self._layout[family]
+            which = bisect_right(offsets, flat) - 1
+            canonical, space = spaces[which]
+            position = flat - offsets[which]
+            items = space.items(position)
+            name = ''.join(items)
+            if self._owner(name) != (canonical, space.indices[position]):
+                continue  # another spelling of the name is the one that gets emitted
+            candidates.append((name, NAME_TYPES[family], items))
+
+        return candidates, (tuple(positions) if active else None)
@@ -0,0 +1,66 @@
+"""
+Opaque, tamper-proof pagination cursors.
+
+A cursor carries everything needed to produce the next page -- for /generate
+the seed, the keywords and the position reached in the candidate space (see
+``CandidateEngine.page``) -- so no session state is kept on the server and any
+worker can serve the next page:
+
+    codec = CursorCodec(secret)
+    token = codec.encode({'seed': 42, 'state': [3, 5, 2, 4]})
+    codec.decode(token)  # -> the same dict, or ValueError
+
+The token is the compact JSON payload and a truncated HMAC-SHA256 of it, both
+base64url-encoded.  It is signed, not encrypted: clients can read the payload
+(nothing secret goes in it) but not alter it, so positions and keyword lists
+coming back from a client can be trusted.  Every worker that may receive a
+cursor must use the same secret.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+from typing import Dict, Optional
+
+MAC_SIZE = 16          # bytes of the HMAC kept in a token
+MAX_CURSOR_LENGTH = 4096
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class CursorCodec:
+    """Signs JSON payloads into cursor strings and verifies them on the way back"""
+
+    def __init__(self, secret: Optional[bytes] = None):
+        # A random secret is only valid in this process (and workers forked from it)
+        self.secret = secret if secret is not None else os.urandom(32)
+
+    def _mac(self, body: str) -> bytes:
+        return hmac.new(self.secret, body.encode('ascii'), hashlib.sha256).digest()[:MAC_SIZE]
+
+    def encode(self, payload: Dict) -> str:
+        body = _b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        return f'{body}.{_b64encode(self._mac(body))}'
+
+    def decode(self, token) -> Dict:
+        """The payload of a cursor this codec encoded; ValueError for anything else"""
+        if not isinstance(token, str) or len(token) > MAX_CURSOR_LENGTH or token.count('.') != 1:
+            raise ValueError('Invalid cursor')
+        body, mac = token.split('.')
+        try:
+            valid = hmac.compare_digest(_b64decode(mac), self._mac(body))
+            payload = json.loads(_b64decode(body)) if valid else None
+        except (binascii.Error, UnicodeError, ValueError):
+            payload = None
+        if not isinstance(payload, dict):
+            raise ValueError('Invalid cursor')
+        return payload
@@ -0,0 +1,252 @@
+"""
+Local registered-domain index for availability checks.
+
+Registered domains are loaded offline from zone-file dumps (or plain lists of
+domains, one per line) and written to a compact binary file:
+
+    python domain_index.py build data/domains.idx com.zone.gz net.zone org.txt --tld org
+
+The file holds a Bloom filter followed by the sorted domain names and an offset
+table.  Workers memory-map it read-only: a lookup hashes the domain once,
+probes a few Bloom bits (most unregistered names stop there) and confirms
+positives with a binary search over the sorted names, so a check takes a few
+microseconds and thousands of candidates can be checked per request.
+
+Only TLDs that were loaded are answered; for any other TLD availability is
+unknown (None) rather than guessed.
+"""
+
+import argparse
+import gzip
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BNDOM001'
+BITS_PER_DOMAIN = 10  # ~1% Bloom false positives with 7 hashes; positives are confirmed exactly
+HASH_COUNT = 7
+
+_HEADER = struct.Struct('<8sIIQI')  # magic, domain count, hash count, bloom bits, tld list length
+_OFFSET = struct.Struct('<I')
+
+_LABEL_INVALID = re.compile(r'[^a-z0-9-]+')
+
+
+def domain_label(business_name: str) -> str:
+    """Second-level label for a business name ("The Coffee & Co" -> "thecoffeeco")"""
+    return _LABEL_INVALID.sub('', business_name.lower()).strip('-')[:63]
+
+
+def normalize_domain(domain: str) -> str:
+    return domain.strip().rstrip('.').lower()
+
+
+def _hash_pair(domain: bytes):
+    digest = hashlib.blake2b(domain, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+
+def iter_zone_domains(lines: Iterable[str], origin: Optional[str] = None) -> Iterator[str]:
+    """Registered second-level domains in a zone file or a one-domain-per-line list.
+
+    Zone records use the first field as owner name; relative names are
+    completed with $ORIGIN (or ``origin``), and only names one label below
+    their TLD are kept (delegations, not the records inside them).
+    """
+    origin = normalize_domain(origin) if origin else None
+    depth = 0  # inside a parenthesised multi-line record
+    for raw_line in lines:
+        line = raw_line.split(';', 1)[0]
+        continued = depth > 0
+        depth = max(depth + line.count('(') - line.count(')'), 0)
+        # Continuation lines, and lines starting with blanks (same owner as before), add no names
+        if continued or not line.strip() or line[0] in ' \t':
+            continue
+
+        if line.upper().startswith('$ORIGIN'):
+            parts = line.split()
+            if len(parts) > 1:
+                origin = normalize_domain(parts[1])
+            continue
+        if line[0] == '$':
+            continue
+
+        owner = line.split(None, 1)[0]
+        if owner == '@':
+            continue
+        if owner.endswith('.') or origin is None:
+            domain = normalize_domain(owner)
+        else:
+            domain = f"{normalize_domain(owner)}.{origin}"
+
+        if domain.count('.') == 1 and all(domain.split('.')):
+            yield domain
+
+
+def read_domain_files(paths: Sequence[str], origin: Optional[str] = None) -> Iterator[str]:
+    for path in paths:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            yield from iter_zone_domains(f, origin)
+
+
+def write_index(domains: Iterable[str], path: str, bits_per_domain: int = BITS_PER_DOMAIN,
+                hash_count: int = HASH_COUNT) -> int:
+    """Sort, de-duplicate and serialize registered domains into an index file, atomically"""
+    encoded = sorted({normalize_domain(domain).encode('utf-8') for domain in domains})
+    tlds = sorted({domain.rsplit(b'.', 1)[-1].decode('utf-8') for domain in encoded})
+    tlds = ','.join(tlds).encode('utf-8')
+
+    bloom_bits = max(len(encoded) * bits_per_domain, 64)
+    bloom_bits += -bloom_bits % 8
+    bloom = bytearray(bloom_bits // 8)
+    for domain in encoded:
+        h1, h2 = _hash_pair(domain)
+        for i in range(hash_count):
+            bit = (h1 + i * h2) % bloom_bits
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    blob_size = sum(len(domain) for domain in encoded)
+    if blob_size >= 1 << 32:
+        raise ValueError("domain list too large for 32-bit offsets")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(encoded), hash_count, bloom_bits, len(tlds)))
+        f.write(tlds)
+        f.write(bloom)
+        offset = 0
+        offsets = bytearray()
+        for domain in encoded:
+            offsets += _OFFSET.pack(offset)
+            offset += len(domain)
+        offsets += _OFFSET.pack(offset)
+        f.write(offsets)
+        for domain in encoded:
+            f.write(domain)
+    os.replace(tmp_path, path)
+    return _HEADER.size + len(tlds) + len(bloom) + len(offsets) + blob_size
+
+
+class DomainIndex:
+    """Read-only, memory-mapped view of a registered-domain index file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = _HEADER.unpack_from(self._buffer, 0)
+        magic, self.domain_count, self.hash_count, self.bloom_bits, tld_length = header
+        if magic != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{path} is not a domain index")
+
+        tld_start = _HEADER.size
+        tld_list = self._buffer[tld_start:tld_start + tld_length].decode('utf-8')
+        self.tlds = frozenset(tld_list.split(',')) if tld_list else frozenset()
+        self._bloom_start = tld_start + tld_length
+        self._offsets_start = self._bloom_start + self.bloom_bits // 8
+        self._blob_start = self._offsets_start + (self.domain_count + 1) * _OFFSET.size
+
+    def _domain_at(self, position: int) -> bytes:
+        start, end = struct.unpack_from('<II', self._buffer, self._offsets_start + position * _OFFSET.size)
+        return self._buffer[self._blob_start + start:self._blob_start + end]
+
+    def _maybe_registered(self, key: bytes) -> bool:
+        buffer = self._buffer
+        h1, h2 = _hash_pair(key)
+        for i in range(self.hash_count):
+            bit = (h1 + i * h2) % self.bloom_bits
+            if not buffer[self._bloom_start + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+    def _contains(self, key: bytes) -> bool:
+        low, high = 0, self.domain_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._domain_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self.domain_count and self._domain_at(low) == key
+
+    def is_registered(self, domain: str) -> Optional[bool]:
+        """True if the domain is registered, False if not, None if its TLD isn't indexed"""
+        domain = normalize_domain(domain)
+        if domain.rsplit('.', 1)[-1] not in self.tlds:
+            return None
+        key = domain.encode('utf-8')
+        return self._maybe_registered(key) and self._contains(key)
+
+    def __contains__(self, domain: str) -> bool:
+        return bool(self.is_registered(domain))
+
+    def availability(self, domains: Iterable[str]) -> Dict[str, Optional[bool]]:
+        """Bulk check: domain -> available (True/False), or None for unindexed TLDs"""
+        results = {}
+        for domain in domains:
+            registered = self.is_registered(domain)
+            results[domain] = None if registered is None else not registered
+        return results
+
+    def __len__(self) -> int:
+        return self.domain_count
+
+    def close(self):
+        self._buffer.close()
+
+
+def load_domain_index(path: str) -> Optional[DomainIndex]:
+    """Open the domain index if it has been built, otherwise return None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        index = DomainIndex(path)
+        logger.info(f"Loaded domain index with {len(index)} domains "
+                    f"({', '.join(sorted(index.tlds))}) from {path}")
+        return index
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load domain index {path}: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the registered-domain index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="build the index from zone files or domain lists")
+    build.add_argument('output')
+    build.add_argument('inputs', nargs='+', help="zone files / domain lists (.gz allowed)")
+    build.add_argument('--tld', help="origin for relative names (zone files without $ORIGIN, lists of bare labels)")
+
+    lookup = subparsers.add_parser('lookup', help="check some domains against an index")
+    lookup.add_argument('index')
+    lookup.add_argument('domains', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        domains: List[str] = list(read_domain_files(args.inputs, args.tld))
+        size = write_index(domains, args.output)
+        print(f"Indexed {len(set(domains))} domains into {args.output} "
+              f"({size / 1024:.0f} KiB, {time.perf_counter() - started:.1f}s)")
+    else:
+        index = DomainIndex(args.index)
+        for domain, available in index.availability(args.domains).items():
+            print(f"{domain}: {'unknown TLD' if available is None else 'available' if available else 'registered'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+"""
+Word-vector index for embedding-based keyword expansion.
+
+WordNet synonyms suit a dictionary better than a brand ("cafe" -> "coffee
+bar"), while words that sit close to a keyword in a word-vector space tend
+to be what a naming brainstorm wants.  The vectors are built offline into
+one file from a local GloVe or word2vec text file:
+
+    python embedding_index.py build data/embeddings.idx --vectors glove.6B.300d.txt
+
+The build keeps the most frequent ``--max-words`` alphabetic words, normalizes
+their vectors and clusters them with spherical k-means.  The file holds:
+
+* a word -> row lookup: CRC32 hashes in sorted order with their rows, plus
+  every word's UTF-8 bytes, so a lookup is a binary search and one compare;
+* the vectors as a float16 matrix, rows grouped by cluster;
+* the float32 cluster centroids and where each cluster's rows start.
+
+That is an inverted-file approximate nearest-neighbour index: a query scores
+the centroids, takes the ``nprobe`` closest clusters (contiguous row ranges)
+and scores only their rows, with one matrix-vector product each.  Workers
+memory-map the file read-only, so every process on the host shares one copy
+of the matrix in the page cache.  Neighbours are memoized per process.
+
+``python -m benchmarks.bench_expansion`` compares latency and memory with the
+WordNet path.
+"""
+
+import argparse
+import gzip
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BNEMB001'
+ALIGNMENT = 64
+DEFAULT_MAX_WORDS = 100000
+
+# magic, words, dimensions, clusters, then the offsets of the word hashes, the
+# rows they belong to, the word byte offsets, the word bytes, the vectors, the
+# centroids and the cluster starts
+_HEADER = struct.Struct('<8sIII7Q')
+
+
+def read_vectors(path: str, max_words: int = DEFAULT_MAX_WORDS) -> Tuple[List[str], np.ndarray]:
+    """The first ``max_words`` lower-case alphabetic words of a GloVe/word2vec text file.
+
+    Both formats list one word and its components per line, most frequent words
+    first; word2vec files start with a "count dimensions" line.  Later
+    duplicates (e.g. "Cafe" after "cafe") are skipped.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    words, rows, seen = [], [], set()
+    dimensions = None
+    with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+        for line_number, line in enumerate(f):
+            parts = line.rstrip().split(' ')
+            if line_number == 0 and len(parts) == 2 and parts[0].isdigit() and parts[1].isdigit():
+                continue  # word2vec header
+            if dimensions is None:
+                dimensions = len(parts) - 1
+            word = parts[0].lower()
+            if len(parts) - 1 != dimensions or not word.isalpha() or word in seen:
+                continue
+            seen.add(word)
+            words.append(word)
+            rows.append(np.asarray(parts[1:], dtype=np.float32))
+            if len(words) >= max_words:
+                break
+    if not words:
+        raise ValueError(f"no word vectors found in {path}")
+    return words, np.vstack(rows)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _chunks(count: int, size: int = 8192) -> Iterator[slice]:
+    for start in range(0, count, size):
+        yield slice(start, min(start + size, count))
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for chunk in _chunks(len(vectors)):
+        assignment[chunk] = np.argmax(vectors[chunk] @ centroids.T, axis=1)
+    return assignment
+
+
+def spherical_kmeans(vectors: np.ndarray, clusters: int, iterations: int = 10,
+                     seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """(unit centroids, cluster of every row) for unit vectors, by cosine similarity"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _assign(vectors, centroids)
+        counts = np.bincount(assignment, minlength=clusters)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        sums = np.zeros_like(centroids)
+        sums[counts > 0] = np.add.reduceat(vectors[np.argsort(assignment, kind='stable')], starts[counts > 0])
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize(sums)
+    return centroids, _assign(vectors, centroids)
+
+
+def default_cluster_count(word_count: int) -> int:
+    """About 4 * sqrt(n) clusters: a probe scores roughly sqrt(n) / 4 rows"""
+    return max(1, min(word_count, int(4 * math.sqrt(word_count))))
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_index(words: List[str], vectors: np.ndarray, path: str, clusters: Optional[int] = None,
+                iterations: int = 10, seed: int = 0) -> int:
+    """Cluster the vectors and write the index file atomically; returns its size"""
+    vectors = normalize(np.asarray(vectors, dtype=np.float32))
+    clusters = clusters or default_cluster_count(len(words))
+    centroids, assignment = spherical_kmeans(vectors, clusters, iterations, seed)
+
+    order = np.argsort(assignment, kind='stable')  # rows grouped by cluster, frequency order within
+    words = [words[row] for row in order]
+    matrix = vectors[order].astype(np.float16)
+    starts = np.searchsorted(assignment[order], np.arange(clusters + 1)).astype('<u4')
+
+    encoded = [word.encode('utf-8') for word in words]
+    word_offsets = np.zeros(len(words) + 1, dtype='<u4')
+    word_offsets[1:] = np.cumsum([len(word) for word in encoded])
+    hashes = np.array([zlib.crc32(word) for word in encoded], dtype='<u4')
+    by_hash = np.argsort(hashes, kind='stable').astype('<u4')
+
+    sections = [hashes[by_hash], by_hash, word_offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8),
+                matrix.astype('<f2'), centroids.astype('<f4'), starts]
+    offsets = []
+    position = _HEADER.size
+    for section in sections:
+        position = _align(position)
+        offsets.append(position)
+        position += section.nbytes
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(words), matrix.shape[1], clusters, *offsets))
+        for offset, section in zip(offsets, sections):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(section.tobytes())
+    os.replace(tmp_path, path)
+    return position
+
+
+class EmbeddingIndex:
+    """Read-only, memory-mapped word vectors with an inverted-file nearest-neighbour index"""
+
+    def __init__(self, path: str, nprobe: int = 4, memo_size: int = 4096):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(mmap, 'MADV_RANDOM'):
+            self._buffer.madvise(mmap.MADV_RANDOM)  # a query reads a few clusters; don't read ahead
+
+        header = _HEADER.unpack_from(self._buffer, 0)
+        if header[0] != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{path} is not an embedding index (expected {MAGIC!r})")
+        self.word_count, self.dimensions, self.cluster_count = header[1:4]
+        (hashes, rows, word_offsets, word_bytes, vectors, centroids, starts) = header[4:]
+        n, d, c = self.word_count, self.dimensions, self.cluster_count
+
+        def view(dtype, count, offset):
+            return np.frombuffer(self._buffer, dtype=dtype, count=count, offset=offset)
+
+        self._hashes = view('<u4', n, hashes)
+        self._rows = view('<u4', n, rows)
+        self._word_offsets = view('<u4', n + 1, word_offsets)
+        self._word_bytes = word_bytes
+        self.vectors = view('<f2', n * d, vectors).reshape(n, d)
+        self.centroids = view('<f4', c * d, centroids).reshape(c, d)
+        self._starts = view('<u4', c + 1, starts).tolist()
+        self.nprobe = max(1, min(nprobe, c))
+        self.neighbors = lru_cache(maxsize=memo_size)(self._neighbors)
+
+    def row(self, word: str) -> Optional[int]:
+        """Row of a word in the matrix, or None if it has no vector"""
+        key = word.encode('utf-8')
+        key_hash = zlib.crc32(key)
+        position = int(self._hashes.searchsorted(np.uint32(key_hash)))
+        while position < self.word_count and self._hashes[position] == key_hash:
+            row = int(self._rows[position])
+            if self._word_bytes_at(row) == key:
+                return row
+            position += 1
+        return None
+
+    def _word_bytes_at(self, row: int) -> bytes:
+        start = self._word_bytes + int(self._word_offsets[row])
+        return self._buffer[start:self._word_bytes + int(self._word_offsets[row + 1])]
+
+    def word(self, row: int) -> str:
+        return self._word_bytes_at(row).decode('utf-8')
+
+    def vector(self, word: str) -> Optional[np.ndarray]:
+        row = self.row(word)
+        return None if row is None else self.vectors[row].astype(np.float32)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(rows, cosine similarities) of about the ``k`` rows nearest a unit vector, best first"""
+        probes = np.argpartition(-(self.centroids @ query), self.nprobe - 1)[:self.nprobe]
+        ranges = [(self._starts[cluster], self._starts[cluster + 1]) for cluster in probes.tolist()]
+        rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+        scores = np.concatenate([self.vectors[start:end].astype(np.float32) @ query for start, end in ranges])
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        best = np.argsort(-scores, kind='stable')
+        return rows[best], scores[best]
+
+    def _neighbors(self, word: str, k: int = 3, min_similarity: float = 0.0) -> Tuple[str, ...]:
+        """Up to ``k`` words nearest to ``word`` (itself excluded), or () if it has no vector"""
+        row = self.row(word)
+        if row is None:
+            return ()
+        rows, scores = self.search(self.vectors[row].astype(np.float32), k + 1)
+        neighbors = []
+        for neighbor, score in zip(rows.tolist(), scores.tolist()):
+            if score < min_similarity or len(neighbors) == k:
+                break
+            if neighbor != row:
+                neighbors.append(self.word(neighbor))
+        return tuple(neighbors)
+
+    def __contains__(self, word: str) -> bool:
+        return self.row(word) is not None
+
+    def __len__(self) -> int:
+        return self.word_count
+
+    def close(self):
+        self.neighbors.cache_clear()
+        self.vectors = self.centroids = self._hashes = self._rows = self._word_offsets = None
+        self._buffer.close()
+
+
+def load_embedding_index(path: str, nprobe: int = 4, memo_size: int = 4096) -> Optional[EmbeddingIndex]:
+    """Open the embedding index if it has been built, otherwise return None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        index = EmbeddingIndex(path, nprobe, memo_size)
+        logger.info(f"Loaded embedding index with {len(index)} words "
+                    f"({index.dimensions} dimensions, {index.cluster_count} clusters) from {path}")
+        return index
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load embedding index {path}: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the word-vector index for keyword expansion")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="build the index from a GloVe/word2vec text file")
+    build.add_argument('output', nargs='?', default=os.path.join('data', 'embeddings.idx'))
+    build.add_argument('--vectors', required=True, help="word vectors, one word per line (.txt or .txt.gz)")
+    build.add_argument('--max-words', type=int, default=DEFAULT_MAX_WORDS)
+    build.add_argument('--clusters', type=int, default=None, help="default: about 4 * sqrt(words)")
+    build.add_argument('--iterations', type=int, default=10)
+    build.add_argument('--seed', type=int, default=0)
+
+    lookup = subparsers.add_parser('lookup', help="print the nearest neighbours of some words")
+    lookup.add_argument('index')
+    lookup.add_argument('words', nargs='+')
+    lookup.add_argument('-k', type=int, default=5)
+    lookup.add_argument('--nprobe', type=int, default=4)
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        words, vectors = read_vectors(args.vectors, args.max_words)
+        size = write_index(words, vectors, args.output, args.clusters, args.iterations, args.seed)
+        print(f"Indexed {len(words)} words ({vectors.shape[1]} dimensions) into {args.output} "
+              f"({size / 1024 / 1024:.1f} MiB, {time.perf_counter() - started:.1f}s)")
+    else:
+        index = EmbeddingIndex(args.index, args.nprobe)
+        for word in args.words:
+            print(f"{word}: {', '.join(index.neighbors(word, args.k)) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""
+Fast path for keyword extraction: a regex tokenizer and a precomputed lemma table.
+
+``word_tokenize`` runs the Punkt sentence splitter and then about thirty
+Treebank regex substitutions per sentence, and ``WordNetLemmatizer`` walks
+WordNet's morphology for every token.  Keyword extraction only keeps
+alphabetic tokens of short, lower-cased descriptions, which needs much less:
+
+* ``tokenize`` reproduces the Treebank rules that decide which alphabetic
+  tokens come out - separator punctuation, ``,``/``:`` not followed by a
+  digit, a sentence-final period, and the ``'s``/``n't``/... clitics - in a few
+  compiled regex passes.  Text that depends on Punkt's sentence boundaries or
+  on rarer rules (periods inside the text, ``''`` quotes, ``--``, ``gonna`` and
+  similar contractions, non-ASCII characters) returns None, and the caller
+  falls back to NLTK.
+* ``LemmaTable`` maps every word the noun lemmatizer changes to its lemma.  A
+  word's lemma differs from the word only if the word is in WordNet's noun
+  exception list or one of the noun suffix rules (``-s``, ``-ies``, ``-men``,
+  ...) turns it into a WordNet noun, so applying those rules in reverse to every
+  WordNet noun (twice, as morphy may apply them twice) finds all such words;
+  every other word is its own lemma.  The table is built offline:
+
+      python fast_nlp.py build data/lemmas.idx
+
+  and stored in the synonym index's memory-mapped format, so all workers
+  share one copy and WordNet never has to be loaded for lemmatization.
+
+``python -m benchmarks.check_tokenizer_parity`` checks that both paths give
+the same keywords on a large generated corpus.
+"""
+
+import argparse
+import logging
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from synonym_index import SynonymIndex, write_index
+
+logger = logging.getLogger(__name__)
+
+LEMMA_MAGIC = b'BNLEM001'
+
+# Characters the fast path understands; anything else goes to NLTK
+_SUPPORTED = re.compile(r"[a-z0-9\s,.!?;:'\"()\[\]{}<>&*@#$%/+=\\^_|~-]*\Z")
+
+# Input where Punkt's sentence boundaries or rarer Treebank rules matter.  Each
+# pattern only runs if a character it needs is present; most text has none
+_LOOSE_PERIOD = re.compile(r"\.(?![a-z0-9])(?![\])}>\"']*\s*\Z)")  # may end a sentence mid-text
+_DOUBLE_COMMA_COLON = re.compile(r"[,:][,:]")
+_RARE_QUOTES = re.compile(r"''|'t(?:is|was)\b|'(?![mtsdn])\w\b")  # "'x" splits into "'" and "x"
+_RARE_CONTRACTIONS = re.compile(r"\b(?:cannot|d'ye|gimme|gonna|gotta|lemme|more'n|wanna)\b")
+
+
+def _needs_nltk(text: str) -> bool:
+    return bool(
+        not _SUPPORTED.match(text)
+        or '--' in text
+        or ('.' in text and _LOOSE_PERIOD.search(text))
+        or ((',' in text or ':' in text) and _DOUBLE_COMMA_COLON.search(text))
+        or ("'" in text and _RARE_QUOTES.search(text))
+        or (("'" in text or 'nn' in text or 'mm' in text or 'tt' in text) and _RARE_CONTRACTIONS.search(text))
+    )
+
+
+# Treebank's separators: the period that ends the text, ',' and ':' unless a
+# digit follows, and ;@#$%&?!*()[]{}<>".  Its "x' " quote rule runs after the
+# first group and before the second, which matters when the text has quotes
+_FINAL_PERIOD = re.compile(r"(?<!\.)\.(?=[\])}>\"']*\s*\Z)")
+_SEPARATORS = re.compile(r"[;@#$%&?!*()\[\]{}<>\"]|[,:](?!\d)")
+_BEFORE_QUOTE = re.compile(r"[;@#$%&?!]|[,:](?!\d)")
+_AFTER_QUOTE = re.compile(r"[*()\[\]{}<>\"]")
+
+# Treebank's quote and clitic splits, in its order ("we'll'" -> "we 'll '")
+_QUOTE = re.compile(r"([^'])' ")
+_CLITICS_1 = re.compile(r"([^' ])('[smd]|') ")
+_CLITICS_2 = re.compile(r"([^' ])('ll|'re|'ve|n't) ")
+
+
+def tokenize(text: str) -> Optional[List[str]]:
+    """``word_tokenize(text)`` as far as alphabetic tokens go, or None if NLTK is needed.
+
+    ``text`` must already be lower-cased.  Non-alphabetic tokens may differ
+    from NLTK's (e.g. quotes aren't converted), so callers keep only
+    ``isalpha()`` tokens.
+    """
+    if _needs_nltk(text):
+        return None
+    if '.' in text:
+        text = _FINAL_PERIOD.sub(' ', text)
+    if "'" not in text:
+        return _SEPARATORS.sub(' ', text).split()
+    text = _QUOTE.sub(r"\1 ' ", _BEFORE_QUOTE.sub(' ', text))
+    text = ' ' + _AFTER_QUOTE.sub(' ', text) + ' '
+    return _CLITICS_2.sub(r'\1 \2 ', _CLITICS_1.sub(r'\1 \2 ', text)).split()
+
+
+# --- lemma table -------------------------------------------------------------------
+
+def collect_lemma_entries(extra_words: Iterable[str] = ()) -> Dict[str, str]:
+    """Every word the WordNet noun lemmatizer maps to a different word"""
+    from nltk.corpus import wordnet
+    from nltk.stem import WordNetLemmatizer
+
+    substitutions = wordnet.MORPHOLOGICAL_SUBSTITUTIONS[wordnet.NOUN]
+
+    def unapply(words):
+        return {word[:len(word) - len(new)] + old
+                for word in words for old, new in substitutions if word.endswith(new)}
+
+    nouns = {name for name in wordnet.all_lemma_names(pos=wordnet.NOUN) if name.isalpha()}
+    once = unapply(nouns)
+    candidates = nouns | once | unapply(once) | set(wordnet._exception_map[wordnet.NOUN])
+    candidates.update(word.strip().lower() for word in extra_words)
+
+    lemmatizer = WordNetLemmatizer()
+    entries = {}
+    for word in sorted(candidates):
+        if word.isalpha():
+            lemma = lemmatizer.lemmatize(word)
+            if lemma != word:
+                entries[word] = lemma
+    return entries
+
+
+class LemmaTable:
+    """Read-only, memory-mapped word -> lemma table; words not in it are their own lemma.
+
+    Lookups go through a bounded in-process memo, so frequent words skip the
+    hash probe into the mapped file.
+    """
+
+    def __init__(self, path: str, memo_size: int = 4096):
+        self.index = SynonymIndex(path, magic=LEMMA_MAGIC)
+        self.lemma = lru_cache(maxsize=memo_size)(self._lookup)
+
+    def _lookup(self, word: str) -> str:
+        lemmas = self.index.get(word)
+        return lemmas[0] if lemmas else word
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def close(self):
+        self.index.close()
+
+
+def load_lemma_table(path: str, memo_size: int = 4096) -> Optional[LemmaTable]:
+    """Open the lemma table if it has been built, otherwise return None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        table = LemmaTable(path, memo_size)
+        logger.info(f"Loaded lemma table with {len(table)} entries from {path}")
+        return table
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load lemma table {path}: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the lemma table for the fast keyword path")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="build the table from the NLTK WordNet corpus")
+    build.add_argument('output', nargs='?', default=os.path.join('data', 'lemmas.idx'))
+    build.add_argument('--vocabulary', help="extra words to check, one per line")
+
+    lookup = subparsers.add_parser('lookup', help="print the lemmas stored for some words")
+    lookup.add_argument('table')
+    lookup.add_argument('words', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        extra_words = []
+        if args.vocabulary:
+            with open(args.vocabulary, encoding='utf-8') as f:
+                extra_words = f.read().split()
+
+        started = time.perf_counter()
+        entries = collect_lemma_entries(extra_words)
+        size = write_index({word: [lemma] for word, lemma in entries.items()}, args.output, LEMMA_MAGIC)
+        print(f"Stored {len(entries)} lemmas in {args.output} "
+              f"({size / 1024:.0f} KiB, {time.perf_counter() - started:.1f}s)")
+    else:
+        table = LemmaTable(args.table)
+        for word in args.words:
+            print(f"{word}: {table.lemma(word)}")
+
+
+if __name__ == '__main__':
+    main()
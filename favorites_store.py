@@ -0,0 +1,267 @@
+"""
+Persistent favorites store on SQLite (WAL mode).
+
+Favorites are keyed by an opaque ``user_id`` the browser generates once and
+keeps in localStorage, so a user's favorites survive reloads and can be synced
+to other devices, and saves from every user feed a name popularity table that
+generation can learn from.
+
+Layout and access paths:
+
+* ``favorites`` has a unique index on (user_id, name_key) for de-duplication
+  and deletes, and one on (user_id, id) so listing a user's favorites is a
+  keyset-paginated index range scan (``id < cursor ORDER BY id DESC``), the
+  same cost on page 1 and page 10,000, however many rows the table holds.
+* ``name_popularity`` holds a save count per lower-cased name.  Triggers on
+  ``favorites`` keep it up to date in the same transaction as each insert or
+  delete, so reading the most popular names is an index scan, never an
+  aggregate over the favorites table.
+* Writes go through a single writer thread per process that groups whatever
+  requests are waiting (up to FAVORITES_BATCH_SIZE operations) into one
+  transaction; callers block until their batch has committed, so a save is
+  durable and visible to the next read when the request returns.
+
+WAL mode lets readers in every worker run alongside that writer; writers in
+different workers wait for each other through SQLite's busy timeout.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_NAME_LENGTH = 100
+MAX_TAGLINE_LENGTH = 200
+MAX_USER_ID_LENGTH = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS favorites (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    tagline TEXT,
+    created_at REAL NOT NULL,
+    tone TEXT,
+    industry TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS favorites_user_name ON favorites (user_id, name_key);
+CREATE INDEX IF NOT EXISTS favorites_user_recent ON favorites (user_id, id);
+
+CREATE TABLE IF NOT EXISTS name_popularity (
+    name_key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    saves INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS name_popularity_saves ON name_popularity (saves DESC, name_key);
+
+CREATE TRIGGER IF NOT EXISTS favorites_count_insert AFTER INSERT ON favorites BEGIN
+    INSERT INTO name_popularity (name_key, name, saves) VALUES (NEW.name_key, NEW.name, 1)
+    ON CONFLICT (name_key) DO UPDATE SET saves = saves + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS favorites_count_delete AFTER DELETE ON favorites BEGIN
+    UPDATE name_popularity SET saves = saves - 1 WHERE name_key = OLD.name_key;
+    DELETE FROM name_popularity WHERE name_key = OLD.name_key AND saves <= 0;
+END;
+"""
+
+
+def name_key(name: str) -> str:
+    """Case- and whitespace-insensitive identity of a name"""
+    return ' '.join(name.lower().split())
+
+
+class FavoritesStore:
+    """Favorites and name popularity in one SQLite database file"""
+
+    def __init__(self, path: str, batch_size: int = 256, batch_wait: float = 0.002,
+                 busy_timeout: float = 5.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._queue: 'queue.Queue[Tuple[str, tuple, Future]]' = queue.Queue()
+        self._writer_pid = None
+        self._writer_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connect()
+        try:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            self._migrate(connection)
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection):
+        """Add columns introduced after a database was created"""
+        columns = {row[1] for row in connection.execute('PRAGMA table_info(favorites)')}
+        for column in ('tone', 'industry'):  # generation context, for ranking.py
+            if column not in columns:
+                connection.execute(f'ALTER TABLE favorites ADD COLUMN {column} TEXT')
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                     check_same_thread=False)
+        # With WAL, NORMAL survives process crashes; only power loss can drop the latest commits
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    @property
+    def _reader(self) -> sqlite3.Connection:
+        """One read connection per thread (and per process: never used across fork)"""
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            self._local.connection = self._connect()
+            self._local.pid = pid
+        return self._local.connection
+
+    # --- writes ------------------------------------------------------------------
+
+    def _submit(self, operation: str, args: tuple, timeout: Optional[float] = 10.0):
+        if self._writer_pid != os.getpid():  # the writer thread doesn't survive fork
+            with self._writer_lock:
+                if self._writer_pid != os.getpid():
+                    self._queue = queue.Queue()
+                    threading.Thread(target=self._write_loop, name='favorites-writer', daemon=True).start()
+                    self._writer_pid = os.getpid()
+        future = Future()
+        self._queue.put((operation, args, future))
+        return future.result(timeout)
+
+    def _write_loop(self):
+        connection = self._connect()
+        pending = self._queue
+        while True:
+            batch = [pending.get()]
+            # Let concurrent requests join the batch, then commit them together
+            deadline = time.monotonic() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(pending.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            self._write_batch(connection, batch)
+
+    def _write_batch(self, connection: sqlite3.Connection, batch):
+        """Commit a batch in one transaction; a failing operation only fails its own caller"""
+        outcomes = []
+        try:
+            connection.execute('BEGIN IMMEDIATE')
+            for operation, args, _ in batch:
+                connection.execute('SAVEPOINT operation')
+                try:
+                    outcomes.append((True, getattr(self, f'_{operation}')(connection, *args)))
+                except sqlite3.Error as e:
+                    connection.execute('ROLLBACK TO operation')
+                    outcomes.append((False, e))
+                connection.execute('RELEASE operation')
+            connection.execute('COMMIT')
+        except Exception as e:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            logger.error(f"Favorites batch of {len(batch)} operations failed: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, _, future), (ok, result) in zip(batch, outcomes):
+            if ok:
+                future.set_result(result)
+            else:
+                future.set_exception(result)
+
+    @staticmethod
+    def _add(connection: sqlite3.Connection, user_id: str, favorites: Sequence[Tuple[str, Optional[str]]],
+             tone: Optional[str], industry: Optional[str]) -> int:
+        now = time.time()
+        cursor = connection.executemany(
+            'INSERT INTO favorites (user_id, name, name_key, tagline, created_at, tone, industry) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (user_id, name_key) DO NOTHING',
+            [(user_id, name, name_key(name), tagline, now, tone, industry) for name, tagline in favorites]
+        )
+        return cursor.rowcount  # rows inserted; trigger changes aren't counted
+
+    @staticmethod
+    def _remove(connection: sqlite3.Connection, user_id: str, names: Sequence[str]) -> int:
+        removed = 0
+        for name in names:
+            cursor = connection.execute('DELETE FROM favorites WHERE user_id = ? AND name_key = ?',
+                                        (user_id, name_key(name)))
+            removed += cursor.rowcount
+        return removed
+
+    def add(self, user_id: str, favorites: Sequence[Tuple[str, Optional[str]]],
+            tone: Optional[str] = None, industry: Optional[str] = None) -> int:
+        """Save (name, tagline) pairs for a user; returns how many were new.
+
+        ``tone`` and ``industry`` record what the names were generated for, when known.
+        """
+        return self._submit('add', (user_id, list(favorites), tone, industry))
+
+    def remove(self, user_id: str, names: Sequence[str]) -> int:
+        """Delete a user's favorites by name; returns how many existed"""
+        return self._submit('remove', (user_id, list(names)))
+
+    # --- reads -------------------------------------------------------------------
+
+    def page(self, user_id: str, limit: int = 50,
+             before_id: Optional[int] = None) -> Tuple[List[Dict], Optional[int]]:
+        """A page of a user's favorites, newest first, and the cursor for the next page"""
+        if before_id is None:
+            rows = self._reader.execute(
+                'SELECT id, name, tagline, created_at FROM favorites WHERE user_id = ? '
+                'ORDER BY id DESC LIMIT ?', (user_id, limit + 1)
+            ).fetchall()
+        else:
+            rows = self._reader.execute(
+                'SELECT id, name, tagline, created_at FROM favorites WHERE user_id = ? AND id < ? '
+                'ORDER BY id DESC LIMIT ?', (user_id, before_id, limit + 1)
+            ).fetchall()
+        page = [{'id': row[0], 'name': row[1], 'tagline': row[2], 'created_at': row[3]} for row in rows[:limit]]
+        next_cursor = page[-1]['id'] if len(rows) > limit else None
+        return page, next_cursor
+
+    def popular(self, limit: int = 20) -> List[Dict]:
+        """Most-saved names across all users"""
+        rows = self._reader.execute(
+            'SELECT name, saves FROM name_popularity ORDER BY saves DESC, name_key LIMIT ?', (limit,)
+        ).fetchall()
+        return [{'name': name, 'saves': saves} for name, saves in rows]
+
+    def popularity(self, names: Iterable[str]) -> Dict[str, int]:
+        """Save counts for specific names (0 if never saved)"""
+        keys = {name: name_key(name) for name in names}
+        if not keys:
+            return {}
+        unique_keys = list(set(keys.values()))
+        counts = {}
+        for start in range(0, len(unique_keys), 500):  # stay under SQLite's bound-parameter limit
+            chunk = unique_keys[start:start + 500]
+            counts.update(self._reader.execute(
+                f"SELECT name_key, saves FROM name_popularity WHERE name_key IN ({','.join('?' * len(chunk))})",
+                chunk
+            ).fetchall())
+        return {name: counts.get(key, 0) for name, key in keys.items()}
+
+
+def load_favorites_store(path: str, **options) -> Optional[FavoritesStore]:
+    """Open (creating if needed) the favorites database, or None if that fails"""
+    if not path:
+        return None
+    try:
+        store = FavoritesStore(path, **options)
+        logger.info(f"Favorites store at {path}")
+        return store
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Favorites store unavailable ({path}): {e}")
+        return None
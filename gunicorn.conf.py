@@ -0,0 +1,91 @@
+"""
+Gunicorn settings.
+
+The app is imported once in the master (preload) and warmed up before any
+worker is forked, so NLTK stopwords, the tokenizer and WordNet are loaded a
+single time and shared copy-on-write by every worker.  Set GUNICORN_PRELOAD=false
+to fall back to lazy per-worker loading.
+
+With HF_INFERENCE_POOL=true the master also starts the shared GPT-2 inference
+server (inference_pool.py), so workers don't each load their own model.
+
+Workers share /metrics through snapshot files in METRICS_DIR (see metrics.py),
+and coalesce identical in-flight /generate requests through lock files in
+COALESCE_DIR (see singleflight.py); unless they are set, a fresh directory is
+created for each server run.  Likewise, without CURSOR_SECRET every worker signs
+"generate more" cursors (see cursors.py) with a key made for this server run,
+and without HF_INFERENCE_AUTHKEY the inference server and the workers share a
+key made for this server run -- but only on a unix socket: a TCP
+HF_INFERENCE_ADDRESS needs the key set explicitly.
+"""
+
+import gc
+import os
+import secrets
+import shutil
+import subprocess
+import sys
+import tempfile
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+inference_pool = os.getenv('HF_INFERENCE_POOL', 'false').lower() in ('1', 'true', 'yes')
+
+_inference_server = None
+
+# Set while the config is loaded, i.e. before the app (and metrics.py) is imported,
+# so the master and every worker agree on it
+_metrics_dir_created = not os.getenv('METRICS_DIR')
+if _metrics_dir_created:
+    os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='business-name-generator-metrics-')
+_coalesce_dir_created = not os.getenv('COALESCE_DIR')
+if _coalesce_dir_created:
+    os.environ['COALESCE_DIR'] = tempfile.mkdtemp(prefix='business-name-generator-coalesce-')
+if not os.getenv('CURSOR_SECRET'):
+    os.environ['CURSOR_SECRET'] = secrets.token_hex(32)
+if inference_pool and not os.getenv('HF_INFERENCE_AUTHKEY'):
+    from inference_pool import parse_address
+    if isinstance(parse_address(os.getenv('HF_INFERENCE_ADDRESS', '')), str):
+        os.environ['HF_INFERENCE_AUTHKEY'] = secrets.token_hex(32)
+
+
+def on_starting(server):
+    """Runs in the master before the app is loaded"""
+    global _inference_server
+    if not _metrics_dir_created:
+        import metrics
+        metrics.clear_directory(os.environ['METRICS_DIR'])  # counts from a previous run
+
+    if inference_pool:
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'inference_pool.py')
+        _inference_server = subprocess.Popen([sys.executable, script])
+        server.log.info(f"Started GPT-2 inference server (pid {_inference_server.pid})")
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before workers are forked"""
+    if not preload_app:
+        return
+
+    import app
+
+    timings = app.warmup()
+    server.log.info("NLTK warm-up: " + ", ".join(f"{k}={v:.3f}s" for k, v in timings.items()))
+
+    # Keep the warmed-up objects out of the collector so workers don't dirty their pages
+    gc.freeze()
+
+
+def worker_exit(server, worker):
+    """Write the worker's final metrics snapshot so its counts outlive it"""
+    import metrics
+    metrics.flush()
+
+
+def on_exit(server):
+    if _inference_server is not None:
+        _inference_server.terminate()
+        _inference_server.wait(timeout=10)
+    if _metrics_dir_created:
+        shutil.rmtree(os.environ['METRICS_DIR'], ignore_errors=True)
+    if _coalesce_dir_created:
+        shutil.rmtree(os.environ['COALESCE_DIR'], ignore_errors=True)
@@ -0,0 +1,288 @@
+"""
+Shared GPT-2 inference processes.
+
+Instead of every gunicorn worker loading its own copy of GPT-2 and sampling
+inside the request thread, one server process owns a small pool of inference
+processes (HF_INFERENCE_WORKERS, default 1).  Each of them loads the model
+lazily on its first job, so memory stays constant however many web workers
+there are.  Web workers talk to the server over a local socket with
+InferenceClient; jobs have a timeout and the server rejects work beyond
+HF_INFERENCE_MAX_QUEUE outstanding jobs, so requests fall back to rule-based
+names instead of piling up behind slow inference.
+
+gunicorn.conf.py starts the server when HF_INFERENCE_POOL=true; it can also
+run on its own:
+
+    HF_INFERENCE_AUTHKEY=... python inference_pool.py --workers 2
+
+Messages on the socket are pickled, so anyone who can connect with the key can
+run code in the server.  There is no default key: it comes from
+HF_INFERENCE_AUTHKEY, which gunicorn.conf.py sets to a random value for each
+server run when it is unset.  The default socket lives in a directory only
+this user can enter, and a TCP address (host:port) is only used with a key
+that was configured explicitly.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import stat
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Unix socket path or host:port; unset means gpt2.sock in runtime_dir()
+INFERENCE_ADDRESS = os.getenv('HF_INFERENCE_ADDRESS')
+INFERENCE_WORKERS = int(os.getenv('HF_INFERENCE_WORKERS', 1))
+INFERENCE_MAX_QUEUE = int(os.getenv('HF_INFERENCE_MAX_QUEUE', 8))
+INFERENCE_TIMEOUT = float(os.getenv('HF_INFERENCE_TIMEOUT', 20))
+
+
+def parse_address(address: str):
+    """'host:port' means TCP, anything else is a unix socket path"""
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit() and '/' not in address:
+        return host, int(port)
+    return address
+
+
+def runtime_dir() -> str:
+    """This user's private (0700) directory for the default socket"""
+    base = os.getenv('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    path = os.path.join(base, f'business-name-generator-{os.getuid()}')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # Refuse a directory someone else made (or opened up) in a shared /tmp
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory private to this user")
+    return path
+
+
+def resolve_address(address: Optional[str] = None):
+    """The socket address to use: address, HF_INFERENCE_ADDRESS or the private default"""
+    return parse_address(address or INFERENCE_ADDRESS or os.path.join(runtime_dir(), 'gpt2.sock'))
+
+
+def configured_authkey() -> Optional[bytes]:
+    """HF_INFERENCE_AUTHKEY, read on use: gunicorn.conf.py may set it after this module is imported"""
+    return os.getenv('HF_INFERENCE_AUTHKEY', '').encode() or None
+
+
+def check_authkey(authkey: Optional[bytes]) -> bytes:
+    """authkey, or ValueError when no key was configured (there is deliberately no default)"""
+    if not authkey:
+        raise ValueError("HF_INFERENCE_AUTHKEY is not set; the inference socket needs a secret key "
+                         "(gunicorn.conf.py generates one for the default unix socket)")
+    return authkey
+
+
+# --- inference processes -------------------------------------------------------
+
+_worker_generator = None
+
+
+def _generate_names(keywords: List[str], count: int, batched: Optional[bool]):
+    """Runs inside a pool process; the model is loaded on the first job"""
+    global _worker_generator
+    if _worker_generator is None:
+        from ai_generator import AINameGenerator
+        _worker_generator = AINameGenerator(use_inference_pool=False)
+
+    started = time.perf_counter()
+    names = _worker_generator.generate_huggingface_names(keywords, 'professional', count, batched=batched)
+    return names, time.perf_counter() - started
+
+
+# --- server --------------------------------------------------------------------
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(int(fraction * len(ordered)), len(ordered) - 1)], 4)
+
+
+class InferenceServer:
+    """Accepts jobs over a socket and runs them on a process pool"""
+
+    def __init__(self, address: Optional[str] = None, workers: int = INFERENCE_WORKERS,
+                 max_queue: int = INFERENCE_MAX_QUEUE, authkey: Optional[bytes] = None):
+        self.address = resolve_address(address)
+        self.workers = workers
+        self.max_queue = max_queue
+        self.authkey = check_authkey(authkey or configured_authkey())
+        # spawn, so inference processes don't inherit the server's threads and sockets
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.latencies = deque(maxlen=1024)
+        self.inference_times = deque(maxlen=1024)
+        self._lock = threading.Lock()
+
+    def serve_forever(self):
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logger.info(f"Inference server listening on {listener.address} with {self.workers} worker(s)")
+            while True:
+                try:
+                    connection = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as e:
+                    logger.warning(f"Rejected inference connection: {e}")
+                    continue
+                threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _handle(self, connection):
+        with connection:
+            try:
+                request = connection.recv()
+            except (EOFError, OSError):
+                return
+
+            if request.get('op') == 'stats':
+                response = self.stats()
+            else:
+                response = self._generate(request)
+
+            try:
+                connection.send(response)
+            except (BrokenPipeError, OSError):
+                pass  # the client gave up waiting
+
+    def _generate(self, request: Dict) -> Dict:
+        with self._lock:
+            if self.pending >= self.max_queue:
+                self.rejected += 1
+                return {'error': 'busy'}
+            self.pending += 1
+
+        started = time.perf_counter()
+        try:
+            future = self.executor.submit(_generate_names, request['keywords'], request['count'],
+                                          request.get('batched'))
+        except Exception as e:
+            with self._lock:
+                self.pending -= 1
+                self.failed += 1
+            return {'error': str(e)}
+        future.add_done_callback(lambda f: self._finished(f, started))
+
+        try:
+            names, _ = future.result(timeout=request.get('timeout', INFERENCE_TIMEOUT))
+            return {'names': names}
+        except TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            return {'error': 'timeout'}
+        except Exception as e:
+            return {'error': str(e)}
+
+    def _finished(self, future, started: float):
+        with self._lock:
+            self.pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+                return
+            self.completed += 1
+            self.latencies.append(time.perf_counter() - started)
+            self.inference_times.append(future.result()[1])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            latencies = list(self.latencies)
+            inference_times = list(self.inference_times)
+            return {
+                'workers': self.workers,
+                'max_queue': self.max_queue,
+                'running': min(self.pending, self.workers),
+                'queued': max(self.pending - self.workers, 0),
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'latency_p50': _percentile(latencies, 0.5),
+                'latency_p95': _percentile(latencies, 0.95),
+                'inference_p50': _percentile(inference_times, 0.5),
+                'inference_p95': _percentile(inference_times, 0.95)
+            }
+
+
+# --- client --------------------------------------------------------------------
+
+class InferenceClient:
+    """Used by web workers to submit GPT-2 jobs to the inference server"""
+
+    def __init__(self, address: Optional[str] = None, authkey: Optional[bytes] = None,
+                 timeout: float = INFERENCE_TIMEOUT):
+        self.address = resolve_address(address)
+        self.authkey = authkey or configured_authkey()
+        self.timeout = timeout
+        if not self.authkey:
+            logger.error("HF_INFERENCE_AUTHKEY is not set; GPT-2 names fall back to rule-based generation")
+
+    def _call(self, request: Dict, timeout: float) -> Dict:
+        if not self.authkey:
+            raise AuthenticationError("HF_INFERENCE_AUTHKEY is not set")
+        connection = Client(self.address, authkey=self.authkey)
+        try:
+            connection.send(request)
+            if not connection.poll(timeout):
+                raise TimeoutError(f"no response within {timeout}s")
+            return connection.recv()
+        finally:
+            connection.close()
+
+    def generate_names(self, keywords: List[str], count: int, batched: Optional[bool] = None,
+                       timeout: Optional[float] = None) -> List[str]:
+        """Names from the shared GPT-2 pool, or [] if it is busy, slow or unreachable"""
+        timeout = timeout or self.timeout
+        request = {'op': 'generate', 'keywords': list(keywords), 'count': count,
+                   'batched': batched, 'timeout': timeout}
+        try:
+            response = self._call(request, timeout + 1)
+        except (OSError, EOFError, TimeoutError, AuthenticationError) as e:
+            logger.warning(f"Inference server unavailable: {e}")
+            return []
+
+        if 'error' in response:
+            logger.warning(f"Inference job failed: {response['error']}")
+            return []
+        return response['names']
+
+    def stats(self) -> Optional[Dict]:
+        try:
+            return self._call({'op': 'stats'}, 2)
+        except (OSError, EOFError, TimeoutError, AuthenticationError):
+            return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the shared GPT-2 inference server")
+    parser.add_argument('--address', default=INFERENCE_ADDRESS,
+                        help="unix socket path or host:port (default: gpt2.sock in a private runtime directory)")
+    parser.add_argument('--workers', type=int, default=INFERENCE_WORKERS, help="inference processes")
+    parser.add_argument('--max-queue', type=int, default=INFERENCE_MAX_QUEUE, help="outstanding jobs before rejecting")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        server = InferenceServer(args.address, args.workers, args.max_queue)
+    except (ValueError, PermissionError) as e:
+        parser.error(str(e))
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+Per-stage latency histograms for /generate, exported in Prometheus text format.
+
+Stages are timed with ``timed``, as a decorator or a ``with`` block:
+
+    @timed('extract_keywords')
+    def extract_keywords(self, text): ...
+
+Timings are collected into the current request's ``StageTimer`` (a context
+variable, so it follows the request through threads started with
+``contextvars.copy_context`` and through asyncio tasks) and observed into the
+histograms when the request finishes, labelled with its tone, industry and
+generation method.  A streamed response finishes when its body does:
+``timed_iterator`` makes the timer current while each item is produced and
+records the request once the stream is exhausted or closed.  Outside a
+request, ``timed`` only costs a context lookup.
+Counters (e.g. coalesced requests) are incremented directly.
+
+Each worker process keeps its own histograms.  When METRICS_DIR is set (the
+gunicorn config sets it for you), every worker also writes a snapshot to
+``METRICS_DIR/<pid>.json`` about once a second, and ``render`` sums the
+snapshots of all workers, including ones that have exited, so the counts
+exposed on /metrics never go backwards.
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+METRICS_DIR = os.getenv('METRICS_DIR') or None
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
+
+# Seconds; stages range from microseconds (cached lookups) to tens of seconds (OpenAI)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LABELS = ('tone', 'industry', 'method')
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram with a fixed label set"""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}  # labels -> [bucket counts..., +Inf], sum
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            series = [[list(labels), list(counts), total] for labels, (counts, total) in self._series.items()]
+        return {'labels': list(self.label_names), 'buckets': list(self.buckets), 'series': series}
+
+
+class Counter:
+    """Monotonic Prometheus-style counter with a fixed label set"""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._series: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple[str, ...], amount: float = 1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+        _mark_dirty()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            series = [[list(labels), value] for labels, value in self._series.items()]
+        return {'labels': list(self.label_names), 'series': series}
+
+
+STAGE_SECONDS = Histogram('business_names_stage_seconds',
+                          'Time spent in each stage of a /generate request',
+                          ('stage',) + REQUEST_LABELS)
+REQUEST_SECONDS = Histogram('business_names_request_seconds',
+                            'Total /generate request time',
+                            REQUEST_LABELS)
+HISTOGRAMS = (STAGE_SECONDS, REQUEST_SECONDS)
+
+COALESCED_REQUESTS = Counter('business_names_coalesced_requests_total',
+                             'Requests answered with the result of an identical request already in progress, '
+                             'in this worker (process) or another one (host)',
+                             ('scope',))
+COUNTERS = (COALESCED_REQUESTS,)
+
+
+class StageTimer:
+    """Stage durations and labels of one request"""
+
+    def __init__(self, **labels: str):
+        self.labels = {'tone': 'unknown', 'industry': 'unknown', 'method': 'unknown', **labels}
+        self.stages: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self.total: Optional[float] = None
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def header_value(self) -> str:
+        """Server-Timing style breakdown, e.g. ``extract_keywords;dur=1.52, total;dur=3.10``"""
+        total = self.total if self.total is not None else time.perf_counter() - self.started
+        parts = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in self.stages.items()]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ', '.join(parts)
+
+
+_current_timer: ContextVar[Optional[StageTimer]] = ContextVar('stage_timer', default=None)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """Add the block's (or decorated function's) duration to the current request"""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(stage, time.perf_counter() - started)
+
+
+def set_labels(**labels: str):
+    """Label the current request (e.g. once its industry is known)"""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.labels.update(labels)
+
+
+@contextmanager
+def current_timer(timer: StageTimer) -> Iterator[StageTimer]:
+    """Collect the block's stage timings into timer"""
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _current_timer.reset(token)
+
+
+@contextmanager
+def request_timer(**labels: str) -> Iterator[StageTimer]:
+    """Collect stage timings for one request and record them if it completes"""
+    timer = StageTimer(**labels)
+    with current_timer(timer):
+        yield timer
+    finish(timer)
+
+
+def timed_iterator(items: Iterable[T], timer: StageTimer) -> Iterator[T]:
+    """items, each produced within timer; the request is recorded when they run out or are closed.
+
+    For streamed responses, whose work happens while the body is iterated,
+    after the view has returned.
+    """
+    iterator = iter(items)
+    try:
+        while True:
+            with current_timer(timer):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        finish(timer)
+
+
+def finish(timer: StageTimer):
+    """Stop timer's clock and record its request"""
+    timer.total = time.perf_counter() - timer.started
+    record(timer)
+
+
+def record(timer: StageTimer):
+    labels = tuple(timer.labels[name] for name in REQUEST_LABELS)
+    for stage, seconds in timer.stages.items():
+        STAGE_SECONDS.observe((stage,) + labels, seconds)
+    REQUEST_SECONDS.observe(labels, timer.total)
+    _mark_dirty()
+
+
+# --- sharing between worker processes --------------------------------------------
+
+_dirty = threading.Event()
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def snapshot() -> Dict:
+    return {'pid': os.getpid(), 'histograms': {h.name: h.snapshot() for h in HISTOGRAMS},
+            'counters': {c.name: c.snapshot() for c in COUNTERS}}
+
+
+def flush():
+    """Write this process's snapshot to METRICS_DIR (atomically)"""
+    if not METRICS_DIR:
+        return
+    _dirty.clear()
+    path = os.path.join(METRICS_DIR, f'{os.getpid()}.json')
+    tmp_path = f'{path}.tmp'
+    try:
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(snapshot(), f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write metrics snapshot {path}: {e}")
+
+
+def _flush_loop():
+    while True:
+        _dirty.wait()
+        time.sleep(METRICS_FLUSH_INTERVAL)  # coalesce a second's worth of requests into one write
+        flush()
+
+
+def _mark_dirty():
+    global _flusher_pid
+    if not METRICS_DIR:
+        return
+    _dirty.set()
+    if _flusher_pid != os.getpid():  # threads don't survive fork: one flusher per worker
+        with _flusher_lock:
+            if _flusher_pid != os.getpid():
+                threading.Thread(target=_flush_loop, name='metrics-flush', daemon=True).start()
+                atexit.register(flush)
+                _flusher_pid = os.getpid()
+
+
+def clear_directory(directory: str):
+    """Remove snapshots left by a previous server run (called by the gunicorn master)"""
+    os.makedirs(directory, exist_ok=True)
+    for filename in os.listdir(directory):
+        if filename.endswith('.json') or filename.endswith('.tmp'):
+            os.remove(os.path.join(directory, filename))
+
+
+def _worker_snapshots() -> List[Dict]:
+    snapshots = [snapshot()]
+    if not METRICS_DIR or not os.path.isdir(METRICS_DIR):
+        return snapshots
+    own_file = f'{os.getpid()}.json'
+    for filename in os.listdir(METRICS_DIR):
+        if not filename.endswith('.json') or filename == own_file:
+            continue
+        try:
+            with open(os.path.join(METRICS_DIR, filename)) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping unreadable metrics snapshot {filename}: {e}")
+    return snapshots
+
+
+def _merge(snapshots: List[Dict]) -> Dict[str, Dict[Tuple[str, ...], list]]:
+    merged = {h.name: {} for h in HISTOGRAMS}
+    for worker in snapshots:
+        for name, data in worker.get('histograms', {}).items():
+            if name not in merged:
+                continue
+            for labels, counts, total in data['series']:
+                series = merged[name].setdefault(tuple(labels), [[0] * len(counts), 0.0])
+                series[0] = [a + b for a, b in zip(series[0], counts)]
+                series[1] += total
+    return merged
+
+
+def _merge_counters(snapshots: List[Dict]) -> Dict[str, Dict[Tuple[str, ...], float]]:
+    merged = {c.name: {} for c in COUNTERS}
+    for worker in snapshots:
+        for name, data in worker.get('counters', {}).items():
+            if name not in merged:
+                continue
+            for labels, value in data['series']:
+                merged[name][tuple(labels)] = merged[name].get(tuple(labels), 0) + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def render() -> str:
+    """All workers' histograms and counters in the Prometheus text exposition format"""
+    snapshots = _worker_snapshots()
+    merged = _merge(snapshots)
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.append(f"# HELP {histogram.name} {histogram.documentation}")
+        lines.append(f"# TYPE {histogram.name} histogram")
+        bounds = [_format_value(bound) for bound in histogram.buckets] + ['+Inf']
+        for labels, (counts, total) in sorted(merged[histogram.name].items()):
+            label_text = ','.join(f'{name}="{_escape(value)}"'
+                                  for name, value in zip(histogram.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'{histogram.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{histogram.name}_sum{{{label_text}}} {total}')
+            lines.append(f'{histogram.name}_count{{{label_text}}} {cumulative}')
+    merged_counters = _merge_counters(snapshots)
+    for counter in COUNTERS:
+        lines.append(f"# HELP {counter.name} {counter.documentation}")
+        lines.append(f"# TYPE {counter.name} counter")
+        for labels, value in sorted(merged_counters[counter.name].items()):
+            label_text = ','.join(f'{name}="{_escape(label)}"' for name, label in zip(counter.label_names, labels))
+            lines.append(f'{counter.name}{{{label_text}}} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
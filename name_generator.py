@@ -0,0 +1,406 @@
+"""
+Rule-based business name generation, without the web app.
+
+``BusinessNameGenerator`` extracts keywords from a description, detects its
+industry and builds names and taglines from the word lists.  It is configured
+from the environment (see the constants below and .env.template) and depends on
+NLTK and the offline-built data files, but not on Flask, so the web app
+(app.py), the ASGI server and offline jobs (bulk_generate.py) all share it:
+
+    generator = BusinessNameGenerator()
+    keywords = generator.extract_keywords('organic coffee roastery')
+    names = generator.generate_rule_based_names(keywords, 'playful', 10, seed=7)
+
+Every data file is loaded when the generator is created, and NLTK data on first
+use; each process creates its own generator.
+"""
+
+import logging
+import os
+import random
+import threading
+from collections import defaultdict
+
+import nltk
+from dotenv import load_dotenv
+from nltk.corpus import stopwords, wordnet
+from nltk.stem import WordNetLemmatizer
+from nltk.tokenize import word_tokenize
+
+import fast_nlp
+from candidate_engine import CandidateEngine, NAME_TYPES
+from embedding_index import load_embedding_index
+from lru_cache import LRUCache
+from metrics import timed
+from ranking import load_ranking_weights, rank_candidates
+from reloadable import ReloadableFile
+from synonym_index import load_synonym_index, wordnet_synonyms, MAX_SYNONYM_LENGTH
+from vocabulary import load_vocabulary_file
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# NLTK data is never fetched at import time; it is checked lazily on first use or by
+# warmup(). With NLTK_OFFLINE=true missing data is reported instead of downloaded.
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet'
+}
+NLTK_OFFLINE = os.getenv('NLTK_OFFLINE', 'false').lower() in ('1', 'true', 'yes')
+
+_nltk_lock = threading.Lock()
+_nltk_checked = False
+
+def ensure_nltk_data(download=not NLTK_OFFLINE):
+    """Make sure the NLTK resources exist locally, downloading them if allowed"""
+    global _nltk_checked
+    with _nltk_lock:
+        if _nltk_checked:
+            return []
+
+        missing = []
+        for package, path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                if not (download and nltk.download(package, quiet=True)):
+                    missing.append(package)
+
+        if missing:
+            logger.warning(f"Missing NLTK data: {', '.join(missing)}")
+        _nltk_checked = True
+        return missing
+
+# Offline-built synonym index (see synonym_index.py); falls back to WordNet if missing.
+# It holds WordNet's lemmas only, so other forms ('faster', 'delivered') are looked
+# up in WordNet, whose morphy finds their base forms, memoized up to LEMMA_CACHE_SIZE words
+SYNONYM_INDEX_PATH = os.getenv(
+    'SYNONYM_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'synonyms.idx')
+)
+
+# Keyword expansion: 'wordnet' adds WordNet synonyms, 'embedding' adds the nearest
+# words in the offline-built word-vector index (see embedding_index.py), 'none'
+# keeps the input's own words. Requests can pick one with the 'expansion' field.
+# EMBEDDING_NPROBE clusters are searched per keyword; neighbours less similar
+# than EMBEDDING_MIN_SIMILARITY (cosine) are dropped
+EXPANSION_BACKENDS = ('wordnet', 'embedding', 'none')
+KEYWORD_EXPANSION = os.getenv('KEYWORD_EXPANSION', 'wordnet').lower()
+EMBEDDING_INDEX_PATH = os.getenv(
+    'EMBEDDING_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'embeddings.idx')
+)
+EMBEDDING_NPROBE = int(os.getenv('EMBEDDING_NPROBE', 4))
+EMBEDDING_MIN_SIMILARITY = float(os.getenv('EMBEDDING_MIN_SIMILARITY', 0.5))
+
+# Keyword tokenization: 'fast' uses compiled regexes and the offline-built lemma
+# table (see fast_nlp.py), falling back to NLTK for input they don't cover;
+# 'nltk' always runs word_tokenize and WordNetLemmatizer. Lemmas are memoized,
+# up to LEMMA_CACHE_SIZE words per worker
+KEYWORD_TOKENIZER = os.getenv('KEYWORD_TOKENIZER', 'fast').lower()
+LEMMA_TABLE_PATH = os.getenv(
+    'LEMMA_TABLE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'lemmas.idx')
+)
+LEMMA_CACHE_SIZE = int(os.getenv('LEMMA_CACHE_SIZE', 4096))
+
+# Per-worker caches in front of keyword extraction and industry detection
+KEYWORD_CACHE_SIZE = int(os.getenv('KEYWORD_CACHE_SIZE', 2048))
+KEYWORD_CACHE_TTL = float(os.getenv('KEYWORD_CACHE_TTL', 3600))
+
+# Word lists and tagline templates; edits are picked up without a restart,
+# checked at most every VOCABULARY_RELOAD_INTERVAL seconds
+VOCABULARY_PATH = os.getenv(
+    'VOCABULARY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'vocabulary.json')
+)
+VOCABULARY_RELOAD_INTERVAL = float(os.getenv('VOCABULARY_RELOAD_INTERVAL', 5))
+
+# Rule-based names are ranked by weights learned from saved favorites
+# (python ranking.py build ...) when this file exists; it is re-read when it
+# changes, checked at most every RANKING_RELOAD_INTERVAL seconds
+RANKING_WEIGHTS_PATH = os.getenv(
+    'RANKING_WEIGHTS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ranking_weights.json')
+)
+RANKING_OVERGENERATE = int(os.getenv('RANKING_OVERGENERATE', 3))
+RANKING_RELOAD_INTERVAL = float(os.getenv('RANKING_RELOAD_INTERVAL', 5))
+
+
+class BusinessNameGenerator:
+    def __init__(self):
+        # NLTK-backed resources are loaded lazily (or up front by warmup())
+        self._stop_words = None
+        self._lemmatizer = None
+        self.synonym_index = load_synonym_index(SYNONYM_INDEX_PATH)
+        self.embedding_index = load_embedding_index(EMBEDDING_INDEX_PATH, EMBEDDING_NPROBE)
+        self.expansion = KEYWORD_EXPANSION if KEYWORD_EXPANSION in EXPANSION_BACKENDS else 'wordnet'
+        if self.expansion == 'embedding' and self.embedding_index is None:
+            logger.warning("KEYWORD_EXPANSION=embedding but no embedding index is loaded; using WordNet")
+            self.expansion = 'wordnet'
+        self.keyword_tokenizer = KEYWORD_TOKENIZER
+        self.lemma_table = (fast_nlp.load_lemma_table(LEMMA_TABLE_PATH, LEMMA_CACHE_SIZE)
+                            if KEYWORD_TOKENIZER == 'fast' else None)
+        self.lemma_cache = LRUCache(LEMMA_CACHE_SIZE, name='lemmas')
+        self.synonym_cache = LRUCache(LEMMA_CACHE_SIZE, name='synonyms')
+        self.keyword_cache = LRUCache(KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL, name='keywords')
+        self.industry_cache = LRUCache(KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL, name='industry')
+        self.candidate_cache = LRUCache(KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL, name='candidates')
+        self.ranking_weights = ReloadableFile(
+            RANKING_WEIGHTS_PATH, load_ranking_weights, RANKING_RELOAD_INTERVAL, name='ranking weights'
+        ) if RANKING_WEIGHTS_PATH else None
+        
+        # Word lists, taglines and matchers, re-read when the vocabulary file changes
+        self.vocabulary_file = load_vocabulary_file(VOCABULARY_PATH, VOCABULARY_RELOAD_INTERVAL)
+
+    @property
+    def vocabulary(self):
+        return self.vocabulary_file.current()
+
+    @property
+    def prefixes(self):
+        return self.vocabulary.prefixes
+
+    @property
+    def suffixes(self):
+        return self.vocabulary.suffixes
+
+    @property
+    def tone_modifiers(self):
+        return self.vocabulary.tone_modifiers
+
+    @property
+    def industry_keywords(self):
+        return self.vocabulary.industry_keywords
+
+    @property
+    def category_keywords(self):
+        return self.vocabulary.category_keywords
+
+    @property
+    def industry_matcher(self):
+        return self.vocabulary.industry_matcher
+
+    @property
+    def category_matcher(self):
+        return self.vocabulary.category_matcher
+
+    def content_version(self):
+        """Changes whenever reloaded data files would change generated names"""
+        weights = self.ranking_weights.current() if self.ranking_weights else None
+        return (self.vocabulary.version, weights and weights.version)
+
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            ensure_nltk_data()
+            self._stop_words = frozenset(stopwords.words('english'))
+        return self._stop_words
+
+    @property
+    def lemmatizer(self):
+        if self._lemmatizer is None:
+            ensure_nltk_data()
+            self._lemmatizer = WordNetLemmatizer()
+        return self._lemmatizer
+
+    @staticmethod
+    def normalize_text(text):
+        """Normalize input text for cache keys (case and whitespace insensitive)"""
+        return ' '.join(text.lower().split())
+
+    @timed('extract_keywords')
+    def extract_keywords(self, text, expansion=None):
+        """Extract keywords from input text, reusing cached results for repeated phrases"""
+        key = (self.normalize_text(text), expansion or self.expansion)
+        keywords = self.keyword_cache.get_or_compute(key, lambda: tuple(self._extract_keywords(*key)))
+        return list(keywords)
+
+    def _extract_keywords(self, text, expansion=None):
+        """Extract and process keywords from input text using NLP"""
+        keywords = self.keyword_tokens(text)
+        expansion = expansion or self.expansion
+        
+        # Add up to 3 synonyms or nearest words for each keyword (an ordered set, so every
+        # process lists the keywords in the same order whatever its hash seed)
+        expanded_keywords = dict.fromkeys(keywords)
+        if expansion == 'embedding':
+            with timed('embedding_neighbors'):
+                for keyword in keywords:
+                    expanded_keywords.update(dict.fromkeys(self.get_neighbors(keyword)))
+        elif expansion == 'wordnet':
+            with timed('synonyms'):
+                for keyword in keywords:
+                    synonyms = self.get_synonyms(keyword)
+                    expanded_keywords.update(dict.fromkeys(synonyms[:3]))
+        
+        return list(expanded_keywords)
+
+    def keyword_tokens(self, text):
+        """Lemmatized alphabetic tokens of the text, without stopwords"""
+        # Tokenize and clean
+        text = text.lower()
+        with timed('tokenize'):
+            tokens = fast_nlp.tokenize(text) if self.keyword_tokenizer == 'fast' else None
+            if tokens is None:
+                tokens = word_tokenize(text)
+        
+        # Remove stopwords and non-alphabetic tokens
+        stop_words = self.stop_words
+        keywords = [word for word in tokens if word.isalpha() and word not in stop_words]
+        
+        # Lemmatize words
+        with timed('lemmatize'):
+            keywords = [self.lemmatize(word) for word in keywords]
+        return keywords
+
+    def lemmatize(self, word):
+        """Noun lemma of a word, from the lemma table if it is built, else WordNet (memoized)"""
+        if self.lemma_table is not None:
+            return self.lemma_table.lemma(word)
+        return self.lemma_cache.get_or_compute(word, lambda: self.lemmatizer.lemmatize(word))
+
+    def get_synonyms(self, word):
+        """Get synonyms for a word from the precomputed index, or WordNet if it isn't built"""
+        if self.synonym_index is not None:
+            synonyms = self.synonym_index.get(word)
+            if synonyms:
+                return synonyms
+            # Not a lemma with synonyms: maybe an inflection WordNet's morphy can resolve
+            return self.synonym_cache.get_or_compute(word, lambda: wordnet_synonyms(word, wordnet))
+        return wordnet_synonyms(word, wordnet)
+
+    def get_neighbors(self, word, count=3):
+        """Nearest words in the embedding index, skipping stopwords, inflections and long words"""
+        if self.embedding_index is None:
+            return []
+        neighbors = []
+        for neighbor in self.embedding_index.neighbors(word, count * 3, EMBEDDING_MIN_SIMILARITY):
+            if (len(neighbor) <= MAX_SYNONYM_LENGTH and neighbor not in self.stop_words
+                    and self.lemmatize(neighbor) != word):
+                neighbors.append(neighbor)
+                if len(neighbors) == count:
+                    break
+        return neighbors
+
+    @timed('detect_industry')
+    def detect_industry(self, keywords):
+        """Detect industry based on keywords, reusing cached results"""
+        key = (tuple(keywords), self.vocabulary.version)
+        return self.industry_cache.get_or_compute(key, lambda: self._detect_industry(key[0]))
+
+    def _detect_industry(self, keywords):
+        """Detect industry based on keywords"""
+        industry_scores = defaultdict(int)
+        matcher = self.industry_matcher
+        
+        for keyword in keywords:
+            for industry in matcher.matches(keyword.lower()):
+                industry_scores[industry] += 1
+        
+        if industry_scores:
+            return max(industry_scores, key=industry_scores.get)
+        return 'general'
+
+    def get_name_parts(self, tone, industry):
+        """Prefixes and suffixes (raw and title-cased) for a tone/industry pair"""
+        return self.vocabulary.name_parts(tone, industry)
+
+    def get_candidate_engine(self, keywords, tone, industry):
+        """Candidate engine over the top 5 keywords, cached per vocabulary version"""
+        vocabulary = self.vocabulary
+        key = (tuple(keywords[:5]), tone, industry, vocabulary.version)
+        
+        def build():
+            parts = vocabulary.name_parts(tone, industry)
+            return CandidateEngine(key[0], parts.prefixes, parts.suffixes,
+                                   titled_prefixes=parts.titled_prefixes, titled_suffixes=parts.titled_suffixes)
+        
+        return self.candidate_cache.get_or_compute(key, build)
+
+    def generate_rule_based_names(self, keywords, tone='professional', count=10, industry=None, seed=None):
+        """Generate business names using rule-based logic (reproducible for a given seed)"""
+        return self.rule_based_page(keywords, tone, count, industry, seed)[0]
+
+    @timed('generate_rule_based_names')
+    def rule_based_page(self, keywords, tone='professional', count=10, industry=None, seed=None, state=None):
+        """Rule-based names after a page state, and the state of the next page (None once exhausted).
+
+        A state is the walk positions of CandidateEngine.page followed by the
+        ids of candidates a ranked page held back.  The pages of one seed never
+        repeat a name, and together show every candidate.
+        """
+        if industry is None:
+            industry = self.detect_industry(keywords)
+        if seed is None:
+            seed = random.getrandbits(64)
+        
+        # Sample unique names from every template combination of the top 5 keywords
+        engine = self.get_candidate_engine(keywords, tone, industry)
+        weights = self.ranking_weights.current() if self.ranking_weights else None
+        families = len(NAME_TYPES)
+        if state is None:
+            positions, held = None, []
+        else:
+            positions, held = tuple(state[:families]), [engine.candidate(key) for key in state[families:]]
+        
+        # Over-generate when ranking, keep the candidates users are most likely to save and
+        # hold the rest for the next page, so ranking reorders names without dropping any
+        window = count if weights is None else count * RANKING_OVERGENERATE
+        walked, positions = engine.page(max(window - len(held), 0), seed, positions)
+        candidates = held + walked
+        if weights is None:
+            names = [name for name, _, _ in candidates[:count]]
+        else:
+            ranking_seed = seed if state is None else [seed, sum(state)]
+            with timed('rank_names'):
+                names = rank_candidates(candidates, weights.table(tone, industry), count, ranking_seed)
+        
+        shown = set(names)
+        held = tuple(engine.candidate_id(name) for name, _, _ in candidates if name not in shown)
+        if positions is None:
+            if not held:
+                return names, None
+            positions = tuple(engine.family_sizes())  # walk finished, held candidates still to show
+        return names, positions + held
+
+    def iter_rule_based_names(self, keywords, tone='professional', industry=None, seed=None):
+        """Every rule-based name, lazily, for callers that filter candidates"""
+        if industry is None:
+            industry = self.detect_industry(keywords)
+        if seed is None:
+            seed = random.getrandbits(64)
+        
+        return self.get_candidate_engine(keywords, tone, industry).iter_names(seed)
+
+    @timed('generate_taglines')
+    def generate_taglines(self, business_names, industry='general', rng=None):
+        """Generate simple taglines for business names"""
+        rng = rng or random
+        templates = self.vocabulary.tagline_templates(industry)
+        
+        taglines = []
+        for name in business_names:
+            tagline = rng.choice(templates)
+            taglines.append(tagline)
+        
+        return taglines
+
+    @timed('categorize_names')
+    def categorize_names(self, names):
+        """Categorize names by theme"""
+        categories = {
+            'Tech & Innovation': [],
+            'Professional': [],
+            'Creative': [],
+            'Elegant': []
+        }
+        
+        for name in names:
+            category = self.category_matcher.first_match(name.lower(), 'Creative')
+            categories[category].append(name)
+        
+        # Remove empty categories
+        return {k: v for k, v in categories.items() if v}
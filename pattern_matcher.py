@@ -0,0 +1,96 @@
+"""
+Multi-pattern substring matcher (Aho-Corasick) for keyword classification.
+
+``detect_industry`` and ``categorize_names`` need to know which groups of terms
+occur anywhere inside a string.  Testing every term with ``in`` costs
+O(groups x terms) per string; the automaton answers for all groups in a
+single pass over the characters.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+
+class PatternMatcher:
+    """Aho-Corasick automaton over labelled groups of substrings.
+
+    ``match_mask(text)`` returns a bitmask with bit ``i`` set when any term of
+    the i-th label occurs in ``text`` as a substring - exactly
+    ``any(term in text for term in terms)`` for every label at once.
+    """
+
+    def __init__(self, patterns: Dict[str, Iterable[str]]):
+        self.labels = tuple(patterns)
+        self._label_sets = {}
+
+        # Trie of all terms; each node records the labels whose terms end there
+        transitions = [{}]
+        outputs = [0]
+        for bit, label in enumerate(self.labels):
+            for term in patterns[label]:
+                state = 0
+                for char in term:
+                    next_state = transitions[state].get(char)
+                    if next_state is None:
+                        next_state = len(transitions)
+                        transitions[state][char] = next_state
+                        transitions.append({})
+                        outputs.append(0)
+                    state = next_state
+                outputs[state] |= 1 << bit
+
+        # Breadth-first failure links, folded into a complete transition table
+        # so matching is one dict lookup per character with no backtracking
+        failure = [0] * len(transitions)
+        queue = list(transitions[0].values())
+        goto = [dict(transitions[0])] + [None] * (len(transitions) - 1)
+        for state in queue:
+            outputs[state] |= outputs[0]
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            fallback = goto[failure[state]]
+            goto[state] = dict(fallback)
+            goto[state].update(transitions[state])
+            for char, next_state in transitions[state].items():
+                failure[next_state] = fallback.get(char, 0)
+                outputs[next_state] |= outputs[failure[next_state]]
+                queue.append(next_state)
+
+        self._goto = goto
+        self._outputs = outputs
+
+    def match_mask(self, text: str) -> int:
+        """Bitmask of the labels with at least one term occurring in text"""
+        goto = self._goto
+        outputs = self._outputs
+        state = 0
+        mask = outputs[0]
+        for char in text:
+            state = goto[state].get(char, 0)
+            mask |= outputs[state]
+        return mask
+
+    def labels_for(self, mask: int) -> Tuple[str, ...]:
+        """Labels set in a mask, in the order the patterns were declared"""
+        labels = self._label_sets.get(mask)
+        if labels is None:
+            labels = tuple(label for bit, label in enumerate(self.labels) if mask >> bit & 1)
+            self._label_sets[mask] = labels
+        return labels
+
+    def matches(self, text: str) -> Tuple[str, ...]:
+        """Labels with at least one term occurring in text"""
+        return self.labels_for(self.match_mask(text))
+
+    def first_match(self, text: str, default=None):
+        """The first declared label that matches text, like an if/elif chain"""
+        mask = self.match_mask(text)
+        if not mask:
+            return default
+        return self.labels[(mask & -mask).bit_length() - 1]
+
+
+def reference_matches(patterns: Dict[str, List[str]], text: str) -> Tuple[str, ...]:
+    """Plain substring scan with the same semantics, for benchmarks and checks"""
+    return tuple(label for label, terms in patterns.items() if any(term in text for term in terms))
@@ -0,0 +1,235 @@
+"""
+Popularity-weighted ranking of rule-based names.
+
+Rule-based candidates are sampled uniformly from their template spaces, so
+every prefix, suffix and template gets roughly the same exposure.  Which of
+them users actually save is learned offline from the favorites database:
+
+    python ranking.py build data/ranking_weights.json --favorites data/favorites.db
+
+For each (tone, industry) group, plus a global group, the job computes a
+smoothed log-ratio of a feature's favorites to what uniform exposure would
+predict.  Features are ``template:<family>``, ``prefix:<prefix>`` and
+``suffix:<suffix>``, and unseen values fall back to a per-kind default.  The
+result is a small JSON file.
+
+At request time the generator over-samples candidates, scores each one as the
+sum of its feature weights plus a little seeded noise (so low-weight names
+still get shown now and then), and keeps the top ``count``.  That is a few
+dict lookups per candidate, well under a millisecond per request.  Workers
+check the file's mtime every few seconds and swap in a rebuilt file without a
+restart (see reloadable.py).
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from candidate_engine import MODIFIED_ENDINGS, MODIFIED_SUFFIXES, NAME_TYPES
+
+FORMAT_VERSION = 1
+GLOBAL_GROUP = '*|*'
+FEATURE_KINDS = ('template', 'prefix', 'suffix')
+SMOOTHING = 1.0      # additive prior, in favorites
+MAX_WEIGHT = 2.0     # clip log-ratios so one lucky feature can't dominate
+MIN_GROUP_FAVORITES = 20
+
+
+def group_key(tone: str, industry: str) -> str:
+    return f"{tone}|{industry}"
+
+
+def candidate_features(family: str, items: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Features of an engine candidate, from its template family and part items"""
+    if family == 'prefix_keyword':
+        return (f'template:{family}', f'prefix:{items[0].lower()}')
+    if family == 'keyword_suffix':
+        return (f'template:{family}', f'suffix:{items[1].lower()}')
+    if family == 'compound':
+        if len(items) == 2:  # single keyword + suffix
+            return (f'template:{family}', f'suffix:{items[1].lower()}')
+        return (f'template:{family}',)
+    # modified: keyword + ending, or article + keyword + suffix
+    return (f'template:{family}', f'suffix:{items[-1].strip().lower()}')
+
+
+def name_features(name: str, prefixes: Iterable[str], suffixes: Iterable[str]) -> Optional[Tuple[str, ...]]:
+    """Best-effort features of a saved name (the offline job only sees the string).
+
+    Returns None for names that don't look rule-based (e.g. AI names).
+    """
+    if ' & ' in name or ' + ' in name:
+        return ('template:compound',)
+    for suffix in MODIFIED_SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix):
+            return ('template:modified', f'suffix:{suffix.strip().lower()}')
+    for ending in MODIFIED_ENDINGS:  # lower-case endings; titled ones are keyword_suffix
+        if name.endswith(ending) and len(name) > len(ending) and name[-len(ending) - 1].isalpha():
+            return ('template:modified', f'suffix:{ending}')
+
+    prefix = max((p for p in prefixes if name.startswith(p) and len(name) > len(p)), key=len, default=None)
+    if prefix:
+        return ('template:prefix_keyword', f'prefix:{prefix.lower()}')
+    suffix = max((s for s in suffixes if name.endswith(s) and len(name) > len(s)), key=len, default=None)
+    if suffix:
+        return ('template:keyword_suffix', f'suffix:{suffix.lower()}')
+    return None
+
+
+# --- offline aggregation -----------------------------------------------------------
+
+def build_weights(favorites: Iterable[Tuple[str, Optional[str], Optional[str]]],
+                  prefixes: Sequence[str], suffixes: Sequence[str],
+                  min_group_favorites: int = MIN_GROUP_FAVORITES) -> Dict:
+    """Aggregate (name, tone, industry) favorites into per-group feature weights"""
+    titled_prefixes = sorted({prefix.title() for prefix in prefixes})
+    titled_suffixes = sorted({suffix.title() for suffix in suffixes})
+    vocabulary_sizes = {'template': len(NAME_TYPES), 'prefix': len(titled_prefixes),
+                        'suffix': len(titled_suffixes) + len(MODIFIED_ENDINGS)}
+
+    counts: Dict[str, Counter] = defaultdict(Counter)
+    used = 0
+    for name, tone, industry in favorites:
+        features = name_features(name, titled_prefixes, titled_suffixes)
+        if features is None:
+            continue
+        used += 1
+        groups = [GLOBAL_GROUP]
+        if tone and industry:
+            groups.append(group_key(tone, industry))
+        for group in groups:
+            counts[group].update(features)
+
+    groups = {}
+    for group, feature_counts in counts.items():
+        kind_totals = Counter()
+        for feature, count in feature_counts.items():
+            kind_totals[feature.split(':', 1)[0]] += count
+        if sum(kind_totals.values()) < min_group_favorites:
+            continue
+
+        weights = {}
+        defaults = {}
+        for kind, total in kind_totals.items():
+            expected = total / max(vocabulary_sizes[kind], 1)  # share under uniform exposure
+            defaults[kind] = round(_log_ratio(0, expected), 4)
+        for feature, count in feature_counts.items():
+            kind = feature.split(':', 1)[0]
+            weight = round(_log_ratio(count, kind_totals[kind] / max(vocabulary_sizes[kind], 1)), 4)
+            if weight != defaults[kind]:
+                weights[feature] = weight
+        groups[group] = {'favorites': kind_totals['template'], 'defaults': defaults, 'weights': weights}
+
+    return {'version': FORMAT_VERSION, 'created': time.time(), 'favorites_used': used, 'groups': groups}
+
+
+def _log_ratio(count: float, expected: float) -> float:
+    ratio = math.log((count + SMOOTHING) / (expected + SMOOTHING))
+    return max(-MAX_WEIGHT, min(MAX_WEIGHT, ratio))
+
+
+def read_favorites(path: str) -> Iterable[Tuple[str, Optional[str], Optional[str]]]:
+    connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        yield from connection.execute('SELECT name, tone, industry FROM favorites')
+    finally:
+        connection.close()
+
+
+def write_weights(weights: Dict, path: str):
+    """Write a weights file atomically, so workers never read a partial one"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(weights, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# --- request-time ranking ----------------------------------------------------------
+
+class RankingWeights:
+    """Immutable weights loaded from one file; per-group tables are merged on first use"""
+
+    def __init__(self, data: Dict):
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"unsupported ranking weights version {data.get('version')}")
+        self.groups = data['groups']
+        self.version = data.get('created')
+        self._tables: Dict[str, Tuple[Dict[str, float], Dict[str, float]]] = {}
+
+    def table(self, tone: str, industry: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """(weights, per-kind defaults) for a group, layered on the global group"""
+        key = group_key(tone, industry)
+        table = self._tables.get(key)
+        if table is None:
+            base = self.groups.get(GLOBAL_GROUP, {})
+            specific = self.groups.get(key, {})
+            weights = dict(base.get('weights', {}))
+            defaults = dict(base.get('defaults', {}))
+            for feature, weight in specific.get('weights', {}).items():
+                weights[feature] = weights.get(feature, defaults.get(feature.split(':', 1)[0], 0.0)) + weight
+            for kind, weight in specific.get('defaults', {}).items():
+                defaults[kind] = defaults.get(kind, 0.0) + weight
+            table = self._tables[key] = (weights, defaults)
+        return table
+
+
+def load_ranking_weights(path: str) -> RankingWeights:
+    with open(path) as f:
+        return RankingWeights(json.load(f))
+
+
+def rank_candidates(candidates: Sequence[Tuple[str, str, Tuple[str, ...]]],
+                    table: Tuple[Dict[str, float], Dict[str, float]], count: int,
+                    seed=None, temperature: float = 0.5) -> List[str]:
+    """Top ``count`` names by summed feature weight plus seeded Gumbel noise"""
+    weights, defaults = table
+    noise = np.random.default_rng(seed).gumbel(size=len(candidates)) * temperature
+    scored = []
+    for (name, family, items), jitter in zip(candidates, noise.tolist()):
+        score = jitter
+        for feature in candidate_features(family, items):
+            weight = weights.get(feature)
+            score += defaults.get(feature.split(':', 1)[0], 0.0) if weight is None else weight
+        scored.append((score, name))
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return [name for _, name in scored[:count]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build ranking weights from saved favorites")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build', help="aggregate the favorites database into a weights file")
+    build.add_argument('output')
+    build.add_argument('--favorites', default=os.path.join('data', 'favorites.db'))
+    build.add_argument('--min-group-favorites', type=int, default=MIN_GROUP_FAVORITES)
+    args = parser.parse_args()
+
+    from name_generator import BusinessNameGenerator
+    generator = BusinessNameGenerator()  # vocabulary the names were generated from
+
+    prefixes = set(generator.prefixes)
+    suffixes = set(generator.suffixes)
+    for tone in generator.tone_modifiers.values():
+        prefixes.update(tone['prefixes'])
+        suffixes.update(tone['suffixes'])
+    for words in generator.industry_keywords.values():
+        prefixes.update(words)
+
+    started = time.perf_counter()
+    weights = build_weights(read_favorites(args.favorites), sorted(prefixes), sorted(suffixes),
+                            args.min_group_favorites)
+    write_weights(weights, args.output)
+    print(f"Built weights for {len(weights['groups'])} groups from {weights['favorites_used']} favorites "
+          f"into {args.output} ({os.path.getsize(args.output)} bytes, {time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Data files that are re-read when they change, without restarting workers.
+
+``ReloadableFile(path, load)`` keeps the object ``load(path)`` built from the
+file and checks the file's mtime at most every ``check_interval`` seconds on
+access.  A changed file is loaded in full before the new object replaces the
+old one with a single reference assignment, so a request either sees the old
+object or the new one, never a mix.  If loading fails the previous object is
+kept.  Writers should replace files atomically (write a temporary file, then
+``os.replace``) so a reload never sees a half-written file.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class ReloadableFile(Generic[T]):
+    """The object loaded from a file, reloaded when the file's mtime changes.
+
+    ``keep_when_missing`` keeps serving the last object if the file is
+    deleted; otherwise ``current()`` returns None until it reappears.
+    """
+
+    def __init__(self, path: str, load: Callable[[str], T], check_interval: float = 5.0,
+                 keep_when_missing: bool = False, name: Optional[str] = None):
+        self.path = path
+        self.load = load
+        self.check_interval = check_interval
+        self.keep_when_missing = keep_when_missing
+        self.name = name or os.path.basename(path)
+        self.version: Optional[int] = None  # mtime (ns) of the loaded file
+        self._value: Optional[T] = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[T]:
+        now = time.monotonic()
+        # One thread checks; the others keep using the current object meanwhile
+        if now - self._checked_at >= self.check_interval and self._lock.acquire(blocking=False):
+            try:
+                self._checked_at = now
+                self._reload_if_changed()
+            finally:
+                self._lock.release()
+        return self._value
+
+    def _reload_if_changed(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            if self._value is not None and not self.keep_when_missing:
+                logger.info(f"{self.name} removed ({self.path})")
+                self._value, self.version = None, None
+            return
+        if mtime == self.version:
+            return
+        try:
+            value = self.load(self.path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Keeping previous {self.name}; failed to load {self.path}: {e}")
+            return
+        self._value, self.version = value, mtime
+        logger.info(f"Loaded {self.name} from {self.path}")
@@ -0,0 +1,310 @@
+"""
+Single-flight coalescing of identical in-flight computations.
+
+When many identical requests arrive at once (e.g. a campaign link to a
+prefilled form), only the first one should do the work; the others wait for
+it and share its result:
+
+    flight = SingleFlight()
+    result, scope = flight.do(key, lambda: expensive(...))
+
+``scope`` is None for the call that ran the function, and says where the
+result came from otherwise: ``'process'`` (another thread or task in this
+worker) or ``'host'`` (another worker process).  Nothing is cached: a key is
+forgotten as soon as its computation finishes, and an exception is raised in
+every caller that waited for it.
+
+``FileSingleFlight`` also coalesces across the worker processes of one host.
+Each key maps to a small file in a shared directory.  The worker computing
+a key holds an exclusive ``flock`` on the file and writes the result into it
+before releasing the lock; workers that find the file locked poll for the
+lock and then read the result, if it was written after they arrived.  If the
+computing worker fails or dies (the kernel releases its lock), a waiter runs
+the function itself, and one that waits longer than ``wait`` seconds stops
+waiting and computes on its own.  Results cross processes as JSON.
+
+``AsyncSingleFlight`` and ``AsyncFileSingleFlight`` do the same for
+coroutines.  The computation runs as its own task, so it keeps going for the
+remaining waiters when the request that started it is cancelled.
+"""
+
+import asyncio
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROCESS = 'process'
+HOST = 'host'
+
+POLL_INTERVAL = 0.005      # first wait between attempts to take another worker's lock (s)
+MAX_POLL_INTERVAL = 0.05
+SWEEP_INTERVAL = 60.0      # how often a worker removes stale key files (s)
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class _Stats:
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = Counter()
+
+    def _count(self, scope: Optional[str]):
+        if scope is None:
+            self.executed += 1
+        else:
+            self.coalesced[scope] += 1
+
+    def stats(self, in_flight: int) -> Dict:
+        return {'in_flight': in_flight, 'executed': self.executed,
+                'coalesced': {scope: self.coalesced[scope] for scope in (PROCESS, HOST)}}
+
+
+class SingleFlight(_Stats):
+    """Concurrent calls with an equal key share one execution (threads)"""
+
+    def __init__(self):
+        super().__init__()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, Optional[str]]:
+        """(result, scope): scope is None if this call ran ``fn``, else where its result came from"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            with self._lock:
+                self.coalesced[PROCESS] += 1
+            return call.result, PROCESS
+
+        try:
+            call.result, scope = self._run(key, fn)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        with self._lock:
+            self._count(scope)
+        return call.result, scope
+
+    def _run(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, Optional[str]]:
+        return fn(), None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return super().stats(len(self._calls))
+
+
+# --- across worker processes ----------------------------------------------------------
+
+class _KeyFiles:
+    """Per-key lock/result files in a directory shared by the workers of one host"""
+
+    def __init__(self, directory: str, wait: float):
+        self.directory = directory
+        self.wait = wait
+        self._swept_at = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+
+    def open(self, key: Hashable) -> int:
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.open(os.path.join(self.directory, f'{digest}.flight'), os.O_RDWR | os.O_CREAT, 0o600)
+
+    @staticmethod
+    def try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    @staticmethod
+    def read(fd: int, since_ns: int) -> Optional[Tuple[Any]]:
+        """(result,) if the file holds a result written at or after ``since_ns``"""
+        os.lseek(fd, 0, os.SEEK_SET)
+        chunks = []
+        while True:
+            chunk = os.read(fd, 1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        try:
+            record = json.loads(b''.join(chunks)) if chunks else None
+        except ValueError:
+            return None
+        if not record or record.get('written_ns', 0) < since_ns:
+            return None
+        return (record['result'],)
+
+    @staticmethod
+    def write(fd: int, result: Any):
+        """Store a result for the workers waiting on the lock; they compute it themselves if this fails"""
+        try:
+            data = json.dumps({'written_ns': time.time_ns(), 'result': result}).encode('utf-8')
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, data)
+        except (TypeError, ValueError, OSError) as e:
+            logger.warning(f"Could not share a coalesced result with other workers: {e}")
+
+    def sweep(self):
+        """Remove key files nobody has used for a while (at most once per SWEEP_INTERVAL)"""
+        now = time.monotonic()
+        if now - self._swept_at < SWEEP_INTERVAL:
+            return
+        self._swept_at = now
+        cutoff = time.time() - max(SWEEP_INTERVAL, 2 * self.wait)
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for entry in entries:
+            try:
+                if not entry.name.endswith('.flight') or entry.stat().st_mtime >= cutoff:
+                    continue
+                fd = os.open(entry.path, os.O_RDWR)
+            except OSError:
+                continue
+            try:
+                # A worker that opened the file just before it is removed may compute
+                # the same key as a newcomer; the results are equivalent either way
+                if self.try_lock(fd):
+                    os.unlink(entry.path)
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+
+
+class FileSingleFlight(SingleFlight):
+    """SingleFlight that also coalesces with other worker processes on the host"""
+
+    def __init__(self, directory: str, wait: float = 30.0):
+        super().__init__()
+        self.files = _KeyFiles(directory, wait)
+
+    def _run(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, Optional[str]]:
+        arrived_ns = time.time_ns()
+        try:
+            fd = self.files.open(key)
+        except OSError as e:
+            logger.warning(f"Coalescing across workers unavailable: {e}")
+            return fn(), None
+
+        try:
+            waited = False
+            deadline = time.monotonic() + self.files.wait
+            interval = POLL_INTERVAL
+            while not self.files.try_lock(fd):
+                if time.monotonic() >= deadline:
+                    return fn(), None  # another worker is taking too long
+                waited = True
+                time.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+            if waited:
+                shared = self.files.read(fd, arrived_ns)
+                if shared is not None:
+                    return shared[0], HOST
+            result = fn()
+            self.files.write(fd, result)
+            return result, None
+        finally:
+            os.close(fd)  # releases the lock
+            self.files.sweep()
+
+
+# --- asyncio --------------------------------------------------------------------------
+
+class AsyncSingleFlight(_Stats):
+    """Concurrent calls with an equal key share one execution (coroutines, one event loop)"""
+
+    def __init__(self):
+        super().__init__()
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        """(result, scope): scope is None if this call started ``fn``, else where its result came from"""
+        task = self._calls.get(key)
+        if task is not None:
+            result, _ = await asyncio.shield(task)
+            self.coalesced[PROCESS] += 1
+            return result, PROCESS
+
+        task = self._calls[key] = asyncio.ensure_future(self._run(key, fn))
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        del self._calls[key]
+        if task.cancelled() or task.exception() is not None:  # also marks the exception as retrieved
+            return
+        self._count(task.result()[1])
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        return await fn(), None
+
+    def stats(self) -> Dict:
+        return super().stats(len(self._calls))
+
+
+class AsyncFileSingleFlight(AsyncSingleFlight):
+    """AsyncSingleFlight that also coalesces with other worker processes on the host"""
+
+    def __init__(self, directory: str, wait: float = 30.0):
+        super().__init__()
+        self.files = _KeyFiles(directory, wait)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        arrived_ns = time.time_ns()
+        try:
+            fd = self.files.open(key)
+        except OSError as e:
+            logger.warning(f"Coalescing across workers unavailable: {e}")
+            return await fn(), None
+
+        try:
+            waited = False
+            deadline = time.monotonic() + self.files.wait
+            interval = POLL_INTERVAL
+            while not self.files.try_lock(fd):
+                if time.monotonic() >= deadline:
+                    return await fn(), None
+                waited = True
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, MAX_POLL_INTERVAL)
+
+            if waited:
+                shared = self.files.read(fd, arrived_ns)
+                if shared is not None:
+                    return shared[0], HOST
+            result = await fn()
+            self.files.write(fd, result)
+            return result, None
+        finally:
+            os.close(fd)
+            self.files.sweep()
@@ -1,14 +1,17 @@
 class BusinessNameGenerator {
     constructor() {
         this.favorites = JSON.parse(localStorage.getItem('businessNameFavorites')) || [];
+        this.userId = this.getUserId();
         this.currentNames = [];
         this.currentCategories = {};
         this.activeFilter = 'all';
         this.aiAvailable = false;
+        this.nextCursor = null;
         
         this.initializeElements();
         this.bindEvents();
         this.loadFavorites();
+        this.syncFavorites();
         this.checkAIAvailability();
     }
 
@@ -34,11 +37,26 @@ class BusinessNameGenerator {
         this.generationMethod = document.getElementById('generation-method');
         this.categoryFilters = document.getElementById('category-filters');
         this.namesGrid = document.getElementById('names-grid');
+        this.moreBtn = document.getElementById('more-btn');
         this.favoritesGrid = document.getElementById('favorites-grid');
+        this.syncCodeValue = document.getElementById('sync-code-value');
+        this.syncCodeInput = document.getElementById('sync-code-input');
+        this.copySyncCodeBtn = document.getElementById('copy-sync-code');
+        this.useSyncCodeBtn = document.getElementById('use-sync-code');
+        this.syncCodeValue.textContent = this.userId;
     }
 
     bindEvents() {
         this.generateBtn.addEventListener('click', () => this.generateNames());
+        this.moreBtn.addEventListener('click', () => this.generateMore());
+        this.copySyncCodeBtn.addEventListener('click', (e) => this.copyToClipboard(e, this.userId));
+        this.useSyncCodeBtn.addEventListener('click', () => this.useSyncCode());
+        this.syncCodeInput.addEventListener('keypress', (e) => {
+            if (e.key === 'Enter') {
+                e.preventDefault();
+                this.useSyncCode();
+            }
+        });
         
         // Allow Enter key to generate names
         this.businessInput.addEventListener('keypress', (e) => {
@@ -108,6 +126,7 @@ class BusinessNameGenerator {
 
         this.showLoading();
         this.hideError();
+        this.currentTone = tone;
 
         try {
             const response = await fetch('/generate', {
@@ -119,10 +138,18 @@ class BusinessNameGenerator {
                     input_text: inputText,
                     tone: tone,
                     count: count,
-                    use_ai: useAI
+                    use_ai: useAI,
+                    stream: 'ndjson'
                 })
             });
 
+            // Render names as they arrive when the server streams them
+            const contentType = response.headers.get('Content-Type') || '';
+            if (response.ok && response.body && contentType.includes('application/x-ndjson')) {
+                await this.readNameStream(response);
+                return;
+            }
+
             const data = await response.json();
 
             if (!response.ok) {
@@ -138,18 +165,146 @@ class BusinessNameGenerator {
         }
     }
 
+    async generateMore() {
+        if (!this.nextCursor) return;
+
+        this.moreBtn.disabled = true;
+        this.hideError();
+
+        try {
+            // The cursor carries the description, tone and position; this page never repeats earlier names
+            const response = await fetch('/generate', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    cursor: this.nextCursor,
+                    count: parseInt(this.countSelect.value)
+                })
+            });
+            const data = await response.json();
+
+            if (!response.ok) {
+                throw new Error(data.error || 'Failed to generate more names');
+            }
+
+            data.names.forEach(nameData => this.appendName(nameData));
+            if (this.activeFilter !== 'all') {
+                // The filter buttons are rebuilt below with "All Names" selected
+                this.activeFilter = 'all';
+                this.displayNames(this.currentNames);
+            }
+            Object.entries(data.categories || {}).forEach(([category, names]) => {
+                this.currentCategories[category] = (this.currentCategories[category] || []).concat(names);
+            });
+            this.updateCategoryFilters();
+            this.setNextCursor(data.cursor);
+
+        } catch (error) {
+            this.showError(error.message || 'An error occurred while generating names');
+        } finally {
+            this.moreBtn.disabled = false;
+        }
+    }
+
+    setNextCursor(cursor) {
+        this.nextCursor = cursor || null;
+        this.moreBtn.classList.toggle('hidden', !this.nextCursor);
+    }
+
+    async readNameStream(response) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let started = false;
+
+        const handleFrame = (frame) => {
+            if (frame.type === 'error') {
+                throw new Error(frame.error || 'Failed to generate names');
+            }
+
+            if (!started) {
+                started = true;
+                this.hideLoading();
+                this.startStreamingResults();
+            }
+
+            if (frame.type === 'name') {
+                this.appendName(frame);
+            } else if (frame.type === 'done') {
+                this.finishStreamingResults(frame);
+            }
+        };
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            let newline;
+            while ((newline = buffer.indexOf('\n')) !== -1) {
+                const line = buffer.slice(0, newline).trim();
+                buffer = buffer.slice(newline + 1);
+                if (line) handleFrame(JSON.parse(line));
+            }
+        }
+
+        if (buffer.trim()) handleFrame(JSON.parse(buffer));
+    }
+
+    startStreamingResults() {
+        this.currentNames = [];
+        this.currentCategories = {};
+        this.activeFilter = 'all';
+        this.namesGrid.innerHTML = '';
+        this.updateCategoryFilters();
+        this.setNextCursor(null);
+
+        this.keywordsExtracted.textContent = '...';
+        this.industryDetected.textContent = '...';
+        this.totalGenerated.textContent = '0';
+        this.generationMethod.textContent = '...';
+
+        this.resultsSection.classList.remove('hidden');
+        this.resultsSection.classList.add('fade-in');
+        this.resultsSection.scrollIntoView({ behavior: 'smooth', block: 'start' });
+    }
+
+    appendName(nameData) {
+        this.currentNames.push(nameData);
+        this.totalGenerated.textContent = this.currentNames.length;
+
+        if (this.activeFilter === 'all') {
+            this.namesGrid.appendChild(this.createNameCard(nameData, this.currentNames.length - 1));
+        }
+    }
+
+    finishStreamingResults(summary) {
+        this.currentCategories = summary.categories || {};
+        this.updateInsights(summary);
+        this.updateCategoryFilters();
+        this.setNextCursor(summary.cursor);
+    }
+
+    updateInsights(data) {
+        this.keywordsExtracted.textContent = data.keywords_extracted.slice(0, 5).join(', ');
+        this.industryDetected.textContent = data.industry_detected || 'General';
+        this.currentIndustry = data.industry_detected;
+        this.totalGenerated.textContent = data.total_generated;
+        this.generationMethod.textContent = data.generation_method || 'Rule-based';
+    }
+
     displayResults(data) {
         this.currentNames = data.names;
         this.currentCategories = data.categories || {};
         
         // Update insights
-        this.keywordsExtracted.textContent = data.keywords_extracted.slice(0, 5).join(', ');
-        this.industryDetected.textContent = data.industry_detected || 'General';
-        this.totalGenerated.textContent = data.total_generated;
-        this.generationMethod.textContent = data.generation_method || 'Rule-based';
+        this.updateInsights(data);
 
         // Update category filters
         this.updateCategoryFilters();
+        this.setNextCursor(data.cursor);
         
         // Display names
         this.displayNames(this.currentNames);
@@ -262,6 +417,13 @@ class BusinessNameGenerator {
             });
             this.saveFavorites();
             this.loadFavorites();
+            // Tone and industry let the server learn which names get saved for which requests
+            this.postFavorites('/save_favorite', {
+                name: nameData.name,
+                tagline: nameData.tagline,
+                tone: this.currentTone,
+                industry: this.currentIndustry
+            });
         }
     }
 
@@ -269,12 +431,99 @@ class BusinessNameGenerator {
         this.favorites = this.favorites.filter(fav => fav.name !== name);
         this.saveFavorites();
         this.loadFavorites();
+        this.postFavorites('/remove_favorite', { name: name });
     }
 
     saveFavorites() {
         localStorage.setItem('businessNameFavorites', JSON.stringify(this.favorites));
     }
 
+    getUserId() {
+        // Anonymous id that ties this browser's favorites to the server-side store
+        let userId = localStorage.getItem('businessNameUserId');
+        if (!userId) {
+            userId = window.crypto && crypto.randomUUID
+                ? crypto.randomUUID()
+                : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+            localStorage.setItem('businessNameUserId', userId);
+        }
+        return userId;
+    }
+
+    async useSyncCode() {
+        // Adopt another device's code: this browser's favorites upload under it, then both sets merge
+        const code = this.syncCodeInput.value.trim();
+        if (!/^[A-Za-z0-9_-]{1,64}$/.test(code)) {
+            this.showError('A sync code is 1-64 letters, digits, "-" or "_"');
+            return;
+        }
+        this.hideError();
+        this.syncCodeInput.value = '';
+        if (code === this.userId) return;
+
+        this.userId = code;
+        localStorage.setItem('businessNameUserId', code);
+        localStorage.removeItem('businessNameFavoritesSynced');
+        this.syncCodeValue.textContent = code;
+        await this.syncFavorites();
+    }
+
+    postFavorites(path, body) {
+        // Server storage is best-effort: localStorage stays the source of truth offline
+        return fetch(path, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ user_id: this.userId, ...body })
+        }).catch(() => null);
+    }
+
+    async syncFavorites() {
+        try {
+            // Upload favorites saved before the server kept them (once), in chunks the API accepts
+            if (this.favorites.length && !localStorage.getItem('businessNameFavoritesSynced')) {
+                for (let i = 0; i < this.favorites.length; i += 500) {
+                    const chunk = this.favorites.slice(i, i + 500)
+                        .map(fav => ({ name: fav.name, tagline: fav.tagline }));
+                    const response = await this.postFavorites('/save_favorite', { favorites: chunk });
+                    if (!response || !response.ok) return;
+                }
+                localStorage.setItem('businessNameFavoritesSynced', '1');
+            }
+
+            // Add favorites saved from other devices sharing this sync code
+            const serverFavorites = [];
+            let cursor = null;
+            do {
+                const params = new URLSearchParams({ user_id: this.userId, limit: '100' });
+                if (cursor) params.set('cursor', cursor);
+                const response = await fetch(`/favorites?${params}`);
+                if (!response.ok) return;
+                const page = await response.json();
+                serverFavorites.push(...page.favorites);
+                cursor = page.next_cursor;
+            } while (cursor);
+
+            const known = new Set(this.favorites.map(fav => fav.name));
+            const missing = serverFavorites
+                .filter(fav => !known.has(fav.name))
+                .reverse()
+                .map(fav => ({
+                    name: fav.name,
+                    tagline: fav.tagline || '',
+                    timestamp: new Date(fav.created_at * 1000).toISOString()
+                }));
+            if (missing.length) {
+                this.favorites.push(...missing);
+                this.saveFavorites();
+                this.loadFavorites();
+            }
+        } catch (error) {
+            // Keep working from localStorage when the server store is unavailable
+        }
+    }
+
     loadFavorites() {
         const favoritesContainer = this.favoritesGrid;
         
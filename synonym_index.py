@@ -0,0 +1,200 @@
+"""
+Precomputed WordNet synonym index.
+
+Walking ``wordnet.synsets()`` on every request is the most expensive part of
+keyword extraction, so the synonyms are computed once, offline, and written to
+a compact binary file:
+
+    python synonym_index.py build data/synonyms.idx
+
+The file is an open-addressing hash table (CRC32 keys, linear probing) followed
+by the synonym records.  Workers memory-map it read-only, so every lookup is a
+handful of probes into pages shared by all processes on the host, and the
+NLTK WordNet corpus never has to be loaded to expand keywords.
+"""
+
+import argparse
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'BNSYN001'
+MAX_SYNONYM_LENGTH = 12
+
+_HEADER = struct.Struct('<8sII')  # magic, slot count, entry count
+_SLOT = struct.Struct('<II')      # key hash, record offset (0 = empty slot)
+_U16 = struct.Struct('<H')
+
+
+def wordnet_synonyms(word: str, wordnet_reader) -> List[str]:
+    """Collect WordNet synonyms for a word in stable (synset, lemma) order"""
+    synonyms = {}
+    for syn in wordnet_reader.synsets(word):
+        for lemma in syn.lemmas():
+            synonym = lemma.name().replace('_', ' ')
+            if synonym != word and len(synonym) <= MAX_SYNONYM_LENGTH:
+                synonyms.setdefault(synonym, None)
+    return list(synonyms)
+
+
+def collect_wordnet_entries(extra_words: Iterable[str] = ()) -> Dict[str, List[str]]:
+    """Map every single-word WordNet lemma (plus extra words) to its synonyms"""
+    from nltk.corpus import wordnet
+
+    words = set(name for name in wordnet.all_lemma_names() if name.isalpha())
+    words.update(word.strip().lower() for word in extra_words if word.strip().isalpha())
+
+    entries = {}
+    for word in sorted(words):
+        synonyms = wordnet_synonyms(word, wordnet)
+        if synonyms:
+            entries[word] = synonyms
+    return entries
+
+
+def write_index(entries: Dict[str, List[str]], path: str, magic: bytes = MAGIC) -> int:
+    """Serialize a word -> synonyms mapping into an index file, atomically"""
+    slot_count = 1
+    while slot_count < max(len(entries), 1) * 2:  # keep the load factor <= 0.5
+        slot_count <<= 1
+
+    records_start = _HEADER.size + slot_count * _SLOT.size
+    slots = [(0, 0)] * slot_count
+    records = bytearray()
+
+    for word, synonyms in entries.items():
+        key = word.encode('utf-8')
+        record = bytearray(_U16.pack(len(key)) + key)
+        values = [s.encode('utf-8') for s in synonyms][:0xFFFF]
+        record += _U16.pack(len(values))
+        for value in values:
+            record += bytes([len(value)]) + value
+
+        key_hash = zlib.crc32(key)
+        position = key_hash & (slot_count - 1)
+        while slots[position][1]:
+            position = (position + 1) & (slot_count - 1)
+        slots[position] = (key_hash, records_start + len(records))
+        records += record
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(magic, slot_count, len(entries)))
+        for slot in slots:
+            f.write(_SLOT.pack(*slot))
+        f.write(records)
+    os.replace(tmp_path, path)
+    return records_start + len(records)
+
+
+class SynonymIndex:
+    """Read-only, memory-mapped view of a synonym index file"""
+
+    def __init__(self, path: str, magic: bytes = MAGIC):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        file_magic, self.slot_count, self.entry_count = _HEADER.unpack_from(self._buffer, 0)
+        if file_magic != magic:
+            self._buffer.close()
+            raise ValueError(f"{path} is not an index of this kind (expected {magic!r})")
+        self._mask = self.slot_count - 1
+
+    def _find(self, word: str) -> Optional[int]:
+        key = word.encode('utf-8')
+        key_hash = zlib.crc32(key)
+        position = key_hash & self._mask
+        buffer = self._buffer
+
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(buffer, _HEADER.size + position * _SLOT.size)
+            if not offset:
+                return None
+            if slot_hash == key_hash:
+                (key_length,) = _U16.unpack_from(buffer, offset)
+                start = offset + _U16.size
+                if buffer[start:start + key_length] == key:
+                    return start + key_length
+            position = (position + 1) & self._mask
+
+    def get(self, word: str) -> List[str]:
+        """Return the synonyms for a word, or an empty list if it is not indexed"""
+        offset = self._find(word)
+        if offset is None:
+            return []
+
+        buffer = self._buffer
+        (count,) = _U16.unpack_from(buffer, offset)
+        offset += _U16.size
+        synonyms = []
+        for _ in range(count):
+            length = buffer[offset]
+            synonyms.append(buffer[offset + 1:offset + 1 + length].decode('utf-8'))
+            offset += 1 + length
+        return synonyms
+
+    def __contains__(self, word: str) -> bool:
+        return self._find(word) is not None
+
+    def __len__(self) -> int:
+        return self.entry_count
+
+    def close(self):
+        self._buffer.close()
+
+
+def load_synonym_index(path: str) -> Optional[SynonymIndex]:
+    """Open the synonym index if it has been built, otherwise return None"""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        index = SynonymIndex(path)
+        logger.info(f"Loaded synonym index with {len(index)} entries from {path}")
+        return index
+    except (OSError, ValueError) as e:
+        logger.warning(f"Failed to load synonym index {path}: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the WordNet synonym index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="build the index from the NLTK WordNet corpus")
+    build.add_argument('output', nargs='?', default=os.path.join('data', 'synonyms.idx'))
+    build.add_argument('--vocabulary', help="extra words to index, one per line (e.g. inflected forms)")
+
+    lookup = subparsers.add_parser('lookup', help="print the synonyms stored for some words")
+    lookup.add_argument('index')
+    lookup.add_argument('words', nargs='+')
+
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        extra_words = []
+        if args.vocabulary:
+            with open(args.vocabulary, encoding='utf-8') as f:
+                extra_words = f.read().split()
+
+        started = time.perf_counter()
+        entries = collect_wordnet_entries(extra_words)
+        size = write_index(entries, args.output)
+        print(f"Indexed {len(entries)} words into {args.output} "
+              f"({size / 1024:.0f} KiB, {time.perf_counter() - started:.1f}s)")
+    else:
+        index = SynonymIndex(args.index)
+        for word in args.words:
+            print(f"{word}: {', '.join(index.get(word)) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
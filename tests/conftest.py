@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The app is a set of top-level modules, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def nltk_data():
+    """Skip the test when the NLTK corpora the app needs aren't installed (nothing is downloaded)"""
+    import nltk
+    from name_generator import NLTK_RESOURCES
+
+    for package, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            pytest.skip(f"NLTK data '{package}' is not installed")
+
+
+@pytest.fixture(scope='session')
+def app_module(nltk_data):
+    import app
+    return app
+
+
+@pytest.fixture
+def client(app_module):
+    app_module.response_cache.clear()
+    return app_module.app.test_client()
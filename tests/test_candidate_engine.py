@@ -0,0 +1,134 @@
+from itertools import product
+
+import pytest
+
+from candidate_engine import (COMPOUND_CONNECTORS, MAX_NAME_LENGTH, MODIFIED_ARTICLES, MODIFIED_ENDINGS,
+                              MODIFIED_SUFFIXES, CandidateEngine)
+from name_generator import BusinessNameGenerator
+from ranking import FORMAT_VERSION, RankingWeights
+
+KEYWORDS = ['coffee', 'roast', 'bean', 'brew', 'espresso']
+PREFIXES = ['smart', 'pro', 'prime', 'true', 'north', 'blue', 'bright', 'extraordinarilyvast']
+SUFFIXES = ['hub', 'works', 'lab', 'co', 'spot', 'collective', 'incorporated']
+
+
+def all_pages(engine, seed, page_size=7):
+    names = []
+    state = None
+    while True:
+        candidates, state = engine.page(page_size, seed, state)
+        names.extend(name for name, _, _ in candidates)
+        if state is None:
+            return names
+
+
+def expected_names(keywords, prefixes, suffixes):
+    """Every name the templates can spell within the length limit, by brute force"""
+    keywords = [keyword.title() for keyword in keywords]
+    prefixes = [prefix.title() for prefix in prefixes]
+    suffixes = [suffix.title() for suffix in suffixes]
+    spellings = [
+        *(p + k for p, k in product(prefixes, keywords)),
+        *(k + s for k, s in product(keywords, suffixes)),
+        *(a + c + b for a, c, b in product(keywords, COMPOUND_CONNECTORS, keywords) if a != b),
+        *(k + e for k, e in product(keywords, MODIFIED_ENDINGS)),
+        *(a + k + s for a, k, s in product(MODIFIED_ARTICLES, keywords, MODIFIED_SUFFIXES)),
+    ]
+    return {name for name in spellings if len(name) <= MAX_NAME_LENGTH}
+
+
+@pytest.fixture
+def engine():
+    return CandidateEngine(KEYWORDS, PREFIXES, SUFFIXES)
+
+
+def test_exact_count_when_space_is_large(engine):
+    for count in (1, 10, 50, 100):
+        candidates, state = engine.page(count, seed=1)
+        assert len(candidates) == count
+        assert len({name for name, _, _ in candidates}) == count
+        assert state is not None
+
+
+def test_exhaustion_returns_every_valid_name_once(engine):
+    names = all_pages(engine, seed=5)
+    assert len(names) == len(set(names))
+    assert set(names) == expected_names(KEYWORDS, PREFIXES, SUFFIXES)
+
+
+def test_names_respect_length_limit(engine):
+    names = all_pages(engine, seed=9)
+    assert all(len(name) <= MAX_NAME_LENGTH for name in names)
+    # The long parts only ever appear where they still fit
+    assert 'ExtraordinarilyvastEspresso' not in names
+    assert 'ExtraordinarilyvastBean' in names
+    assert 'EspressoIncorporated' in names
+
+
+def test_same_seed_same_names(engine):
+    assert engine.page(20, seed=42) == CandidateEngine(KEYWORDS, PREFIXES, SUFFIXES).page(20, seed=42)
+    assert all_pages(engine, seed=42) == all_pages(engine, seed=42, page_size=3)
+    assert engine.page(20, seed=42)[0] != engine.page(20, seed=43)[0]
+
+
+def test_empty_connector_name_is_emitted_once():
+    # 'SmartTech' is both prefix + keyword and the compound 'Smart' + '' + 'Tech'
+    engine = CandidateEngine(['smart', 'tech'], ['smart'], ['hub'])
+    names = all_pages(engine, seed=3)
+    assert names.count('SmartTech') == 1
+    assert names.count('TechSmart') == 1
+    assert 'Smart & Tech' in names
+    assert set(names) == expected_names(['smart', 'tech'], ['smart'], ['hub'])
+
+
+def test_small_space_returns_everything():
+    engine = CandidateEngine(['tea'], ['pro'], ['hub'])
+    candidates, state = engine.page(1000, seed=0)
+    assert state is None
+    assert len(candidates) == len({name for name, _, _ in candidates})
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return BusinessNameGenerator()
+
+
+def test_rule_based_names_count_and_seed(generator):
+    first = generator.generate_rule_based_names(['coffee', 'roast'], 'professional', 12, 'food', seed=7)
+    again = generator.generate_rule_based_names(['coffee', 'roast'], 'professional', 12, 'food', seed=7)
+    assert first == again
+    assert len(first) == len(set(first)) == 12
+    assert all(len(name) <= MAX_NAME_LENGTH for name in first)
+
+
+def test_rule_based_names_exhaust_without_duplicates(generator):
+    names = generator.generate_rule_based_names(['tea'], 'professional', 10000, 'food', seed=1)
+    assert 0 < len(names) < 10000
+    assert len(names) == len(set(names))
+
+
+def test_ranked_pages_show_every_candidate(monkeypatch):
+    generator = BusinessNameGenerator()
+    weights = RankingWeights({'version': FORMAT_VERSION, 'groups': {'*|*': {'weights': {}, 'defaults': {}}}})
+    monkeypatch.setattr(generator, 'ranking_weights', type('Fixed', (), {'current': lambda self: weights})())
+
+    names, state = [], None
+    while True:
+        page, state = generator.rule_based_page(['tea', 'leaf'], 'professional', 8, 'food', seed=2, state=state)
+        names.extend(page)
+        if state is None:
+            break
+        assert len(page) == 8
+
+    engine = generator.get_candidate_engine(['tea', 'leaf'], 'professional', 'food')
+    assert len(names) == len(set(names))
+    assert set(names) == set(engine.iter_names(seed=2))
+
+
+def test_candidate_ids_round_trip(engine):
+    for name, family, items in engine.page(50, seed=6)[0]:
+        assert engine.candidate(engine.candidate_id(name)) == (name, family, items)
+
+
+def test_iter_names_follows_pages(engine):
+    assert list(engine.iter_names(seed=4, page_size=11)) == all_pages(engine, seed=4)
@@ -0,0 +1,231 @@
+import asyncio
+
+import pytest
+import requests
+
+import ai_generator
+from ai_generator import AsyncOpenAIClient, CircuitBreaker, OpenAIClient
+
+COMPLETION = {'choices': [{'message': {'content': 'Acme Co'}}]}
+
+
+class Clock:
+    """Stands in for time.monotonic so cooldowns pass without sleeping"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(ai_generator.time, 'monotonic', clock)
+    return clock
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=COMPLETION):
+        self.status_code = self.status = status
+        self.headers = {}
+        self.body = body
+
+    def json(self):
+        if isinstance(self.body, Exception):
+            raise self.body
+        return self.body
+
+
+def sync_client(outcomes):
+    """An OpenAIClient whose POSTs return (or raise) the given outcomes in turn"""
+    client = OpenAIClient('key', max_retries=0, breaker=CircuitBreaker(failure_threshold=2, cooldown=30))
+    outcomes = iter(outcomes)
+
+    def post(*args, **kwargs):
+        outcome = next(outcomes)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    client.session.post = post
+    return client
+
+
+def test_breaker_opens_then_recovers_through_half_open(clock):
+    client = sync_client([requests.ConnectionError('down'), requests.Timeout('slow'), FakeResponse()])
+    breaker = client.breaker
+
+    assert client.chat_completion({}) is None
+    assert breaker.state == 'closed'
+    assert client.chat_completion({}) is None
+    assert breaker.state == 'open'
+    # Open: no call is made at all
+    assert client.chat_completion({}) is None
+
+    clock.now += 30
+    assert breaker.state == 'half-open'
+    assert client.chat_completion({}) == 'Acme Co'
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+
+
+def test_failed_trial_reopens_breaker(clock):
+    client = sync_client([requests.ConnectionError('down')] * 3)
+    client.chat_completion({})
+    client.chat_completion({})
+    clock.now += 30
+    assert client.chat_completion({}) is None
+    assert client.breaker.state == 'open'
+
+
+def test_unexpected_exception_during_trial_does_not_wedge_breaker(clock):
+    client = sync_client([requests.ConnectionError('down'), requests.ConnectionError('down'),
+                          RuntimeError('boom'), FakeResponse()])
+    breaker = client.breaker
+    client.chat_completion({})
+    client.chat_completion({})
+
+    clock.now += 30
+    with pytest.raises(RuntimeError):
+        client.chat_completion({})
+    assert not breaker._trial_in_flight
+    assert breaker.state == 'open'
+
+    clock.now += 30
+    assert client.chat_completion({}) == 'Acme Co'
+    assert breaker.state == 'closed'
+
+
+def test_other_request_exceptions_count_as_failures(clock):
+    client = sync_client([requests.exceptions.InvalidURL('bad'), requests.exceptions.ChunkedEncodingError('cut')])
+    client.chat_completion({})
+    client.chat_completion({})
+    assert client.breaker.state == 'open'
+
+
+@pytest.mark.parametrize('body', [ValueError('not JSON'), {'choices': []}, {'error': 'oops'}, None])
+def test_malformed_success_body_is_a_failure(clock, body):
+    client = sync_client([FakeResponse(body=body), FakeResponse(body=body)])
+    assert client.chat_completion({}) is None
+    assert client.breaker.failures == 1
+    client.chat_completion({})
+    assert client.breaker.state == 'open'
+
+
+def test_client_error_does_not_trip_breaker(clock):
+    client = sync_client([FakeResponse(status=400)] * 3)
+    for _ in range(3):
+        assert client.chat_completion({}) is None
+    assert client.breaker.state == 'closed'
+
+
+class FakeAsyncResponse(FakeResponse):
+    async def json(self):
+        return super().json()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeAsyncSession:
+    closed = False
+
+    def __init__(self, outcomes):
+        self.outcomes = iter(outcomes)
+
+    def post(self, *args, **kwargs):
+        outcome = next(self.outcomes)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def async_client(outcomes):
+    pytest.importorskip('aiohttp')
+    client = AsyncOpenAIClient('key', max_retries=0, breaker=CircuitBreaker(failure_threshold=2, cooldown=30))
+    client.session = FakeAsyncSession(outcomes)
+    return client
+
+
+def test_async_client_breaker_cycle(clock):
+    import aiohttp
+
+    client = async_client([aiohttp.ClientConnectionError('down'), FakeAsyncResponse(body=ValueError('not JSON')),
+                           KeyError('boom'), FakeAsyncResponse()])
+    breaker = client.breaker
+
+    async def scenario():
+        assert await client.chat_completion({}) is None
+        assert await client.chat_completion({}) is None
+        assert breaker.state == 'open'
+
+        clock.now += 30
+        with pytest.raises(KeyError):
+            await client.chat_completion({})
+        assert not breaker._trial_in_flight
+        assert breaker.state == 'open'
+
+        clock.now += 30
+        assert await client.chat_completion({}) == 'Acme Co'
+        assert breaker.state == 'closed'
+
+    asyncio.run(scenario())
+
+
+class HangingAsyncSession:
+    """Every POST waits until cancelled, like a slow but healthy API"""
+
+    closed = False
+
+    def post(self, *args, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        await asyncio.sleep(3600)
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_cancelled_calls_are_not_failures():
+    pytest.importorskip('aiohttp')
+    client = AsyncOpenAIClient('key', max_retries=0, breaker=CircuitBreaker(failure_threshold=2, cooldown=30))
+    client.session = HangingAsyncSession()
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(client.chat_completion({})) for _ in range(6)]
+        await asyncio.wait(tasks, timeout=0.05)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert client.breaker.state == 'closed'
+    assert client.breaker.failures == 0
+
+
+def test_cancelled_trial_frees_half_open_slot(clock):
+    aiohttp = pytest.importorskip('aiohttp')
+    client = async_client([aiohttp.ClientConnectionError('down')] * 2)
+    breaker = client.breaker
+
+    async def scenario():
+        await client.chat_completion({})
+        await client.chat_completion({})
+        assert breaker.state == 'open'
+        clock.now += 30
+        client.session = HangingAsyncSession()
+        trial = asyncio.ensure_future(client.chat_completion({}))
+        await asyncio.sleep(0)
+        assert breaker._trial_in_flight
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert not breaker._trial_in_flight
+    assert breaker.allow()
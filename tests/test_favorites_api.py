@@ -0,0 +1,13 @@
+def test_store_opens_on_first_use(app_module, client, monkeypatch, tmp_path):
+    path = tmp_path / 'favorites.db'
+    monkeypatch.setattr(app_module, 'FAVORITES_DB_PATH', str(path))
+    monkeypatch.setattr(app_module, '_favorites_store', None)
+    monkeypatch.setattr(app_module, '_favorites_opened', False)
+    assert not path.exists()
+
+    saved = client.post('/save_favorite', json={'user_id': 'tester', 'name': 'Brew Lab', 'tagline': 'Fresh daily'})
+    assert saved.status_code == 200
+    assert path.exists()
+
+    listed = client.get('/favorites?user_id=tester')
+    assert [favorite['name'] for favorite in listed.json['favorites']] == ['Brew Lab']
@@ -0,0 +1,52 @@
+import pytest
+
+
+class FakeAIGenerator:
+    """Stands in for AINameGenerator; its names differ on every call, like a real model's"""
+
+    openai_api_key = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_creative_names(self, keywords, tone, count):
+        self.calls += 1
+        return [f'Model Pick {self.calls}-{i}' for i in range(count)]
+
+
+@pytest.fixture
+def fake_ai(app_module, monkeypatch):
+    fake = FakeAIGenerator()
+    monkeypatch.setattr(app_module, 'AI_AVAILABLE', True)
+    monkeypatch.setattr(app_module, 'ai_generator', fake)
+    return fake
+
+
+REQUEST = {'input_text': 'artisan coffee roastery in the city', 'count': 6, 'seed': 11}
+
+
+def test_seeded_rule_based_response_is_cached(client):
+    first = client.post('/generate', json=REQUEST)
+    second = client.post('/generate', json=REQUEST)
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'].startswith('public')
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.json == second.json
+
+
+def test_seeded_ai_response_is_not_cached(client, fake_ai):
+    first = client.post('/generate', json={**REQUEST, 'use_ai': True})
+    second = client.post('/generate', json={**REQUEST, 'use_ai': True})
+    assert first.status_code == second.status_code == 200
+    assert first.json['generation_method'] == 'AI + Rule-based'
+    assert first.headers['Cache-Control'] == 'no-store'
+    assert 'ETag' not in first.headers
+    assert fake_ai.calls == 2
+    assert first.json['names'] != second.json['names']
+
+
+@pytest.mark.parametrize('body', ['null', '[1, 2]', '"coffee"'])
+def test_non_object_body_is_rejected(client, body):
+    response = client.post('/generate', data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.json == {'error': 'Expected a JSON object'}
@@ -0,0 +1,37 @@
+import pytest
+
+import ai_generator
+from ai_generator import AINameGenerator
+
+torch = pytest.importorskip('torch')
+
+
+class FakeTokenizer:
+    eos_token_id = 0
+
+    def __call__(self, prompts, return_tensors=None, padding=False):
+        return {'input_ids': torch.zeros((len(prompts), 4), dtype=torch.long)}
+
+    def batch_decode(self, rows, skip_special_tokens=True):
+        return [''] * len(rows)  # nothing usable, so every batch of the budget is drawn
+
+
+class FakeModel:
+    def __init__(self):
+        self.batches = []
+
+    def generate(self, input_ids, num_return_sequences=1, **kwargs):
+        self.batches.append(len(input_ids) * num_return_sequences)
+        return torch.zeros((len(input_ids) * num_return_sequences, 8), dtype=torch.long)
+
+
+@pytest.mark.parametrize('keywords,count', [(['coffee', 'roast', 'bean'], 7), (['tea'], 20), (['a', 'b'], 1)])
+def test_batched_sampling_stays_within_limits(monkeypatch, keywords, count):
+    monkeypatch.setattr(ai_generator, 'HF_BATCH_SIZE', 16)
+    generator = AINameGenerator(use_inference_pool=False)
+    generator.hf_tokenizer = FakeTokenizer()
+    generator.hf_model = model = FakeModel()
+
+    assert generator._generate_huggingface_names_batched(keywords, count) == []
+    assert max(model.batches) <= 16
+    assert sum(model.batches) == count * 2
@@ -0,0 +1,111 @@
+import json
+import re
+import threading
+import time
+
+
+def request_count(client, stage=None):
+    """Recorded /generate requests (or a stage's observations) with the rule-based method label"""
+    if stage is None:
+        pattern = re.compile(r'^business_names_request_seconds_count\{.*method="Rule-based"\} (\d+)$', re.M)
+    else:
+        pattern = re.compile(r'^business_names_stage_seconds_count\{stage="%s",.*method="Rule-based"\} (\d+)$'
+                             % stage, re.M)
+    return sum(int(count) for count in pattern.findall(client.get('/metrics').get_data(as_text=True)))
+
+
+STREAM_REQUEST = {'input_text': 'handmade ceramic mugs and bowls', 'count': 5, 'stream': 'ndjson'}
+
+
+def test_streamed_response_frames(client):
+    response = client.post('/generate', json=STREAM_REQUEST)
+    frames = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert response.mimetype == 'application/x-ndjson'
+    assert [frame['type'] for frame in frames] == ['name'] * 5 + ['done']
+    assert 'X-Timing' not in response.headers
+
+
+def test_streamed_request_is_recorded_in_metrics(client):
+    before = request_count(client)
+    stages_before = request_count(client, 'extract_keywords')
+    response = client.post('/generate', json=STREAM_REQUEST, headers={'X-Timing': '1'})
+    response.get_data()
+    assert request_count(client) == before + 1
+    # Keyword extraction runs before the stream starts and still counts towards the request
+    assert request_count(client, 'extract_keywords') == stages_before + 1
+
+
+def test_abandoned_stream_is_recorded_in_metrics(client):
+    before = request_count(client)
+    response = client.post('/generate', json={**STREAM_REQUEST, 'count': 50}, buffered=False)
+    next(iter(response.response))
+    response.close()
+    assert request_count(client) == before + 1
+
+
+def concurrent_streams(app_module, payload, clients=4):
+    """Frames of identical streamed requests sent at the same time"""
+    results = [None] * clients
+    barrier = threading.Barrier(clients)
+
+    def run(index):
+        client = app_module.app.test_client()
+        barrier.wait()
+        response = client.post('/generate', json=payload)
+        results[index] = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def slowed(function, calls, delay=0.2):
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        time.sleep(delay)
+        return function(*args, **kwargs)
+    return wrapper
+
+
+def test_identical_streams_generate_once(app_module, client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(app_module, 'rule_based_page', slowed(app_module.rule_based_page, calls))
+    coalesced_before = app_module.metrics.COALESCED_REQUESTS.snapshot()['series']
+
+    results = concurrent_streams(app_module, STREAM_REQUEST)
+
+    assert len(calls) == 1
+    assert all(frames == results[0] for frames in results)
+    assert [frame['type'] for frame in results[0]] == ['name'] * 5 + ['done']
+    coalesced = sum(value for _, value in app_module.metrics.COALESCED_REQUESTS.snapshot()['series'])
+    assert coalesced - sum(value for _, value in coalesced_before) == 3
+
+
+class SlowAIGenerator:
+    openai_api_key = None
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_creative_names(self, keywords, tone, count):
+        self.calls += 1
+        time.sleep(0.2)
+        return [f'Model Pick {self.calls}-{i}' for i in range(count)]
+
+
+def test_identical_ai_streams_call_the_model_once(app_module, client, monkeypatch):
+    ai = SlowAIGenerator()
+    monkeypatch.setattr(app_module, 'AI_AVAILABLE', True)
+    monkeypatch.setattr(app_module, 'ai_generator', ai)
+    calls = []
+    monkeypatch.setattr(app_module, 'rule_based_page', slowed(app_module.rule_based_page, calls))
+
+    results = concurrent_streams(app_module, {**STREAM_REQUEST, 'count': 6, 'use_ai': True})
+
+    assert len(calls) == ai.calls == 1
+    assert all(frames == results[0] for frames in results)
+    assert results[0][-1]['generation_method'] == 'AI + Rule-based'
+    assert [frame['name'] for frame in results[0][3:6]] == ['Model Pick 1-0', 'Model Pick 1-1', 'Model Pick 1-2']
@@ -0,0 +1,31 @@
+import pytest
+from nltk.corpus import wordnet
+
+from name_generator import BusinessNameGenerator
+from synonym_index import collect_wordnet_entries, load_synonym_index, wordnet_synonyms, write_index
+
+pytestmark = pytest.mark.usefixtures('nltk_data')
+
+
+@pytest.fixture(scope='module')
+def generator(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('synonyms') / 'synonyms.idx')
+    write_index(collect_wordnet_entries(), path)
+    generator = BusinessNameGenerator()
+    generator.synonym_index = load_synonym_index(path)
+    return generator
+
+
+def test_lemmas_come_from_the_index(generator):
+    assert generator.get_synonyms('coffee') == generator.synonym_index.get('coffee') != []
+
+
+@pytest.mark.parametrize('word', ['fresher', 'groomed', 'coffees'])
+def test_inflections_fall_back_to_wordnet(generator, word):
+    assert generator.synonym_index.get(word) == []
+    synonyms = generator.get_synonyms(word)
+    assert synonyms and synonyms == wordnet_synonyms(word, wordnet)
+
+
+def test_unknown_words_have_no_synonyms(generator):
+    assert generator.get_synonyms('zzqx') == []
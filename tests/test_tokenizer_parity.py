@@ -0,0 +1,90 @@
+"""
+The fast keyword path (fast_nlp.py) gives the same keywords as NLTK.
+
+The cases of ``python -m benchmarks.check_tokenizer_parity``, on a smaller
+corpus; run that for the full-size check and timings.
+"""
+
+import random
+
+import pytest
+from nltk.stem import WordNetLemmatizer
+
+import fast_nlp
+from benchmarks.check_tokenizer_parity import FRAGMENTS, PUNCTUATION, generate_corpus, word_pool
+from benchmarks.corpus import DESCRIPTIONS
+from name_generator import LEMMA_TABLE_PATH, BusinessNameGenerator
+from synonym_index import write_index
+
+pytestmark = pytest.mark.usefixtures('nltk_data')
+
+
+@pytest.fixture(scope='module')
+def lemma_table(tmp_path_factory):
+    """The app's lemma table, or one built for the test run when it hasn't been built"""
+    table = fast_nlp.load_lemma_table(LEMMA_TABLE_PATH)
+    if table is None:
+        path = str(tmp_path_factory.mktemp('lemmas') / 'lemmas.idx')
+        entries = fast_nlp.collect_lemma_entries()
+        write_index({word: [lemma] for word, lemma in entries.items()}, path, fast_nlp.LEMMA_MAGIC)
+        table = fast_nlp.LemmaTable(path)
+    yield table
+    table.close()
+
+
+@pytest.fixture(scope='module')
+def fast(lemma_table):
+    generator = BusinessNameGenerator()
+    generator.keyword_tokenizer = 'fast'
+    generator.lemma_table = lemma_table
+    return generator
+
+
+@pytest.fixture(scope='module')
+def reference():
+    generator = BusinessNameGenerator()
+    generator.keyword_tokenizer = 'nltk'
+    generator.lemma_table = None
+    return generator
+
+
+@pytest.fixture(scope='module')
+def words():
+    return word_pool(random.Random(0), 3000)
+
+
+def mismatches(fast, reference, texts):
+    return [(text, reference.keyword_tokens(text), fast.keyword_tokens(text))
+            for text in texts if fast.keyword_tokens(text) != reference.keyword_tokens(text)]
+
+
+@pytest.mark.parametrize('fragment', FRAGMENTS)
+def test_fragment(fast, reference, fragment):
+    texts = [fragment, f'we sell {fragment} coffee beans.', f'{fragment}, fresh bread and cakes!',
+             f'organic tea ({fragment}) for offices']
+    assert mismatches(fast, reference, texts) == []
+
+
+@pytest.mark.parametrize('mark', PUNCTUATION)
+def test_punctuation(fast, reference, mark):
+    texts = [f'pet grooming{mark} dog walking', f'pet grooming {mark} dog walking',
+             f'pet grooming {mark}dog walking', f'dog walking{mark}']
+    assert mismatches(fast, reference, texts) == []
+
+
+def test_benchmark_descriptions(fast, reference):
+    assert mismatches(fast, reference, [text.lower() for text in DESCRIPTIONS]) == []
+
+
+def test_generated_corpus(fast, reference, words):
+    corpus = [text.lower() for text in generate_corpus(random.Random(1), words, 3000)]
+    assert mismatches(fast, reference, corpus) == []
+    # Most of the corpus should actually take the fast path
+    assert sum(fast_nlp.tokenize(text) is None for text in corpus) < len(corpus) / 2
+
+
+def test_lemma_table(lemma_table, words):
+    lemmatizer = WordNetLemmatizer()
+    differing = [word for word in map(str.lower, words)
+                 if word.isalpha() and lemma_table.lemma(word) != lemmatizer.lemmatize(word)]
+    assert differing == []
@@ -0,0 +1,125 @@
+"""
+Word lists for rule-based generation, loaded from data/vocabulary.json.
+
+The file holds the base prefixes and suffixes, per-tone prefixes and suffixes,
+industry keywords, name categories and per-industry tagline templates.  It is
+loaded once into an immutable ``Vocabulary``:
+
+* every word is interned, so a word that appears in several lists is stored
+  once;
+* lists are tuples and mappings are read-only, so one object can be shared by
+  every thread, and by every worker when the app is preloaded before fork;
+* the base + tone prefix/suffix lists are merged per tone at load time, along
+  with their title-cased, de-duplicated forms, so building a candidate engine
+  doesn't concatenate or title-case lists per request.  Per-industry variants
+  are merged on first use;
+* the industry and category matchers are compiled at load time.
+
+``load_vocabulary_file`` wraps the file in a ``ReloadableFile``: an edited
+file is loaded into a new ``Vocabulary`` that replaces the old one atomically.
+``version`` (a hash of the file) changes with it, so caches that depend on
+the vocabulary can key on it.
+"""
+
+import hashlib
+import json
+import sys
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, NamedTuple, Sequence, Tuple
+
+from pattern_matcher import PatternMatcher
+from reloadable import ReloadableFile
+
+FORMAT_VERSION = 1
+DEFAULT_TONE = 'professional'
+DEFAULT_INDUSTRY = 'general'
+
+
+class NameParts(NamedTuple):
+    """Prefixes and suffixes for one tone/industry pair, raw and title-cased"""
+    prefixes: Tuple[str, ...]
+    suffixes: Tuple[str, ...]
+    titled_prefixes: Tuple[str, ...]
+    titled_suffixes: Tuple[str, ...]
+
+
+def _words(words: Iterable[str]) -> Tuple[str, ...]:
+    return tuple(sys.intern(word) for word in words)
+
+
+def _titled(words: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(dict.fromkeys(sys.intern(word.title()) for word in words))
+
+
+def _groups(groups: Mapping[str, Iterable[str]]) -> Mapping[str, Tuple[str, ...]]:
+    return MappingProxyType({sys.intern(label): _words(words) for label, words in groups.items()})
+
+
+class Vocabulary:
+    """Immutable word lists and the structures precomputed from them"""
+
+    def __init__(self, data: Dict, version: str = ''):
+        if data.get('version') != FORMAT_VERSION:
+            raise ValueError(f"unsupported vocabulary version {data.get('version')}")
+        self.version = version
+        self.prefixes = _words(data['prefixes'])
+        self.suffixes = _words(data['suffixes'])
+        self.connectors = _words(data.get('connectors', ()))
+        self.tone_modifiers = MappingProxyType({
+            sys.intern(tone): MappingProxyType({'prefixes': _words(words['prefixes']),
+                                                'suffixes': _words(words['suffixes'])})
+            for tone, words in data['tones'].items()
+        })
+        if DEFAULT_TONE not in self.tone_modifiers:
+            raise ValueError(f"vocabulary has no '{DEFAULT_TONE}' tone")
+        self.industry_keywords = _groups(data['industries'])
+        self.category_keywords = _groups(data['categories'])
+        self.taglines = _groups(data['taglines'])
+        if DEFAULT_INDUSTRY not in self.taglines:
+            raise ValueError(f"vocabulary has no '{DEFAULT_INDUSTRY}' taglines")
+
+        # Precompiled matchers: one pass per string scores every industry/category
+        self.industry_matcher = PatternMatcher(self.industry_keywords)
+        self.category_matcher = PatternMatcher(self.category_keywords)
+
+        self._name_parts = {tone: self._merge(tone, None) for tone in self.tone_modifiers}
+
+    @property
+    def tones(self) -> Tuple[str, ...]:
+        return tuple(self.tone_modifiers)
+
+    def _merge(self, tone: str, industry) -> NameParts:
+        tone_data = self.tone_modifiers[tone]
+        prefixes = self.prefixes + tone_data['prefixes'] + self.industry_keywords.get(industry, ())
+        suffixes = self.suffixes + tone_data['suffixes']
+        return NameParts(prefixes, suffixes, _titled(prefixes), _titled(suffixes))
+
+    def name_parts(self, tone: str, industry) -> NameParts:
+        """Prefixes and suffixes for a tone (unknown tones use 'professional') and industry"""
+        if tone not in self.tone_modifiers:
+            tone = DEFAULT_TONE
+        if industry not in self.industry_keywords:
+            return self._name_parts[tone]
+        key = (tone, industry)
+        parts = self._name_parts.get(key)
+        if parts is None:  # bounded: tones x industries
+            parts = self._name_parts[key] = self._merge(tone, industry)
+        return parts
+
+    def tagline_templates(self, industry) -> Tuple[str, ...]:
+        return self.taglines.get(industry) or self.taglines[DEFAULT_INDUSTRY]
+
+
+def load_vocabulary(path: str) -> Vocabulary:
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return Vocabulary(json.loads(raw), hashlib.sha1(raw).hexdigest()[:12])
+
+
+def load_vocabulary_file(path: str, check_interval: float = 5.0) -> ReloadableFile:
+    """The vocabulary file, loaded now (a missing or invalid file raises) and reloaded on change"""
+    vocabulary_file = ReloadableFile(path, load_vocabulary, check_interval, keep_when_missing=True,
+                                     name='vocabulary')
+    if vocabulary_file.current() is None:
+        load_vocabulary(path)  # raises with the reason
+    return vocabulary_file